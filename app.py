@@ -2,11 +2,13 @@ import streamlit as st
 import os
 import time
 import tempfile
-import json
 
+from compact_schema import load_extraction
 from extractor import PPTXExtractor
 from translator import PPTTranslator
 from reassembler import PPTXReassembler
+from translation_memory import TranslationMemory
+from cassette import cassette_from_env
 
 st.set_page_config(
     page_title="PPT Translation",
@@ -35,6 +37,18 @@ st.markdown("""
 
 st.markdown('<h1 class="main-header">PPT Translation</h1>', unsafe_allow_html=True)
 
+@st.cache_resource
+def get_translation_memory():
+    """Translation memory shared by every session, stored next to the job files"""
+    json_bin_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "json_bin")
+    os.makedirs(json_bin_dir, exist_ok=True)
+    return TranslationMemory(os.path.join(json_bin_dir, "translation_memory.db"))
+
+@st.cache_resource
+def get_cassette():
+    """Request cassette for reproducible benchmark runs (PPT_CASSETTE), None otherwise"""
+    return cassette_from_env()
+
 if 'extraction_done' not in st.session_state:
     st.session_state.extraction_done = False
     st.session_state.translation_done = False
@@ -97,9 +111,9 @@ if st.session_state.processing and uploaded_file is not None:
         with open(input_path, "wb") as f:
             f.write(uploaded_file.getbuffer())
         
-        # Define paths for intermediate files in json_bin
-        extracted_json = os.path.join(json_bin_dir, f"{base_name}_extracted.json")
-        translated_json = os.path.join(json_bin_dir, f"{base_name}_translated.json")
+        # Define paths for intermediate files in json_bin (binary format, see binary_format.py)
+        extracted_json = os.path.join(json_bin_dir, f"{base_name}_extracted.msgpack")
+        translated_json = os.path.join(json_bin_dir, f"{base_name}_translated.msgpack")
         output_pptx = os.path.join(json_bin_dir, f"{base_name}_{target_language.lower()}.pptx")
         
         progress_container = st.container()
@@ -116,22 +130,24 @@ if st.session_state.processing and uploaded_file is not None:
                 start_time = time.time()
                 
                 try:
-                    extractor = PPTXExtractor(input_path)
-                    progress_bar.progress(30)
+                    extractor = PPTXExtractor(input_path, profile="translation")
+                    progress_bar.progress(10)
                     status_text.text("Extracting slides and content...")
                     
-                    extracted_data = extractor.extract_all()
-                    progress_bar.progress(70)
-                    status_text.text("Saving extraction data...")
+                    # Advance per slide; slides go to the writer as they are extracted
+                    def update_extraction_progress(done, total):
+                        progress_bar.progress(min(100, 10 + int(90 * done / total)))
+                        status_text.text(f"Extracted {done} of {total} slides...")
                     
-                    extractor.save_to_json(extracted_json)
+                    extractor.save_to_json(extracted_json,
+                                           slides=extractor.iter_slides(progress_callback=update_extraction_progress))
                     progress_bar.progress(100)
                     
                     st.session_state.extraction_time = time.time() - start_time
                     st.session_state.extraction_done = True
                     
                     st.success(f"Extraction completed in {st.session_state.extraction_time:.2f} seconds")
-                    st.markdown(f"**Slides extracted:** {len(extracted_data['slides'])}")
+                    st.markdown(f"**Slides extracted:** {extractor.data['total_slides']}")
                     
                 except Exception as e:
                     st.error(f"Extraction failed: {str(e)}")
@@ -149,17 +165,40 @@ if st.session_state.processing and uploaded_file is not None:
                 start_time = time.time()
                 
                 try:
-                    translator = PPTTranslator(api_key=None, target_language=target_language)
+                    translator = PPTTranslator(api_key=None, target_language=target_language,
+                                               translation_memory=get_translation_memory(),
+                                               priority="interactive",
+                                               cassette=get_cassette())
                     progress_bar.progress(10)
                     
-                    with open(extracted_json, 'r', encoding='utf-8') as f:
-                        data = json.load(f)
+                    # Top-level fields only; the slides are not decoded
+                    data = load_extraction(extracted_json, columns=[])
                     
-                    total_slides = len(data['slides'])
+                    total_slides = data['total_slides']
                     status_text.text(f"Translating {total_slides} slides...")
                     progress_bar.progress(20)
                     
-                    translation_stats = translator.translate_presentation(extracted_json, translated_json)
+                    # Advance continuously as streamed segments arrive
+                    def update_translation_progress(done, total):
+                        fraction = done / total if total else 1.0
+                        progress_bar.progress(min(100, 20 + int(80 * fraction)))
+                        status_text.text(f"Translated {done} of {total} segments...")
+                    
+                    # Titles, body, tables/charts and notes are translated in passes;
+                    # the output file is usable for reassembly after each one
+                    pass_text = st.empty()
+                    passes_done = []
+                    
+                    def update_translation_pass(segment_class, partial_data):
+                        passes_done.append(segment_class.replace("_", " and "))
+                        pass_text.caption(f"Ready for preview: {', '.join(passes_done)}")
+                    
+                    translation_stats = translator.translate_presentation(
+                        extracted_json, translated_json,
+                        progress_callback=update_translation_progress,
+                        partial_callback=update_translation_pass,
+                        write_partial=True
+                    )
                     progress_bar.progress(100)
                     
                     st.session_state.translation_time = time.time() - start_time
@@ -0,0 +1,478 @@
+"""
+Pipeline Benchmarks
+
+Offline measurement harnesses for the translation pipeline. Nothing here calls
+the OpenAI API.
+
+Usage:
+    # Compare prompt tokens per segment for each batch wire format
+    python benchmarks.py prompt-tokens extracted.json [more_extracted.json ...] -l French
+    
+    # Time translate_presentation against responses recorded with
+    # `translator.py --record` (same options as the recording run)
+    python benchmarks.py replay extracted.json recorded.cassette.gz -l French --runs 3 --latency 1.0
+    
+    # Time SmartArt node/hierarchy extraction on a synthetic org chart
+    python benchmarks.py smartart --nodes 2000 --branching 4 --runs 5
+    
+    # Time run and paragraph formatting extraction (both extraction engines)
+    python benchmarks.py text-formatting [deck.pptx] --runs 5
+    
+    # Compare extraction time and JSON size of the full and translation profiles
+    python benchmarks.py extraction-profile deck.pptx --runs 3
+    
+    # Compare write/read time and size of the JSON and binary intermediate formats
+    python benchmarks.py intermediate-format extracted.json --runs 3
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import statistics
+import tempfile
+import time
+from typing import Dict, List
+from unittest import mock
+
+from lxml import etree
+from pptx import Presentation
+
+from binary_format import TEXT_COLUMNS
+from cassette import Cassette, CassetteMiss
+from compact_schema import compact_extraction, load_extraction, save_extraction
+from extractor import EXTRACTION_PROFILES, PPTXExtractor
+from xml_extractor import XMLExtractor
+from glossary import load_glossary
+from language_detect import CONFIDENCE_THRESHOLD
+from translator import DEFAULT_ROUTES, PPTTranslator, PROMPT_FORMATS, SCHEDULES, STRONG_ROUTE_MIN_CHARS
+
+
+# Chat format overhead per message and for the reply primer (OpenAI cookbook)
+TOKENS_PER_MESSAGE = 3
+TOKENS_PER_REPLY = 3
+
+
+def get_token_counter():
+    """
+    Get a token counting function.
+    
+    Uses tiktoken's o200k_base encoding (GPT-4o family) when installed, and
+    falls back to a ~4 characters per token estimate otherwise.
+    
+    Returns:
+        Tuple of (count_function, description)
+    """
+    try:
+        import tiktoken
+        encoding = tiktoken.get_encoding("o200k_base")
+        return (lambda text: len(encoding.encode(text))), "tiktoken o200k_base"
+    except Exception:
+        return (lambda text: max(1, (len(text) + 3) // 4)), "estimate (4 chars/token)"
+
+
+def collect_batches(extracted_json_path: str, target_language: str) -> List[List[str]]:
+    """
+    Collect the batches translate_presentation would send for an extracted deck.
+    
+    The deck is walked with the real translator, but translate_batch is replaced
+    by a recorder that returns its input unchanged.
+    
+    Args:
+        extracted_json_path: Extraction file (JSON or binary, either schema)
+        target_language: Target language name
+        
+    Returns:
+        List of batches (non-empty texts only)
+    """
+    data = load_extraction(extracted_json_path)
+    
+    translator = PPTTranslator(api_key="offline-benchmark", target_language=target_language)
+    batches = []
+    
+    def record_batch(texts, *args, **kwargs):
+        non_empty = [text for text in texts if isinstance(text, str) and text.strip()]
+        if non_empty:
+            batches.append(non_empty)
+        return texts
+    
+    translator.translate_batch = record_batch
+    
+    # Silence per-slide progress output and skip the inter-slide throttle
+    with contextlib.redirect_stdout(io.StringIO()), mock.patch("translator.time.sleep"):
+        for idx, slide in enumerate(data.get("slides", []), 1):
+            translator.translate_slide(slide, idx)
+    
+    return batches
+
+
+def simulated_response(prompt_format: str, texts: List[str]) -> str:
+    """Build the response the model would return, using the sources as a stand-in"""
+    if prompt_format == "compact":
+        return json.dumps(texts, ensure_ascii=False)
+    return json.dumps([{"id": idx, "text": text} for idx, text in enumerate(texts)], ensure_ascii=False)
+
+
+def measure_prompt_tokens(batches: List[List[str]], target_language: str, count_tokens) -> Dict[str, Dict]:
+    """
+    Measure request and response tokens for every wire format.
+    
+    Args:
+        batches: Batches of texts as sent by the translator
+        target_language: Target language name
+        count_tokens: Token counting function
+        
+    Returns:
+        Dictionary of format name -> measurements
+    """
+    results = {}
+    segments = sum(len(batch) for batch in batches)
+    
+    for prompt_format in PROMPT_FORMATS:
+        translator = PPTTranslator(api_key="offline-benchmark", target_language=target_language,
+                                   prompt_format=prompt_format)
+        input_tokens = 0
+        output_tokens = 0
+        static_prefix_tokens = 0
+        
+        for batch in batches:
+            messages = translator.build_batch_messages(batch)
+            input_tokens += TOKENS_PER_REPLY
+            for message in messages:
+                input_tokens += TOKENS_PER_MESSAGE + count_tokens(message["content"])
+            # Only the compact system prompt is identical across every call
+            if prompt_format == "compact":
+                static_prefix_tokens += TOKENS_PER_MESSAGE + count_tokens(messages[0]["content"])
+            output_tokens += count_tokens(simulated_response(prompt_format, batch))
+        
+        results[prompt_format] = {
+            "batches": len(batches),
+            "segments": segments,
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "cacheable_prefix_tokens": static_prefix_tokens,
+            "input_tokens_per_segment": input_tokens / segments if segments else 0.0,
+            "output_tokens_per_segment": output_tokens / segments if segments else 0.0
+        }
+    
+    return results
+
+
+def run_prompt_tokens(args):
+    """Run the prompt token comparison over one or more extracted decks"""
+    count_tokens, counter_name = get_token_counter()
+    print(f"Token counter: {counter_name}")
+    print(f"Target language: {args.language}")
+    
+    totals = {fmt: {"segments": 0, "input_tokens": 0, "output_tokens": 0} for fmt in PROMPT_FORMATS}
+    
+    for path in args.extracted_json:
+        batches = collect_batches(path, args.language)
+        results = measure_prompt_tokens(batches, args.language, count_tokens)
+        
+        print("\n" + "=" * 80)
+        print(f"{path}: {len(batches)} batches, {results[PROMPT_FORMATS[0]]['segments']} segments")
+        print("=" * 80)
+        print(f"{'Format':<10}{'Input tok':>12}{'Output tok':>12}{'In/seg':>10}{'Out/seg':>10}{'Cacheable':>12}")
+        for prompt_format, result in results.items():
+            print(f"{prompt_format:<10}{result['input_tokens']:>12,}{result['output_tokens']:>12,}"
+                  f"{result['input_tokens_per_segment']:>10.1f}{result['output_tokens_per_segment']:>10.1f}"
+                  f"{result['cacheable_prefix_tokens']:>12,}")
+            totals[prompt_format]["segments"] += result["segments"]
+            totals[prompt_format]["input_tokens"] += result["input_tokens"]
+            totals[prompt_format]["output_tokens"] += result["output_tokens"]
+    
+    if len(args.extracted_json) > 1:
+        print("\n" + "=" * 80)
+        print("TOTAL")
+        print("=" * 80)
+        for prompt_format, total in totals.items():
+            segments = total["segments"] or 1
+            print(f"{prompt_format:<10}{total['input_tokens']:>12,}{total['output_tokens']:>12,}"
+                  f"{total['input_tokens'] / segments:>10.1f}{total['output_tokens'] / segments:>10.1f}")
+    
+    baseline = totals["json"]["input_tokens"] + totals["json"]["output_tokens"]
+    compact = totals["compact"]["input_tokens"] + totals["compact"]["output_tokens"]
+    if baseline:
+        print(f"\nCompact format saves {100 * (baseline - compact) / baseline:.1f}% of tokens vs legacy JSON")
+
+
+def run_replay(args):
+    """Time translate_presentation with every response served from a cassette"""
+    cassette = Cassette(args.cassette, mode="replay", latency_scale=args.latency)
+    print(f"Cassette: {args.cassette} ({len(cassette)} recorded requests, latency x{args.latency})")
+    
+    timings = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        output_path = os.path.join(tmp_dir, "translated.json")
+        for run in range(1, args.runs + 1):
+            # Same request-shaping options as translator.py, so requests match the recording
+            translator = PPTTranslator(target_language=args.language, prompt_format=args.prompt_format,
+                                       stream=not args.no_stream, cassette=cassette,
+                                       strong_model=args.strong_model,
+                                       strong_min_chars=args.strong_min_chars,
+                                       glossary=load_glossary(args.glossary) if args.glossary else None,
+                                       skip_target_language=args.skip_target_language,
+                                       language_threshold=args.language_threshold,
+                                       deck_summary=args.deck_summary)
+            try:
+                with contextlib.redirect_stdout(io.StringIO()):
+                    start = time.perf_counter()
+                    stats = translator.translate_presentation(args.extracted_json, output_path,
+                                                              schedule=args.schedule)
+                    elapsed = time.perf_counter() - start
+            except CassetteMiss as e:
+                # Timings of a run that drifted from the recording are meaningless
+                raise SystemExit(f"Replay failed: {e.args[0]}. Pass the options used with translator.py --record "
+                                 f"(and record without a translation memory)")
+            timings.append(elapsed)
+            print(f"Run {run}: {elapsed:.3f}s, {stats['api_calls']} calls, "
+                  f"{stats['total_tokens_used']:,} tokens")
+    
+    print(f"\nMedian: {statistics.median(timings):.3f}s over {len(timings)} runs "
+          f"(min {min(timings):.3f}s, max {max(timings):.3f}s)")
+
+
+def synthetic_smartart(node_count: int, branching: int) -> bytes:
+    """
+    Build a SmartArt data part shaped like an org chart.
+    
+    Args:
+        node_count: Number of content nodes
+        branching: Children per node (node i reports to node (i - 1) // branching)
+        
+    Returns:
+        dgm:dataModel XML
+    """
+    dgm = "http://schemas.openxmlformats.org/drawingml/2006/diagram"
+    a = "http://schemas.openxmlformats.org/drawingml/2006/main"
+    points = ['<dgm:pt modelId="{doc}" type="doc"><dgm:prSet/><dgm:spPr/><dgm:t><a:bodyPr/></dgm:t></dgm:pt>']
+    connections = []
+    for idx in range(node_count):
+        points.append(f'<dgm:pt modelId="{{n{idx}}}"><dgm:prSet/><dgm:spPr/><dgm:t><a:bodyPr/><a:lstStyle/>'
+                      f'<a:p><a:r><a:rPr lang="en-US"/><a:t>Position {idx}</a:t></a:r></a:p></dgm:t></dgm:pt>')
+        parent = "{doc}" if idx == 0 else f"{{n{(idx - 1) // branching}}}"
+        connections.append(f'<dgm:cxn modelId="{{c{idx}}}" type="parOf" srcId="{parent}" destId="{{n{idx}}}" '
+                           f'srcOrd="{idx % branching}" destOrd="0"/>')
+    return (f'<dgm:dataModel xmlns:dgm="{dgm}" xmlns:a="{a}"><dgm:ptLst>{"".join(points)}</dgm:ptLst>'
+            f'<dgm:cxnLst>{"".join(connections)}</dgm:cxnLst><dgm:bg/><dgm:whole/></dgm:dataModel>').encode("utf-8")
+
+
+def run_smartart(args):
+    """Time SmartArt extraction (parse, nodes, parents and levels) on a synthetic diagram"""
+    xml = synthetic_smartart(args.nodes, args.branching)
+    print(f"Synthetic diagram: {args.nodes:,} nodes, branching {args.branching} ({len(xml):,} bytes)")
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        deck_path = os.path.join(tmp_dir, "blank.pptx")
+        Presentation().save(deck_path)
+        extractor = PPTXExtractor(deck_path)
+    
+    timings = []
+    for run in range(1, args.runs + 1):
+        start = time.perf_counter()
+        smartart = extractor.extract_smartart_diagram(etree.fromstring(xml))
+        elapsed = time.perf_counter() - start
+        timings.append(elapsed)
+        levels = [node["level"] for node in smartart["nodes"] if node["level"] is not None]
+        print(f"Run {run}: {elapsed * 1000:.1f}ms, {len(smartart['nodes']):,} nodes, "
+              f"{len(levels):,} with levels (max {max(levels, default=0)})")
+    
+    print(f"\nMedian: {statistics.median(timings) * 1000:.1f}ms over {len(timings)} runs")
+
+
+def synthetic_text_deck(path: str, paragraph_count: int = 400, runs_per_paragraph: int = 5):
+    """
+    Save a one-slide deck whose text box has richly formatted paragraphs and runs.
+    
+    Paragraphs cycle through character bullets, auto-numbering and no bullet;
+    runs set strike, kerning, spacing, caps, baseline, a highlight and an outline.
+    """
+    a = "http://schemas.openxmlformats.org/drawingml/2006/main"
+    bullets = [
+        f'<a:buClr xmlns:a="{a}"><a:schemeClr val="accent1"/></a:buClr>'
+        f'<a:buFont xmlns:a="{a}" typeface="Arial"/><a:buChar xmlns:a="{a}" char="-"/>',
+        f'<a:buAutoNum xmlns:a="{a}" type="arabicPeriod" startAt="2"/>',
+        f'<a:buNone xmlns:a="{a}"/>'
+    ]
+    presentation = Presentation()
+    slide = presentation.slides.add_slide(presentation.slide_layouts[6])
+    text_frame = slide.shapes.add_textbox(0, 0, 5000000, 5000000).text_frame
+    for p_idx in range(paragraph_count):
+        paragraph = text_frame.paragraphs[0] if p_idx == 0 else text_frame.add_paragraph()
+        pPr = paragraph._p.get_or_add_pPr()
+        pPr.set("marL", "342900")
+        pPr.set("indent", "-342900")
+        for bullet in etree.fromstring(f'<x xmlns:a="{a}">{bullets[p_idx % len(bullets)]}</x>'):
+            pPr.append(bullet)
+        for r_idx in range(runs_per_paragraph):
+            run = paragraph.add_run()
+            run.text = f"Run {r_idx} of paragraph {p_idx} "
+            run.font.bold = r_idx % 2 == 0
+            rPr = run._r.get_or_add_rPr()
+            for name, value in (("strike", "sngStrike"), ("kern", "1200"), ("spc", "-50"), ("cap", "small"),
+                                ("baseline", "30000" if r_idx % 2 else "-25000")):
+                rPr.set(name, value)
+            rPr.append(etree.fromstring(f'<a:ln xmlns:a="{a}" w="9525"><a:solidFill><a:srgbClr val="112233"/>'
+                                        f'</a:solidFill></a:ln>'))
+            rPr.append(etree.fromstring(f'<a:highlight xmlns:a="{a}"><a:srgbClr val="FFFF00"/></a:highlight>'))
+    presentation.save(path)
+
+
+def time_per_item(func, items, runs: int) -> float:
+    """Median microseconds per item of func over the items"""
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        for item in items:
+            func(item)
+        timings.append((time.perf_counter() - start) / max(len(items), 1) * 1e6)
+    return statistics.median(timings)
+
+
+def run_text_formatting(args):
+    """Time per-run and per-paragraph formatting extraction on a deck's text frames"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        deck_path = args.pptx_file
+        if not deck_path:
+            deck_path = os.path.join(tmp_dir, "text_formatting.pptx")
+            synthetic_text_deck(deck_path)
+        extractor = PPTXExtractor(deck_path)
+        xml_extractor = XMLExtractor(deck_path)
+    
+    paragraphs = [paragraph for slide in extractor.presentation.slides for shape in slide.shapes
+                  if shape.has_text_frame for paragraph in shape.text_frame.paragraphs]
+    runs = [run for paragraph in paragraphs for run in paragraph.runs]
+    print(f"Deck: {args.pptx_file or 'synthetic'} ({len(paragraphs):,} paragraphs, {len(runs):,} runs)")
+    
+    print(f"{'Engine':<14}{'us/run':>10}{'us/paragraph':>14}{'us/bullets':>12}")
+    results = {
+        "python-pptx": (
+            time_per_item(extractor.extract_run_formatting, runs, args.runs),
+            time_per_item(extractor.extract_paragraph_formatting, paragraphs, args.runs),
+            time_per_item(extractor.extract_bullet_formatting, paragraphs, args.runs)
+        ),
+        # The XML engine reads the same lxml elements
+        "xml": (
+            time_per_item(xml_extractor.extract_run_formatting, [run._r for run in runs], args.runs),
+            time_per_item(xml_extractor.extract_paragraph_formatting, [p._p for p in paragraphs], args.runs),
+            time_per_item(xml_extractor.extract_bullet_formatting, [p._p.pPr for p in paragraphs], args.runs)
+        )
+    }
+    for engine, (per_run, per_paragraph, per_bullets) in results.items():
+        print(f"{engine:<14}{per_run:>10.1f}{per_paragraph:>14.1f}{per_bullets:>12.1f}")
+
+
+def run_extraction_profile(args):
+    """Time extract_all and measure the JSON size for each engine and extraction profile"""
+    print(f"Deck: {args.pptx_file}")
+    print(f"{'Engine':<14}{'Profile':<14}{'seconds':>10}{'JSON bytes':>14}")
+    for engine, extractor_class in (("python-pptx", PPTXExtractor), ("xml", XMLExtractor)):
+        for profile in EXTRACTION_PROFILES:
+            timings = []
+            for _ in range(args.runs):
+                start = time.perf_counter()
+                with contextlib.redirect_stdout(io.StringIO()):
+                    data = extractor_class(args.pptx_file, profile=profile).extract_all()
+                timings.append(time.perf_counter() - start)
+            size = len(json.dumps(data, indent=2, ensure_ascii=False).encode("utf-8"))
+            print(f"{engine:<14}{profile:<14}{statistics.median(timings):>10.3f}{size:>14,}")
+
+
+def run_intermediate_format(args):
+    """Time writing and reading an extraction in each intermediate format"""
+    data = load_extraction(args.extracted_json, expand=True)
+    print(f"Extraction: {args.extracted_json} ({data['total_slides']} slides)")
+    print(f"{'Format':<18}{'bytes':>14}{'write s':>10}{'read s':>10}{'text s':>10}")
+    
+    variants = [
+        ("json", data, ".json"),
+        ("json compact", compact_extraction(data), ".json"),
+        ("msgpack", data, ".msgpack"),
+        ("msgpack compact", compact_extraction(data), ".msgpack")
+    ]
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for name, variant, extension in variants:
+            path = os.path.join(tmp_dir, "extraction" + extension)
+            timings = {"write": [], "read": [], "text": []}
+            for _ in range(args.runs):
+                start = time.perf_counter()
+                save_extraction(variant, path)
+                timings["write"].append(time.perf_counter() - start)
+                start = time.perf_counter()
+                load_extraction(path)
+                timings["read"].append(time.perf_counter() - start)
+                # What QA, incremental alignment and reassembly load
+                start = time.perf_counter()
+                load_extraction(path, columns=TEXT_COLUMNS)
+                timings["text"].append(time.perf_counter() - start)
+            write, read, text = (statistics.median(timings[key]) for key in ("write", "read", "text"))
+            print(f"{name:<18}{os.path.getsize(path):>14,}{write:>10.3f}{read:>10.3f}{text:>10.3f}")
+
+
+def main():
+    """Main function to run benchmarks"""
+    parser = argparse.ArgumentParser(description="Offline benchmarks for the translation pipeline")
+    subparsers = parser.add_subparsers(dest="benchmark", required=True)
+    
+    prompt_parser = subparsers.add_parser("prompt-tokens", help="Compare prompt tokens per segment across wire formats")
+    prompt_parser.add_argument("extracted_json", nargs="+", help="Extraction file(s) to measure (.json or .msgpack)")
+    prompt_parser.add_argument("-l", "--language", default="Spanish", help="Target language (default: Spanish)")
+    prompt_parser.set_defaults(func=run_prompt_tokens)
+    
+    replay_parser = subparsers.add_parser("replay", help="Time translate_presentation against a recorded cassette")
+    replay_parser.add_argument("extracted_json", help="Extracted JSON file the cassette was recorded for")
+    replay_parser.add_argument("cassette", help="Cassette recorded with translator.py --record")
+    replay_parser.add_argument("-l", "--language", default="Spanish", help="Target language (default: Spanish)")
+    replay_parser.add_argument("--prompt-format", choices=PROMPT_FORMATS, default="compact",
+                               help="Batch wire format used when recording (default: compact)")
+    replay_parser.add_argument("--no-stream", action="store_true",
+                               help="Use if the cassette was recorded with --no-stream")
+    replay_parser.add_argument("--strong-model", default=DEFAULT_ROUTES["strong"]["model"],
+                               help="Strong route model used when recording (default: translator.py's)")
+    replay_parser.add_argument("--strong-min-chars", type=int, default=STRONG_ROUTE_MIN_CHARS,
+                               help="--strong-min-chars used when recording (default: translator.py's)")
+    replay_parser.add_argument("--schedule", choices=SCHEDULES, default="priority",
+                               help="--schedule used when recording (default: priority)")
+    replay_parser.add_argument("--glossary", metavar="TSV", help="Glossary used when recording")
+    replay_parser.add_argument("--skip-target-language", action="store_true",
+                               help="Use if the cassette was recorded with --skip-target-language")
+    replay_parser.add_argument("--language-threshold", type=float, default=CONFIDENCE_THRESHOLD,
+                               help="--language-threshold used when recording (default: translator.py's)")
+    replay_parser.add_argument("--deck-summary", action="store_true",
+                               help="Use if the cassette was recorded with --deck-summary")
+    replay_parser.add_argument("--runs", type=int, default=3, help="Number of timed runs (default: 3)")
+    replay_parser.add_argument("--latency", type=float, default=0.0,
+                               help="Replay delay as a multiple of the recorded latency (default: 0)")
+    replay_parser.set_defaults(func=run_replay)
+    
+    smartart_parser = subparsers.add_parser("smartart", help="Time SmartArt hierarchy extraction on a synthetic diagram")
+    smartart_parser.add_argument("--nodes", type=int, default=2000, help="Content nodes (default: 2000)")
+    smartart_parser.add_argument("--branching", type=int, default=4, help="Children per node (default: 4)")
+    smartart_parser.add_argument("--runs", type=int, default=5, help="Number of timed runs (default: 5)")
+    smartart_parser.set_defaults(func=run_smartart)
+    
+    text_parser = subparsers.add_parser("text-formatting", help="Time run and paragraph formatting extraction")
+    text_parser.add_argument("pptx_file", nargs="?", help="Deck to measure (default: synthetic 400 x 5 runs)")
+    text_parser.add_argument("--runs", type=int, default=5, help="Number of timed runs (default: 5)")
+    text_parser.set_defaults(func=run_text_formatting)
+    
+    profile_parser = subparsers.add_parser("extraction-profile",
+                                           help="Compare extraction time and JSON size across extraction profiles")
+    profile_parser.add_argument("pptx_file", help="Deck to extract")
+    profile_parser.add_argument("--runs", type=int, default=3, help="Number of timed runs (default: 3)")
+    profile_parser.set_defaults(func=run_extraction_profile)
+    
+    format_parser = subparsers.add_parser("intermediate-format",
+                                          help="Compare JSON and binary intermediate file write/read time and size")
+    format_parser.add_argument("extracted_json", help="Extraction file (.json or .msgpack)")
+    format_parser.add_argument("--runs", type=int, default=3, help="Number of timed runs (default: 3)")
+    format_parser.set_defaults(func=run_intermediate_format)
+    
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,270 @@
+"""
+Binary Intermediate Format
+
+Extraction and translation files can be stored as msgpack instead of indent=2
+JSON. Writing pretty-printed JSON runs json's pure-Python encoder, and reading
+it back parses every field even when a stage only needs the text; the binary
+format packs each column separately so a reader decodes only the columns it
+asks for.
+
+Layout (one msgpack map):
+
+    {
+      "binary_format": "columns-v1",
+      "keys": ["presentation_name", "total_slides", "slide_masters", "slides"],
+      "meta": {"presentation_name": "deck.pptx", "total_slides": 12},
+      "key_orders": {"slides": [["slide_number", "layout_info", "elements", ...]],
+                     "slides.elements": [["shape_id", "shape_name", "element_type", ...]]},
+      "columns": {
+        "slides#keys": <bin>,                  # per slide: index into key_orders["slides"]
+        "slides.speaker_notes": <bin>,         # per slide: its "speaker_notes" value
+        "slides.elements#count": <bin>,        # per slide: number of elements
+        "slides.elements#keys": <bin>,         # per element (all slides, in order)
+        "slides.elements.paragraphs": <bin>,   # per element: its "paragraphs" value
+        "slides.elements.fill": <bin>,
+        "slide_masters": <bin>
+      }
+    }
+
+Top-level scalars ("meta") are always loaded. Other top-level values are one
+column each, and slides and their elements are stored one column per key.
+Selecting a prefix ("slides", "slides.elements") selects every column under
+it. Loaded data is the same as json.load of the JSON form of the dictionary,
+restricted to the selected columns.
+
+Any path ending in .msgpack is written in this format (see
+compact_schema.save_extraction); files are recognised by content when loaded.
+
+Usage:
+    python extractor.py deck.pptx -o deck.msgpack
+    python binary_format.py deck.msgpack deck.json
+    python binary_format.py deck.json deck.msgpack
+"""
+
+from itertools import islice
+from typing import Dict, Iterable, List, Optional
+
+try:
+    import msgpack
+except ImportError:  # Optional: only needed for .msgpack files
+    msgpack = None
+
+
+BINARY_FORMAT = "columns-v1"
+BINARY_EXTENSION = ".msgpack"
+
+# Lists of records stored as one column per key (the elements of all slides
+# form one table, so a reader can skip e.g. their fills and geometry)
+RECORD_TABLES = ("slides", "slides.elements")
+
+# Everything the text-only stages (QA, incremental alignment, record sheets,
+# reassembly) read besides the top-level scalars
+TEXT_COLUMNS = [
+    "slides.slide_number", "slides.speaker_notes", "slides.smartart",
+    "slides.elements.shape_id", "slides.elements.shape_name", "slides.elements.element_type",
+    "slides.elements.paragraphs", "slides.elements.full_text",
+    "slides.elements.table_data", "slides.elements.chart_data"
+]
+
+
+def require_msgpack():
+    """Raise a helpful error if msgpack is not installed"""
+    if msgpack is None:
+        raise ImportError("Binary intermediate files need msgpack: python3 -m pip install msgpack")
+
+
+def is_binary_path(path: str) -> bool:
+    """Check whether a path should be written in the binary format"""
+    return path.lower().endswith(BINARY_EXTENSION)
+
+
+def is_binary_file(path: str) -> bool:
+    """Check whether a file holds the binary format (a msgpack map, not JSON text)"""
+    with open(path, 'rb') as f:
+        head = f.read(1)
+    return bool(head) and (0x80 <= head[0] <= 0x8f or head[0] in (0xde, 0xdf))
+
+
+def _pack(value) -> bytes:
+    return msgpack.packb(value, use_bin_type=True)
+
+
+def _unpack(blob: bytes):
+    return msgpack.unpackb(blob, raw=False, strict_map_key=False)
+
+
+def _wanted(selected: Optional[set], name: str) -> bool:
+    """Check whether a column was selected (directly or through a prefix such as "slides")"""
+    if selected is None:
+        return True
+    parts = name.split(".")
+    return any(".".join(parts[:end]) in selected for end in range(1, len(parts) + 1))
+
+
+def _wants_table(selected: Optional[set], table: str) -> bool:
+    """Check whether any column of a nested record table was selected"""
+    return _wanted(selected, table) or any(name.startswith(table + ".") for name in selected)
+
+
+def _split_table(records: List[Dict], table: str, columns: Dict[str, bytes], key_orders: Dict[str, List]):
+    """Store a list of records as one column per key, recursing into nested tables"""
+    orders = {}
+    table_orders = key_orders[table] = []
+    indexes = []
+    for record in records:
+        order = tuple(record)
+        if order not in orders:
+            orders[order] = len(table_orders)
+            table_orders.append(list(order))
+        indexes.append(orders[order])
+    columns[f"{table}#keys"] = _pack(indexes)
+    
+    # Every record has an entry in every column (None where it lacks the key)
+    for key in dict.fromkeys(key for order in table_orders for key in order):
+        name = f"{table}.{key}"
+        values = [record.get(key) for record in records]
+        if name in RECORD_TABLES:
+            columns[f"{name}#count"] = _pack([None if value is None else len(value) for value in values])
+            _split_table([item for value in values if value for item in value], name, columns, key_orders)
+        else:
+            columns[name] = _pack(values)
+
+
+def _join_table(container: Dict, table: str, selected: Optional[set]) -> List[Dict]:
+    """Rebuild a list of records from its selected columns"""
+    columns = container["columns"]
+    table_orders = container["key_orders"][table]
+    indexes = _unpack(columns[f"{table}#keys"])
+    
+    values = {}
+    for key in dict.fromkeys(key for order in table_orders for key in order):
+        name = f"{table}.{key}"
+        if name in RECORD_TABLES:
+            if _wants_table(selected, name):
+                items = iter(_join_table(container, name, selected))
+                values[key] = [None if count is None else list(islice(items, count))
+                               for count in _unpack(columns[f"{name}#count"])]
+        elif _wanted(selected, name):
+            values[key] = _unpack(columns[name])
+    
+    return [{key: values[key][idx] for key in table_orders[order] if key in values}
+            for idx, order in enumerate(indexes)]
+
+
+def _select_table(records: List[Dict], table: str, selected: set) -> List[Dict]:
+    """Keep the selected keys of a list of records, like _join_table"""
+    selected_records = []
+    for record in records:
+        selected_record = {}
+        for key, value in record.items():
+            name = f"{table}.{key}"
+            if name in RECORD_TABLES:
+                if _wants_table(selected, name):
+                    selected_record[key] = None if value is None else _select_table(value, name, selected)
+            elif _wanted(selected, name):
+                selected_record[key] = value
+        selected_records.append(selected_record)
+    return selected_records
+
+
+def save_binary(data: Dict, path: str):
+    """
+    Write an extraction or translation in the binary format.
+    
+    Args:
+        data: Extraction dictionary (full or compact schema)
+        path: Output path
+    """
+    require_msgpack()
+    meta = {}
+    columns = {}
+    key_orders = {}
+    
+    for key, value in data.items():
+        if key in RECORD_TABLES:
+            _split_table(value, key, columns, key_orders)
+        elif isinstance(value, (dict, list, tuple)):
+            columns[key] = _pack(value)
+        else:
+            meta[key] = value
+    
+    container = {
+        "binary_format": BINARY_FORMAT,
+        "keys": list(data),
+        "meta": meta,
+        "key_orders": key_orders,
+        "columns": columns
+    }
+    with open(path, 'wb') as f:
+        f.write(_pack(container))
+
+
+def load_binary(path: str, columns: Optional[Iterable[str]] = None) -> Dict:
+    """
+    Read an extraction or translation written by save_binary.
+    
+    Args:
+        path: Binary file path
+        columns: Columns to decode (None = all). Top-level scalars are always
+            loaded, and "slides" always holds one dictionary per slide.
+            
+    Returns:
+        Extraction dictionary with the selected columns
+    """
+    require_msgpack()
+    with open(path, 'rb') as f:
+        container = _unpack(f.read())
+    if container.get("binary_format") != BINARY_FORMAT:
+        raise ValueError(f"{path} is not a {BINARY_FORMAT} binary extraction file")
+    
+    selected = set(columns) if columns is not None else None
+    meta = container["meta"]
+    
+    data = {}
+    for key in container["keys"]:
+        if key in meta:
+            data[key] = meta[key]
+        elif key in RECORD_TABLES:
+            data[key] = _join_table(container, key, selected)
+        elif _wanted(selected, key):
+            data[key] = _unpack(container["columns"][key])
+    return data
+
+
+def select_columns(data: Dict, columns: Optional[Iterable[str]]) -> Dict:
+    """
+    Keep only the selected columns of an in-memory extraction.
+    
+    Gives JSON files the same column selection as load_binary.
+    """
+    if columns is None:
+        return data
+    selected = set(columns)
+    selected_data = {}
+    for key, value in data.items():
+        if key in RECORD_TABLES:
+            selected_data[key] = _select_table(value, key, selected)
+        elif not isinstance(value, (dict, list, tuple)) or _wanted(selected, key):
+            selected_data[key] = value
+    return selected_data
+
+
+def main():
+    """Convert extraction files between JSON and the binary format"""
+    import argparse
+    import os
+    
+    from compact_schema import load_extraction, save_extraction
+    
+    parser = argparse.ArgumentParser(description="Convert extraction or translation files between JSON and msgpack")
+    parser.add_argument("input", help="Extraction or translation file (.json or .msgpack)")
+    parser.add_argument("output", help=f"Output path ({BINARY_EXTENSION} writes the binary format, anything else JSON)")
+    args = parser.parse_args()
+    
+    save_extraction(load_extraction(args.input), args.output)
+    print(f"{args.input} ({os.path.getsize(args.input):,} bytes) -> "
+          f"{args.output} ({os.path.getsize(args.output):,} bytes)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,333 @@
+"""
+Request Cassettes
+
+Records chat completion requests and their responses to a compressed cassette
+file and replays them, so benchmarks of translate_presentation and app.py see
+the exact same model responses on every run, offline and in CI.
+
+Each entry is keyed by a SHA-256 of the canonical JSON request body (model,
+messages and every parameter), so a replayed run only gets a response for a
+request it sends byte-for-byte identically. Streamed responses are stored chunk
+by chunk with their arrival offsets, so replay reproduces incremental parsing
+and, when asked to, the recorded timing.
+
+Cassette file: gzip-compressed JSON lines, one entry per request
+    {"key": ..., "request": {...}, "stream": true, "chunks": [...], "offsets": [...]}
+    {"key": ..., "request": {...}, "stream": false, "response": {...}, "latency": 1.42}
+
+Modes:
+    record  send every request to the API and append new pairs to the cassette
+    replay  serve every request from the cassette (no API key needed); a
+            request that was not recorded raises CassetteMiss
+    auto    replay recorded requests, record the others
+
+Usage:
+    python translator.py deck.json -l French --record deck_french.cassette.gz
+    python translator.py deck.json -l French --replay deck_french.cassette.gz --replay-latency 1.0
+    python cassette.py deck_french.cassette.gz
+
+app.py reads the same settings from the environment:
+    PPT_CASSETTE=deck.cassette.gz PPT_CASSETTE_MODE=replay streamlit run app.py
+"""
+
+import atexit
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+import zlib
+from types import SimpleNamespace
+from typing import Any, Dict, Optional
+
+
+CASSETTE_MODES = ["record", "replay", "auto"]
+
+# Environment variables read by cassette_from_env (app.py)
+ENV_PATH = "PPT_CASSETTE"
+ENV_MODE = "PPT_CASSETTE_MODE"
+ENV_LATENCY = "PPT_CASSETTE_LATENCY"
+
+
+class CassetteMiss(KeyError):
+    """Raised in replay mode for a request that is not in the cassette"""
+
+
+def request_key(request: Dict) -> str:
+    """
+    Hash a request body.
+    
+    Args:
+        request: Keyword arguments of chat.completions.create (including model)
+        
+    Returns:
+        Hex SHA-256 of the canonical JSON body
+    """
+    body = json.dumps(request, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(body.encode("utf-8")).hexdigest()
+
+
+def to_plain(value: Any) -> Any:
+    """
+    Convert an SDK response object into JSON-compatible data.
+    
+    Args:
+        value: Pydantic model, namespace, list or scalar
+        
+    Returns:
+        Dicts, lists and scalars only
+    """
+    if hasattr(value, "model_dump"):
+        return value.model_dump(mode="json", exclude_none=True)
+    if isinstance(value, dict):
+        return {key: to_plain(item) for key, item in value.items() if item is not None}
+    if isinstance(value, (list, tuple)):
+        return [to_plain(item) for item in value]
+    if hasattr(value, "__dict__"):
+        return {key: to_plain(item) for key, item in vars(value).items() if item is not None}
+    return value
+
+
+def to_attrs(value: Any) -> Any:
+    """
+    Rebuild attribute access over recorded data (the inverse of to_plain).
+    
+    Fields that were not recorded read as None, like unset SDK fields.
+    
+    Args:
+        value: Dicts, lists and scalars
+        
+    Returns:
+        Nested objects readable like SDK responses
+    """
+    if isinstance(value, dict):
+        return RecordedObject(**{key: to_attrs(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return [to_attrs(item) for item in value]
+    return value
+
+
+class RecordedObject(SimpleNamespace):
+    """Namespace that reads missing attributes as None"""
+    
+    def __getattr__(self, name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        return None
+
+
+class Cassette:
+    """
+    Request/response pairs stored in a gzip JSON-lines file.
+    
+    Thread-safe: one cassette can be shared by the hedge workers of a
+    translator and by concurrent translators (app.py sessions).
+    """
+    
+    def __init__(self, path: str, mode: str = "replay", latency_scale: float = 0.0):
+        """
+        Args:
+            path: Cassette file path
+            mode: "record", "replay" or "auto" (see CASSETTE_MODES)
+            latency_scale: Replay delay as a multiple of the recorded latency
+                (0 = serve immediately, 1 = recorded timing)
+        """
+        if mode not in CASSETTE_MODES:
+            raise ValueError(f"Unknown cassette mode '{mode}'. Choose from: {', '.join(CASSETTE_MODES)}")
+        if mode == "replay" and not os.path.exists(path):
+            raise FileNotFoundError(f"Cassette not found: {path}")
+        self.path = path
+        self.mode = mode
+        self.latency_scale = latency_scale
+        self.entries: Dict[str, Dict] = {}
+        self.stats = {"replayed": 0, "recorded": 0, "misses": 0}
+        self._lock = threading.Lock()
+        self._file = None
+        if os.path.exists(path):
+            self._load()
+    
+    def _load(self):
+        """Read every entry; a tail cut off by an interrupted recording is ignored"""
+        try:
+            with gzip.open(self.path, "rt", encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        self.entries.setdefault(entry["key"], entry)
+        except (EOFError, zlib.error, json.JSONDecodeError) as e:
+            print(f"Cassette {self.path} ends with an incomplete entry, ignoring it: {e}")
+    
+    def __len__(self):
+        return len(self.entries)
+    
+    def lookup(self, request: Dict) -> Optional[Dict]:
+        """
+        Get the recorded entry for a request.
+        
+        Args:
+            request: Keyword arguments of chat.completions.create (including model)
+            
+        Returns:
+            Entry dictionary, or None if the request was not recorded
+        """
+        with self._lock:
+            return self.entries.get(request_key(request))
+    
+    def add(self, request: Dict, entry: Dict):
+        """
+        Store a response and append it to the file (the first response for a
+        request wins, so hedged duplicates are written once).
+        
+        Args:
+            request: Request body the response answers
+            entry: Response fields ("stream" plus "chunks"/"offsets" or "response"/"latency")
+        """
+        key = request_key(request)
+        with self._lock:
+            if key in self.entries:
+                return
+            entry = {"key": key, "request": request, **entry}
+            self.entries[key] = entry
+            if self._file is None:
+                self._file = gzip.open(self.path, "at", encoding="utf-8")
+                atexit.register(self.close)
+            self._file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            # Sync flush, so an interrupted run keeps everything written so far
+            self._file.flush()
+            self.stats["recorded"] += 1
+    
+    def close(self):
+        """Finish the cassette file (safe to call more than once)"""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+    
+    def wrap(self, client=None) -> "CassetteClient":
+        """
+        Wrap an OpenAI client so its chat completions go through the cassette.
+        
+        Args:
+            client: OpenAI client (may be None in replay mode)
+            
+        Returns:
+            CassetteClient exposing chat.completions.create
+        """
+        if client is None and self.mode != "replay":
+            raise ValueError(f"Cassette mode '{self.mode}' needs an OpenAI client to record from")
+        return CassetteClient(self, client)
+    
+    def _sleep_until(self, start: float, offset: float):
+        """Wait until `offset` recorded seconds (scaled) after `start`"""
+        delay = start + offset * self.latency_scale - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+
+class CassetteClient:
+    """Stand-in for the OpenAI client that records or replays chat completions"""
+    
+    def __init__(self, cassette: Cassette, client=None):
+        self.cassette = cassette
+        self.client = client
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+    
+    def create(self, **request):
+        """
+        Serve a chat completion from the cassette, or send and record it.
+        
+        Args:
+            **request: Keyword arguments of chat.completions.create
+            
+        Returns:
+            Completion (or iterator of chunks when request["stream"] is set)
+        """
+        cassette = self.cassette
+        start = time.monotonic()
+        entry = cassette.lookup(request) if cassette.mode != "record" else None
+        if entry is not None:
+            with cassette._lock:
+                cassette.stats["replayed"] += 1
+            if entry["stream"]:
+                return self._replay_stream(entry, start)
+            cassette._sleep_until(start, entry.get("latency", 0.0))
+            return to_attrs(entry["response"])
+        
+        if cassette.mode == "replay":
+            with cassette._lock:
+                cassette.stats["misses"] += 1
+            raise CassetteMiss(f"Request {request_key(request)[:12]} is not in cassette {cassette.path}")
+        
+        response = self.client.chat.completions.create(**request)
+        if request.get("stream"):
+            return self._record_stream(request, response, start)
+        cassette.add(request, {
+            "stream": False,
+            "response": to_plain(response),
+            "latency": round(time.monotonic() - start, 4)
+        })
+        return response
+    
+    def _replay_stream(self, entry: Dict, start: float):
+        """Yield recorded chunks, optionally at their recorded offsets"""
+        for chunk, offset in zip(entry["chunks"], entry["offsets"]):
+            self.cassette._sleep_until(start, offset)
+            yield to_attrs(chunk)
+    
+    def _record_stream(self, request: Dict, response, start: float):
+        """Pass chunks through as they arrive; record them once the stream completes"""
+        chunks = []
+        offsets = []
+        for chunk in response:
+            chunks.append(to_plain(chunk))
+            offsets.append(round(time.monotonic() - start, 4))
+            yield chunk
+        self.cassette.add(request, {"stream": True, "chunks": chunks, "offsets": offsets})
+
+
+def cassette_from_env() -> Optional[Cassette]:
+    """
+    Create a cassette from PPT_CASSETTE, PPT_CASSETTE_MODE (default: replay)
+    and PPT_CASSETTE_LATENCY (default: 0).
+    
+    Returns:
+        Cassette, or None if PPT_CASSETTE is not set
+    """
+    path = os.getenv(ENV_PATH)
+    if not path:
+        return None
+    return Cassette(path, mode=os.getenv(ENV_MODE, "replay"),
+                    latency_scale=float(os.getenv(ENV_LATENCY, "0")))
+
+
+def main():
+    """Summarize a cassette"""
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Summarize a recorded request cassette")
+    parser.add_argument("cassette", help="Cassette file (gzip JSON lines)")
+    args = parser.parse_args()
+    
+    cassette = Cassette(args.cassette)
+    models = {}
+    streamed = 0
+    recorded_latency = 0.0
+    for entry in cassette.entries.values():
+        model = entry["request"].get("model", "?")
+        models[model] = models.get(model, 0) + 1
+        if entry["stream"]:
+            streamed += 1
+            recorded_latency += entry["offsets"][-1] if entry["offsets"] else 0.0
+        else:
+            recorded_latency += entry.get("latency", 0.0)
+    
+    print(f"Cassette: {args.cassette} ({os.path.getsize(args.cassette):,} bytes)")
+    print(f"Requests: {len(cassette)} ({streamed} streamed)")
+    for model, count in sorted(models.items()):
+        print(f"  - {model}: {count}")
+    print(f"Recorded latency: {recorded_latency:.2f}s total")
+
+
+if __name__ == "__main__":
+    main()
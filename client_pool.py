@@ -0,0 +1,169 @@
+"""
+Shared OpenAI Client Pool
+
+Provides process-wide OpenAI clients backed by a tuned keep-alive connection
+pool, so every PPTTranslator (one per upload in app.py) reuses warm connections
+instead of paying DNS, TCP and TLS setup on each job.
+
+- One synchronous client per API key, shared across threads
+- One asynchronous client per API key and running event loop
+- HTTP/2 is enabled automatically when the optional `h2` package is installed
+
+Usage:
+    from client_pool import get_openai_client
+    client = get_openai_client(api_key)
+"""
+
+import asyncio
+import os
+import threading
+import weakref
+from typing import Dict, Optional
+
+import httpx
+from dotenv import load_dotenv
+from openai import OpenAI, AsyncOpenAI, DefaultHttpxClient, DefaultAsyncHttpxClient
+
+
+# Connection pool tuning
+MAX_CONNECTIONS = 64
+MAX_KEEPALIVE_CONNECTIONS = 32
+KEEPALIVE_EXPIRY = 120.0  # seconds an idle connection is kept open
+
+# Timeouts (seconds) - read is generous because batch completions can be slow
+CONNECT_TIMEOUT = 10.0
+READ_TIMEOUT = 120.0
+WRITE_TIMEOUT = 30.0
+POOL_TIMEOUT = 30.0
+
+MAX_RETRIES = 2
+
+_lock = threading.Lock()
+_env_loaded = False
+_sync_clients: Dict[str, OpenAI] = {}
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, AsyncOpenAI]]" = weakref.WeakKeyDictionary()
+
+
+def http2_available() -> bool:
+    """Return True if the optional `h2` package needed for HTTP/2 is installed"""
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def _pool_limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=MAX_CONNECTIONS,
+        max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=KEEPALIVE_EXPIRY
+    )
+
+
+def _pool_timeout() -> httpx.Timeout:
+    return httpx.Timeout(
+        connect=CONNECT_TIMEOUT,
+        read=READ_TIMEOUT,
+        write=WRITE_TIMEOUT,
+        pool=POOL_TIMEOUT
+    )
+
+
+def resolve_api_key(api_key: Optional[str] = None) -> str:
+    """
+    Resolve the OpenAI API key, loading .env only once per process.
+
+    Args:
+        api_key: Explicit API key (if None, loads from .env / environment)
+
+    Returns:
+        The API key
+    """
+    global _env_loaded
+    if not api_key and not _env_loaded:
+        with _lock:
+            if not _env_loaded:
+                load_dotenv()
+                _env_loaded = True
+
+    api_key = api_key or os.getenv('OPENAI_API_KEY')
+    if not api_key:
+        raise ValueError("OPENAI_API_KEY not found. Please set it in .env file or pass it as parameter.")
+    return api_key
+
+
+def get_openai_client(api_key: Optional[str] = None) -> OpenAI:
+    """
+    Get the shared synchronous OpenAI client for an API key.
+
+    The client (and its connection pool) is created on first use and reused by
+    every caller in the process. httpx clients are thread-safe, so the same
+    instance can serve concurrent Streamlit sessions.
+
+    Args:
+        api_key: OpenAI API key (if None, loads from .env)
+
+    Returns:
+        OpenAI client instance
+    """
+    api_key = resolve_api_key(api_key)
+
+    client = _sync_clients.get(api_key)
+    if client is not None:
+        return client
+
+    with _lock:
+        client = _sync_clients.get(api_key)
+        if client is None:
+            http_client = DefaultHttpxClient(
+                limits=_pool_limits(),
+                timeout=_pool_timeout(),
+                http2=http2_available()
+            )
+            client = OpenAI(api_key=api_key, http_client=http_client, max_retries=MAX_RETRIES)
+            _sync_clients[api_key] = client
+    return client
+
+
+def get_async_openai_client(api_key: Optional[str] = None) -> AsyncOpenAI:
+    """
+    Get the shared asynchronous OpenAI client for an API key.
+
+    Async connection pools are bound to the event loop that created them, so
+    one client is kept per running loop and dropped when the loop goes away.
+    Must be called from inside a running event loop.
+
+    Args:
+        api_key: OpenAI API key (if None, loads from .env)
+
+    Returns:
+        AsyncOpenAI client instance
+    """
+    api_key = resolve_api_key(api_key)
+    loop = asyncio.get_running_loop()
+
+    with _lock:
+        loop_clients = _async_clients.setdefault(loop, {})
+        client = loop_clients.get(api_key)
+        if client is None:
+            http_client = DefaultAsyncHttpxClient(
+                limits=_pool_limits(),
+                timeout=_pool_timeout(),
+                http2=http2_available()
+            )
+            client = AsyncOpenAI(api_key=api_key, http_client=http_client, max_retries=MAX_RETRIES)
+            loop_clients[api_key] = client
+    return client
+
+
+def close_clients():
+    """Close all shared synchronous clients (e.g. at process shutdown)"""
+    with _lock:
+        clients = list(_sync_clients.values())
+        _sync_clients.clear()
+    for client in clients:
+        try:
+            client.close()
+        except Exception:
+            pass
@@ -0,0 +1,349 @@
+"""
+Compact Extraction Schema
+
+Most of an extraction JSON is formatting repeated verbatim: every run carries
+the same ~15-key font dictionary and every paragraph the same bullet format.
+The compact schema interns each distinct run, paragraph, fill, line and shadow
+style once into top-level style tables and references it by integer id:
+
+    {
+      "format": "compact-v1",
+      "styles": {"run": [{...}], "paragraph": [{...}], "fill": [...], "line": [...], "shadow": [...]},
+      "slides": [{"elements": [{"fill": 0, "line": 3, "shadow": 0,
+                                "paragraphs": [{"style": 2, "runs": [{"text": "Q4 results", "style": 5}]}]}]}]
+    }
+
+Runs keep their text, so anything that only reads or rewrites text (translator,
+reassembler, QA, incremental translation) works on either schema unchanged.
+Code that reads formatting resolves ids through StyleTables, and
+expand_extraction restores the full schema exactly.
+
+Usage:
+    python extractor.py deck.pptx -o deck.json --compact
+    python compact_schema.py expand deck.json deck_full.json
+    python compact_schema.py compact deck_full.json deck.json
+
+load_extraction and save_extraction also read and write the binary format
+(binary_format.py) and are what every stage uses for its input and output.
+"""
+
+import json
+from typing import Dict, Iterable, List, Optional
+
+from binary_format import is_binary_file, is_binary_path, load_binary, save_binary, select_columns
+
+
+COMPACT_FORMAT = "compact-v1"
+
+# Style tables and the element keys interned into them
+STYLE_KINDS = ["run", "paragraph", "fill", "line", "shadow"]
+ELEMENT_STYLE_KINDS = ["fill", "line", "shadow"]
+
+
+def is_compact(data: Dict) -> bool:
+    """Check whether an extraction (or translation) uses the compact schema"""
+    return data.get("format") == COMPACT_FORMAT
+
+
+class StyleInterner:
+    """Assigns one id per distinct style of each kind"""
+    
+    def __init__(self):
+        self.tables: Dict[str, List[Dict]] = {kind: [] for kind in STYLE_KINDS}
+        self._ids: Dict[str, Dict[str, int]] = {kind: {} for kind in STYLE_KINDS}
+    
+    def intern(self, kind: str, style) -> int:
+        """
+        Get the id of a style, adding it to its table if new.
+        
+        Args:
+            kind: Style table ("run", "paragraph", "fill", "line" or "shadow")
+            style: Style dictionary (or None)
+            
+        Returns:
+            Index into styles[kind]
+        """
+        key = json.dumps(style, sort_keys=True, ensure_ascii=False, default=str)
+        ids = self._ids[kind]
+        style_id = ids.get(key)
+        if style_id is None:
+            style_id = ids[key] = len(self.tables[kind])
+            self.tables[kind].append(style)
+        return style_id
+
+
+class StyleTables:
+    """
+    Read formatting from either schema.
+    
+    With a full extraction every method returns its argument's own formatting;
+    with a compact one it looks the id up in the style tables.
+    """
+    
+    def __init__(self, data: Dict):
+        self.tables = (data.get("styles") or {}) if is_compact(data) else {}
+    
+    def resolve(self, kind: str, value):
+        """Resolve a style id (plain dictionaries and None pass through)"""
+        if isinstance(value, int) and not isinstance(value, bool) and kind in self.tables:
+            return self.tables[kind][value]
+        return value
+    
+    def run_format(self, run: Optional[Dict]) -> Optional[Dict]:
+        """Formatting of a run (a full run dictionary is its own formatting)"""
+        if run and "style" in run and self.tables:
+            return self.tables["run"][run["style"]]
+        return run
+    
+    def paragraph_format(self, paragraph: Dict) -> Dict:
+        """paragraph_formatting of a paragraph"""
+        if "style" in paragraph and self.tables:
+            return self.tables["paragraph"][paragraph["style"]]
+        return paragraph.get("paragraph_formatting", {})
+    
+    def element_style(self, element: Dict, kind: str) -> Optional[Dict]:
+        """Fill, line or shadow dictionary of an element"""
+        return self.resolve(kind, element.get(kind))
+
+
+def _compact_paragraphs(paragraphs: List[Dict], interner: StyleInterner) -> List[Dict]:
+    """Replace paragraph and run formatting with style ids"""
+    compacted = []
+    for paragraph in paragraphs:
+        new_paragraph = {}
+        for key, value in paragraph.items():
+            if key == "paragraph_formatting":
+                new_paragraph["style"] = interner.intern("paragraph", value)
+            elif key == "runs":
+                new_paragraph["runs"] = [
+                    {"text": run.get("text", ""),
+                     "style": interner.intern("run", {k: v for k, v in run.items() if k != "text"})}
+                    for run in value
+                ]
+            else:
+                new_paragraph[key] = value
+        compacted.append(new_paragraph)
+    return compacted
+
+
+def _expand_paragraphs(paragraphs: List[Dict], tables: Dict[str, List[Dict]]) -> List[Dict]:
+    """Replace paragraph and run style ids with their formatting"""
+    expanded = []
+    for paragraph in paragraphs:
+        new_paragraph = {}
+        for key, value in paragraph.items():
+            if key == "style":
+                new_paragraph["paragraph_formatting"] = json.loads(json.dumps(tables["paragraph"][value]))
+            elif key == "runs":
+                new_paragraph["runs"] = [
+                    {"text": run.get("text", ""), **json.loads(json.dumps(tables["run"][run["style"]]))}
+                    for run in value
+                ]
+            else:
+                new_paragraph[key] = value
+        expanded.append(new_paragraph)
+    return expanded
+
+
+def _map_element(element: Dict, map_paragraphs, map_style) -> Dict:
+    """Copy an element, converting its paragraphs, table cells and fill/line/shadow"""
+    new_element = dict(element)
+    for kind in ELEMENT_STYLE_KINDS:
+        if kind in new_element:
+            new_element[kind] = map_style(kind, new_element[kind])
+    if "paragraphs" in new_element:
+        new_element["paragraphs"] = map_paragraphs(new_element["paragraphs"])
+    table_data = new_element.get("table_data")
+    if table_data and "cells" in table_data:
+        new_element["table_data"] = {
+            **table_data,
+            "cells": [
+                {**cell, "paragraphs": map_paragraphs(cell["paragraphs"])} if "paragraphs" in cell else cell
+                for cell in table_data["cells"]
+            ]
+        }
+    return new_element
+
+
+def compact_slide(slide: Dict, interner: StyleInterner) -> Dict:
+    """Convert one slide to the compact schema, interning its styles into the interner's tables"""
+    map_paragraphs = lambda paragraphs: _compact_paragraphs(paragraphs, interner)
+    return {**slide, "elements": [_map_element(element, map_paragraphs, interner.intern)
+                                  for element in slide.get("elements", [])]}
+
+
+def compact_extraction(data: Dict) -> Dict:
+    """
+    Convert a full extraction (or translation) to the compact schema.
+    
+    Args:
+        data: Extraction dictionary in the full schema
+        
+    Returns:
+        New dictionary with style tables; the input is not modified
+    """
+    if is_compact(data):
+        return data
+    
+    interner = StyleInterner()
+    slides = [compact_slide(slide, interner) for slide in data.get("slides", [])]
+    
+    compacted = {"format": COMPACT_FORMAT}
+    for key, value in data.items():
+        compacted[key] = slides if key == "slides" else value
+    compacted["styles"] = interner.tables
+    return compacted
+
+
+def expand_extraction(data: Dict) -> Dict:
+    """
+    Convert a compact extraction (or translation) back to the full schema.
+    
+    Args:
+        data: Extraction dictionary in either schema
+        
+    Returns:
+        Dictionary in the full schema (the input itself if it is not compact)
+    """
+    if not is_compact(data):
+        return data
+    
+    tables = data["styles"]
+    map_paragraphs = lambda paragraphs: _expand_paragraphs(paragraphs, tables)
+    map_style = lambda kind, style_id: (json.loads(json.dumps(tables[kind][style_id]))
+                                        if isinstance(style_id, int) else style_id)
+    
+    expanded = {}
+    for key, value in data.items():
+        if key in ("format", "styles"):
+            continue
+        if key == "slides":
+            value = [
+                {**slide, "elements": [_map_element(element, map_paragraphs, map_style)
+                                       for element in slide.get("elements", [])]}
+                for slide in value
+            ]
+        expanded[key] = value
+    return expanded
+
+
+def load_extraction(path: str, expand: bool = False, columns: Optional[Iterable[str]] = None) -> Dict:
+    """
+    Load an extraction or translation in either schema, from JSON or the binary format.
+    
+    Args:
+        path: JSON or binary (see binary_format.py) file path
+        expand: Convert a compact file to the full schema
+        columns: Only load these columns, e.g. ["slides.elements", "slides.speaker_notes"]
+            (None = all; top-level scalars are always loaded)
+            
+    Returns:
+        Extraction dictionary
+    """
+    if columns is not None and expand:
+        # Style ids cannot be expanded without their tables
+        columns = [*columns, "styles"]
+    if is_binary_file(path):
+        data = load_binary(path, columns)
+    else:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = select_columns(json.load(f), columns)
+    return expand_extraction(data) if expand else data
+
+
+def save_extraction(data: Dict, path: str):
+    """
+    Write an extraction: .msgpack paths in the binary format, compact JSON
+    without indentation and full JSON with indent=2.
+    """
+    if is_binary_path(path):
+        save_binary(data, path)
+        return
+    with open(path, 'w', encoding='utf-8') as f:
+        if is_compact(data):
+            json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+        else:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+
+
+def stream_extraction(data: Dict, slides: Iterable[Dict], path: str, compact: bool = False) -> int:
+    """
+    Write an extraction whose slides arrive one at a time.
+    
+    Each slide is written as soon as the iterable produces it and is not kept,
+    so memory does not grow with the number of slides. The file is identical
+    to save_extraction of the complete dictionary (compact_extraction of it
+    when compact): the style tables come last in the compact schema. Binary
+    files are columnar, so their slides are collected before writing.
+    
+    Args:
+        data: Top-level fields (its "slides" value is ignored)
+        slides: Slide dictionaries in order, e.g. PPTXExtractor.iter_slides()
+        path: Output path
+        compact: Write the compact schema
+        
+    Returns:
+        Number of slides written
+    """
+    if is_binary_path(path):
+        complete = {**data, "slides": list(slides)}
+        save_extraction(compact_extraction(complete) if compact else complete, path)
+        return len(complete["slides"])
+    
+    interner = StyleInterner()
+    if compact:
+        data = {"format": COMPACT_FORMAT, **data}
+        dumps = lambda value, level: json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+        newline = lambda level: ""
+        key_separator = ":"
+    else:
+        # Matches json.dump(indent=2): nested lines are indented by their level
+        dumps = lambda value, level: json.dumps(value, indent=2, ensure_ascii=False).replace("\n", "\n" + "  " * level)
+        newline = lambda level: "\n" + "  " * level
+        key_separator = ": "
+    
+    count = 0
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write("{")
+        for position, (key, value) in enumerate(data.items()):
+            f.write(("," if position else "") + newline(1) + json.dumps(key, ensure_ascii=False) + key_separator)
+            if key != "slides":
+                f.write(dumps(value, 1))
+                continue
+            f.write("[")
+            for slide in slides:
+                if compact:
+                    slide = compact_slide(slide, interner)
+                f.write(("," if count else "") + newline(2) + dumps(slide, 2))
+                count += 1
+            f.write((newline(1) if count else "") + "]")
+        if compact:
+            f.write("," + json.dumps("styles") + key_separator + dumps(interner.tables, 1))
+        f.write(newline(0) + "}")
+    return count
+
+
+def main():
+    """Convert extraction files between the full and compact schemas"""
+    import argparse
+    import os
+    
+    parser = argparse.ArgumentParser(description="Convert extraction JSON between the full and compact schemas")
+    parser.add_argument("command", choices=["compact", "expand"], help="Conversion to apply")
+    parser.add_argument("input", help="Extraction or translation JSON")
+    parser.add_argument("output", help="Output JSON path")
+    args = parser.parse_args()
+    
+    data = load_extraction(args.input)
+    converted = compact_extraction(data) if args.command == "compact" else expand_extraction(data)
+    save_extraction(converted, args.output)
+    
+    print(f"{args.input} ({os.path.getsize(args.input):,} bytes) -> "
+          f"{args.output} ({os.path.getsize(args.output):,} bytes)")
+    if is_compact(converted):
+        counts = ", ".join(f"{len(converted['styles'][kind])} {kind}" for kind in STYLE_KINDS)
+        print(f"Style tables: {counts}")
+
+
+if __name__ == "__main__":
+    main()
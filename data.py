@@ -21,6 +21,9 @@ import pandas as pd
 from openpyxl import load_workbook
 from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
 
+from binary_format import TEXT_COLUMNS
+from compact_schema import load_extraction
+
 
 class TranslationRecordGenerator:
     """Generate Excel translation records from extracted and translated JSON files"""
@@ -37,12 +40,10 @@ class TranslationRecordGenerator:
         self.translated_json_path = translated_json_path
         
         print(f"Loading extracted data from: {extracted_json_path}")
-        with open(extracted_json_path, 'r', encoding='utf-8') as f:
-            self.extracted_data = json.load(f)
+        self.extracted_data = load_extraction(extracted_json_path, columns=TEXT_COLUMNS)
         
         print(f"Loading translated data from: {translated_json_path}")
-        with open(translated_json_path, 'r', encoding='utf-8') as f:
-            self.translated_data = json.load(f)
+        self.translated_data = load_extraction(translated_json_path, columns=TEXT_COLUMNS)
         
         self.translation_records = []
         
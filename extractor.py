@@ -6,10 +6,148 @@ from pptx.enum.text import MSO_AUTO_SIZE
 import zipfile
 from lxml import etree
 import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from compact_schema import compact_extraction, save_extraction, stream_extraction
+
+# Extractor opened once per worker process by parallel extract_all
+_worker_extractor = None
+
+
+def _init_slide_worker(extractor_class, pptx_path, profile):
+    """Open the package in a worker process"""
+    global _worker_extractor
+    _worker_extractor = extractor_class(pptx_path, profile=profile)
+
+
+def _extract_slide_range(start, end):
+    """
+    Extract slides [start, end) (0-based) in a worker process.
+    
+    Slides are returned as their JSON form: python-pptx values do not survive
+    pickling (Length subclasses are rescaled, chart categories hold XML).
+    """
+    slides = [_worker_extractor.extract_slide_at(idx) for idx in range(start, end)]
+    return json.dumps(slides, ensure_ascii=False)
+
+
+# Clark-notation DrawingML tags dispatched on by the single-pass readers below
+A_NS = '{http://schemas.openxmlformats.org/drawingml/2006/main}'
+A_BU_CHAR = A_NS + 'buChar'
+A_BU_FONT = A_NS + 'buFont'
+A_BU_CLR = A_NS + 'buClr'
+A_BU_AUTO_NUM = A_NS + 'buAutoNum'
+A_BU_NONE = A_NS + 'buNone'
+A_HIGHLIGHT = A_NS + 'highlight'
+A_LN = A_NS + 'ln'
+A_SOLID_FILL = A_NS + 'solidFill'
+A_SRGB_CLR = A_NS + 'srgbClr'
+A_SCHEME_CLR = A_NS + 'schemeClr'
+
+# Extraction profiles: "full" records every formatting detail; "translation"
+# records only the text, structure and ids the translator and reassembler read
+# (no fills, lines, shadows, backgrounds, layouts, geometry or paragraph
+# formatting; runs keep text, font_size, bold and italic)
+EXTRACTION_PROFILES = ("full", "translation")
+
+
+def color_choice(parent):
+    """Get a color element's value: srgbClr hex, or scheme_<name> (the scheme color wins)"""
+    color = None
+    for child in parent:
+        if child.tag == A_SCHEME_CLR:
+            return f"scheme_{child.get('val')}"
+        if child.tag == A_SRGB_CLR and color is None:
+            color = child.get('val')
+    return color
+
+
+def read_bullet_properties(pPr, bullet_info):
+    """
+    Fill bullet_info from an a:pPr element in one pass over its children.
+    
+    The first child of each kind is used. Numbering overrides a bullet
+    character, and buNone overrides both.
+    """
+    found = {}
+    for child in pPr:
+        if child.tag not in found:
+            found[child.tag] = child
+    
+    bullet_char = found.get(A_BU_CHAR)
+    auto_num = found.get(A_BU_AUTO_NUM)
+    bullet_none = found.get(A_BU_NONE)
+    if A_BU_FONT in found:
+        bullet_info["bullet_font"] = found[A_BU_FONT].get('typeface')
+    if A_BU_CLR in found:
+        bullet_info["bullet_color"] = color_choice(found[A_BU_CLR])
+    
+    if bullet_char is not None:
+        bullet_info["is_bulleted"] = True
+        bullet_info["bullet_type"] = "bullet"
+        bullet_info["bullet_char"] = bullet_char.get('char', '•')
+    if auto_num is not None:
+        bullet_info["is_bulleted"] = True
+        bullet_info["bullet_type"] = "numbered"
+        bullet_info["numbering_format"] = auto_num.get('type', 'arabicPeriod')
+        start_at = auto_num.get('startAt')
+        if start_at:
+            bullet_info["start_at"] = int(start_at)
+    if bullet_none is not None:
+        bullet_info["bullet_type"] = "none"
+        bullet_info["is_bulleted"] = False
+    return bullet_info
+
+
+def read_run_properties(rPr, formatting):
+    """
+    Fill the advanced run formatting from an a:rPr element.
+    
+    Strike, kerning, spacing, caps and baseline are attributes of a:rPr;
+    highlight and outline are its a:highlight and a:ln children, found in
+    one pass over the children.
+    """
+    get = rPr.get
+    formatting["strike"] = get('strike')
+    formatting["kerning"] = get('kern')
+    formatting["spacing"] = get('spc')
+    formatting["caps"] = get('cap') or None
+    
+    # Superscript/Subscript (baseline, in thousandths of a percent)
+    baseline = get('baseline')
+    if baseline:
+        baseline_val = int(baseline)
+        if baseline_val > 0:
+            formatting["superscript"] = baseline_val
+        elif baseline_val < 0:
+            formatting["subscript"] = abs(baseline_val)
+    
+    for child in rPr:
+        tag = child.tag
+        if tag == A_HIGHLIGHT and formatting["text_highlight"] is None:
+            formatting["text_highlight"] = color_choice(child)
+        elif tag == A_LN and formatting["text_outline"] is None:
+            # Character outline (text border)
+            outline_info = {"width": child.get('w'), "color": None}
+            for fill in child:
+                if fill.tag == A_SOLID_FILL:
+                    for color in fill:
+                        if color.tag == A_SRGB_CLR:
+                            outline_info["color"] = color.get('val')
+                            break
+                    break
+            formatting["text_outline"] = outline_info
+    return formatting
+
 
 class PPTXExtractor:
-    def __init__(self, pptx_path):
+    def __init__(self, pptx_path, profile="full"):
+        if profile not in EXTRACTION_PROFILES:
+            raise ValueError(f"Unknown extraction profile: {profile} (expected one of {EXTRACTION_PROFILES})")
         self.pptx_path = pptx_path
+        self.profile = profile
+        self.text_only = profile == "translation"
         self.presentation = Presentation(pptx_path)
         self.data = {
             "presentation_name": os.path.basename(pptx_path),
@@ -17,6 +155,8 @@ class PPTXExtractor:
             "slide_masters": [],  # NEW: Store slide master information
             "slides": []
         }
+        if self.text_only:
+            self.data["extraction_profile"] = profile
         self.namespaces = {
             'a': 'http://schemas.openxmlformats.org/drawingml/2006/main',
             'p': 'http://schemas.openxmlformats.org/presentationml/2006/main',
@@ -24,6 +164,12 @@ class PPTXExtractor:
             'dgm': 'http://schemas.openxmlformats.org/drawingml/2006/diagram',
             'c': 'http://schemas.openxmlformats.org/drawingml/2006/chart'
         }
+        # Layout part name -> (master_index, layout_index), filled by
+        # extract_slide_masters (or index_layouts in slide worker processes)
+        self.layout_index = {}
+        # SmartArt graphic frames of a slide (including those inside groups)
+        self.smartart_frames = etree.XPath('.//p:graphicFrame[a:graphic/a:graphicData/dgm:relIds]',
+                                           namespaces=self.namespaces)
         
     def get_color_value(self, color_obj):
         """Extract color in multiple formats"""
@@ -97,6 +243,7 @@ class PPTXExtractor:
             
             # Extract all layouts for this master
             for layout_idx, layout in enumerate(master.slide_layouts):
+                self.layout_index[str(layout.part.partname)] = (master_idx, layout_idx)
                 layout_data = {
                     "layout_index": layout_idx,
                     "layout_name": layout.name,
@@ -128,6 +275,12 @@ class PPTXExtractor:
         
         return masters_info
     
+    def index_layouts(self):
+        """Map layout part names to (master_index, layout_index) without extracting masters"""
+        for master_idx, master in enumerate(self.presentation.slide_masters):
+            for layout_idx, layout in enumerate(master.slide_layouts):
+                self.layout_index[str(layout.part.partname)] = (master_idx, layout_idx)
+    
     def get_slide_layout_info(self, slide):
         """Get layout information for a specific slide"""
         layout_info = {
@@ -147,15 +300,12 @@ class PPTXExtractor:
                 layout_info["follows_master_background"] = slide.follow_master_background
             
             # Find which master and layout index this corresponds to
-            for master_idx, master in enumerate(self.presentation.slide_masters):
-                for layout_idx, layout in enumerate(master.slide_layouts):
-                    if layout == slide_layout:
-                        layout_info["master_index"] = master_idx
-                        layout_info["layout_index"] = layout_idx
-                        break
-                if layout_info["master_index"] is not None:
-                    break
-                    
+            if not self.layout_index:
+                self.index_layouts()
+            position = self.layout_index.get(str(slide_layout.part.partname))
+            if position is not None:
+                layout_info["master_index"], layout_info["layout_index"] = position
+        
         except Exception as e:
             pass
         
@@ -317,50 +467,9 @@ class PPTXExtractor:
         }
         
         try:
-            pPr = paragraph._element.pPr
-            if pPr is None:
-                return bullet_info
-            
-            # Check for bullet character
-            buChar = pPr.find('.//a:buChar', self.namespaces)
-            if buChar is not None:
-                bullet_info["is_bulleted"] = True
-                bullet_info["bullet_type"] = "bullet"
-                bullet_info["bullet_char"] = buChar.get('char', '•')
-            
-            # Check for bullet font
-            buFont = pPr.find('.//a:buFont', self.namespaces)
-            if buFont is not None:
-                bullet_info["bullet_font"] = buFont.get('typeface')
-            
-            # Check for bullet color
-            buClr = pPr.find('.//a:buClr', self.namespaces)
-            if buClr is not None:
-                # Try to extract color from child elements
-                srgbClr = buClr.find('.//a:srgbClr', self.namespaces)
-                if srgbClr is not None:
-                    bullet_info["bullet_color"] = srgbClr.get('val')
-                schemeClr = buClr.find('.//a:schemeClr', self.namespaces)
-                if schemeClr is not None:
-                    bullet_info["bullet_color"] = f"scheme_{schemeClr.get('val')}"
-            
-            # Check for numbering
-            buAutoNum = pPr.find('.//a:buAutoNum', self.namespaces)
-            if buAutoNum is not None:
-                bullet_info["is_bulleted"] = True
-                bullet_info["bullet_type"] = "numbered"
-                num_type = buAutoNum.get('type', 'arabicPeriod')
-                bullet_info["numbering_format"] = num_type
-                start_at = buAutoNum.get('startAt')
-                if start_at:
-                    bullet_info["start_at"] = int(start_at)
-            
-            # Check if bullets are explicitly turned off
-            buNone = pPr.find('.//a:buNone', self.namespaces)
-            if buNone is not None:
-                bullet_info["bullet_type"] = "none"
-                bullet_info["is_bulleted"] = False
-                
+            pPr = paragraph._p.pPr
+            if pPr is not None:
+                read_bullet_properties(pPr, bullet_info)
         except Exception as e:
             pass
         
@@ -390,69 +499,24 @@ class PPTXExtractor:
         
         # Additional font properties including advanced formatting
         try:
-            if hasattr(font, '_element'):
-                rPr = run._element.rPr
-                if rPr is not None:
-                    # Strike through
-                    if rPr.find('.//a:strike', self.namespaces) is not None:
-                        strike_elem = rPr.find('.//a:strike', self.namespaces)
-                        formatting["strike"] = strike_elem.get('val', 'sngStrike')
-                    
-                    # Kerning
-                    if rPr.find('.//a:kern', self.namespaces) is not None:
-                        kern_elem = rPr.find('.//a:kern', self.namespaces)
-                        formatting["kerning"] = kern_elem.get('val')
-                    
-                    # Character spacing
-                    if rPr.find('.//a:spc', self.namespaces) is not None:
-                        spc_elem = rPr.find('.//a:spc', self.namespaces)
-                        formatting["spacing"] = spc_elem.get('val')
-                    
-                    # Capitalization
-                    if rPr.get('cap'):
-                        formatting["caps"] = rPr.get('cap')
-                    
-                    # NEW: Superscript/Subscript (baseline)
-                    baseline = rPr.get('baseline')
-                    if baseline:
-                        baseline_val = int(baseline)
-                        if baseline_val > 0:
-                            formatting["superscript"] = baseline_val
-                        elif baseline_val < 0:
-                            formatting["subscript"] = abs(baseline_val)
-                    
-                    # NEW: Text Highlight Color
-                    highlight = rPr.find('.//a:highlight', self.namespaces)
-                    if highlight is not None:
-                        srgbClr = highlight.find('.//a:srgbClr', self.namespaces)
-                        if srgbClr is not None:
-                            formatting["text_highlight"] = srgbClr.get('val')
-                        schemeClr = highlight.find('.//a:schemeClr', self.namespaces)
-                        if schemeClr is not None:
-                            formatting["text_highlight"] = f"scheme_{schemeClr.get('val')}"
-                    
-                    # NEW: Character Outline (text border)
-                    ln = rPr.find('.//a:ln', self.namespaces)
-                    if ln is not None:
-                        outline_info = {
-                            "width": ln.get('w'),
-                            "color": None
-                        }
-                        
-                        # Extract outline color
-                        solidFill = ln.find('.//a:solidFill', self.namespaces)
-                        if solidFill is not None:
-                            srgbClr = solidFill.find('.//a:srgbClr', self.namespaces)
-                            if srgbClr is not None:
-                                outline_info["color"] = srgbClr.get('val')
-                        
-                        formatting["text_outline"] = outline_info
-                    
+            rPr = run._r.rPr
+            if rPr is not None:
+                read_run_properties(rPr, formatting)
         except Exception as e:
             pass
         
         return formatting
     
+    def extract_run_text(self, run):
+        """Extract a run's text and the formatting the reassembler applies to added runs"""
+        font = run.font
+        return {
+            "text": run.text,
+            "font_size": font.size.pt if font.size else None,
+            "bold": font.bold,
+            "italic": font.italic
+        }
+    
     def extract_paragraph_formatting(self, paragraph):
         """Extract paragraph-level formatting"""
         para_format = {
@@ -523,6 +587,26 @@ class PPTXExtractor:
         
         return properties
     
+    def extract_text_frame_paragraphs(self, text_frame):
+        """Extract the paragraphs of a text frame (formatting omitted by the translation profile)"""
+        paragraphs = []
+        for paragraph in text_frame.paragraphs:
+            if self.text_only:
+                paragraphs.append({"runs": [self.extract_run_text(run) for run in paragraph.runs]})
+                continue
+            
+            para_data = {
+                "paragraph_formatting": self.extract_paragraph_formatting(paragraph),
+                "runs": []
+            }
+            
+            for run in paragraph.runs:
+                run_data = self.extract_run_formatting(run)
+                para_data["runs"].append(run_data)
+            
+            paragraphs.append(para_data)
+        return paragraphs
+    
     def extract_table(self, shape):
         """Extract table structure and content"""
         table = shape.table
@@ -538,22 +622,10 @@ class PPTXExtractor:
                     "row": row_idx,
                     "column": col_idx,
                     "text": cell.text,
-                    "paragraphs": []
+                    # Paragraph and run formatting of the cell
+                    "paragraphs": self.extract_text_frame_paragraphs(cell.text_frame)
                 }
                 
-                # Extract paragraph and run formatting from cells
-                for paragraph in cell.text_frame.paragraphs:
-                    para_data = {
-                        "paragraph_formatting": self.extract_paragraph_formatting(paragraph),
-                        "runs": []
-                    }
-                    
-                    for run in paragraph.runs:
-                        run_data = self.extract_run_formatting(run)
-                        para_data["runs"].append(run_data)
-                    
-                    cell_data["paragraphs"].append(para_data)
-                
                 table_data["cells"].append(cell_data)
         
         return table_data
@@ -693,30 +765,19 @@ class PPTXExtractor:
             "shape_id": shape.shape_id,
             "shape_name": shape.name,
             "element_type": None,
-            "placeholder_info": self.extract_placeholder_info(shape),  # Placeholder info
-            "fill": self.extract_shape_fill(shape),  # NEW: Fill details
-            "line": self.extract_shape_line(shape),  # NEW: Border details
-            "shadow": self.extract_shape_shadow(shape)  # NEW: Shadow details
+            "placeholder_info": self.extract_placeholder_info(shape)  # Placeholder info
         }
+        if not self.text_only:
+            element["fill"] = self.extract_shape_fill(shape)  # NEW: Fill details
+            element["line"] = self.extract_shape_line(shape)  # NEW: Border details
+            element["shadow"] = self.extract_shape_shadow(shape)  # NEW: Shadow details
         
         # Determine element type
         if shape.shape_type == MSO_SHAPE_TYPE.TEXT_BOX or (shape.has_text_frame and not shape.has_table):
             element["element_type"] = "TextBox"
-            element["text_frame_properties"] = self.extract_text_frame_properties(shape.text_frame)
-            element["paragraphs"] = []
-            
-            for paragraph in shape.text_frame.paragraphs:
-                para_data = {
-                    "paragraph_formatting": self.extract_paragraph_formatting(paragraph),
-                    "runs": []
-                }
-                
-                for run in paragraph.runs:
-                    run_data = self.extract_run_formatting(run)
-                    para_data["runs"].append(run_data)
-                
-                element["paragraphs"].append(para_data)
-            
+            if not self.text_only:
+                element["text_frame_properties"] = self.extract_text_frame_properties(shape.text_frame)
+            element["paragraphs"] = self.extract_text_frame_paragraphs(shape.text_frame)
             element["full_text"] = shape.text_frame.text
             
         elif shape.has_table:
@@ -729,29 +790,18 @@ class PPTXExtractor:
         
         elif shape.shape_type == MSO_SHAPE_TYPE.PICTURE:
             element["element_type"] = "Picture"
-            element["image_info"] = {
-                "description": shape.name,
-                "alt_text": getattr(shape, 'alt_text', None) if hasattr(shape, 'alt_text') else None
-            }
+            if not self.text_only:
+                element["image_info"] = {
+                    "description": shape.name,
+                    "alt_text": getattr(shape, 'alt_text', None) if hasattr(shape, 'alt_text') else None
+                }
         
         elif shape.shape_type == MSO_SHAPE_TYPE.AUTO_SHAPE:
             element["element_type"] = "AutoShape"
             if shape.has_text_frame:
-                element["text_frame_properties"] = self.extract_text_frame_properties(shape.text_frame)
-                element["paragraphs"] = []
-                
-                for paragraph in shape.text_frame.paragraphs:
-                    para_data = {
-                        "paragraph_formatting": self.extract_paragraph_formatting(paragraph),
-                        "runs": []
-                    }
-                    
-                    for run in paragraph.runs:
-                        run_data = self.extract_run_formatting(run)
-                        para_data["runs"].append(run_data)
-                    
-                    element["paragraphs"].append(para_data)
-                
+                if not self.text_only:
+                    element["text_frame_properties"] = self.extract_text_frame_properties(shape.text_frame)
+                element["paragraphs"] = self.extract_text_frame_paragraphs(shape.text_frame)
                 element["full_text"] = shape.text_frame.text
         
         else:
@@ -759,21 +809,9 @@ class PPTXExtractor:
             # Extract text from any shape that has a text frame, even if it's an "Other" type
             if hasattr(shape, 'has_text_frame') and shape.has_text_frame:
                 try:
-                    element["text_frame_properties"] = self.extract_text_frame_properties(shape.text_frame)
-                    element["paragraphs"] = []
-                    
-                    for paragraph in shape.text_frame.paragraphs:
-                        para_data = {
-                            "paragraph_formatting": self.extract_paragraph_formatting(paragraph),
-                            "runs": []
-                        }
-                        
-                        for run in paragraph.runs:
-                            run_data = self.extract_run_formatting(run)
-                            para_data["runs"].append(run_data)
-                        
-                        element["paragraphs"].append(para_data)
-                    
+                    if not self.text_only:
+                        element["text_frame_properties"] = self.extract_text_frame_properties(shape.text_frame)
+                    element["paragraphs"] = self.extract_text_frame_paragraphs(shape.text_frame)
                     element["full_text"] = shape.text_frame.text
                 except Exception as e:
                     # If text extraction fails, at least try to get basic text
@@ -783,6 +821,9 @@ class PPTXExtractor:
                     except:
                         pass
         
+        if self.text_only:
+            return element
+        
         # Dimensions (common for all shapes)
         element["dimensions"] = {
             "left": shape.left,
@@ -808,148 +849,160 @@ class PPTXExtractor:
         
         return grouped_elements
     
-    def extract_smartart_xml(self):
-        """Extract SmartArt diagrams with hierarchical structure using XML parsing"""
-        smartart_data = []
+    def extract_smartart_diagram(self, root):
+        """Extract text and hierarchical node structure from a parsed SmartArt data part"""
+        smartart_element = {
+            "element_type": "SmartArt",
+            "layout_type": None,  # NEW: SmartArt layout type
+            "texts": [],
+            "nodes": [],          # NEW: Hierarchical node structure
+            "full_text": ""
+        }
         
+        # NEW: Extract layout type from XML
         try:
-            with zipfile.ZipFile(self.pptx_path, 'r') as zip_ref:
-                # Find all diagram data files
-                diagram_files = [f for f in zip_ref.namelist() if 'diagrams/data' in f and f.endswith('.xml')]
+            # Look for layout category in the diagram
+            layout_node = root.find('.//dgm:cat', self.namespaces)
+            if layout_node is not None:
+                smartart_element["layout_type"] = layout_node.get('type')
+            
+            # Alternative: Check prSet for layout info
+            if not smartart_element["layout_type"]:
+                for elem in root.iter():
+                    if 'layoutNode' in elem.tag or 'cat' in elem.tag:
+                        cat_type = elem.get('type')
+                        if cat_type:
+                            smartart_element["layout_type"] = cat_type
+                            break
+        except:
+            pass
+        
+        # NEW: Extract hierarchical node structure
+        try:
+            # Find all points (nodes) in the diagram
+            ptLst = root.find('.//dgm:ptLst', self.namespaces)
+            if ptLst is not None:
+                points = ptLst.findall('.//dgm:pt', self.namespaces)
                 
-                for diagram_file in diagram_files:
-                    try:
-                        xml_content = zip_ref.read(diagram_file)
-                        root = etree.fromstring(xml_content)
-                        
-                        smartart_element = {
-                            "element_type": "SmartArt",
-                            "layout_type": None,  # NEW: SmartArt layout type
-                            "texts": [],
-                            "nodes": [],          # NEW: Hierarchical node structure
-                            "full_text": ""
-                        }
-                        
-                        # NEW: Extract layout type from XML
-                        try:
-                            # Look for layout category in the diagram
-                            layout_node = root.find('.//dgm:cat', self.namespaces)
-                            if layout_node is not None:
-                                smartart_element["layout_type"] = layout_node.get('type')
-                            
-                            # Alternative: Check prSet for layout info
-                            if not smartart_element["layout_type"]:
-                                for elem in root.iter():
-                                    if 'layoutNode' in elem.tag or 'cat' in elem.tag:
-                                        cat_type = elem.get('type')
-                                        if cat_type:
-                                            smartart_element["layout_type"] = cat_type
-                                            break
-                        except:
-                            pass
-                        
-                        # NEW: Extract hierarchical node structure
-                        try:
-                            # Find all points (nodes) in the diagram
-                            ptLst = root.find('.//dgm:ptLst', self.namespaces)
-                            if ptLst is not None:
-                                points = ptLst.findall('.//dgm:pt', self.namespaces)
-                                
-                                for pt in points:
-                                    node_data = {
-                                        "node_id": pt.get('modelId'),
-                                        "level": None,       # NEW: Hierarchy level
-                                        "parent_id": None,   # NEW: Parent node reference
-                                        "text": ""
-                                    }
-                                    
-                                    # NEW: Try to determine hierarchy level
-                                    prSet = pt.find('.//dgm:prSet', self.namespaces)
-                                    if prSet is not None:
-                                        # Check for hierarchy level (presLayoutVars or other indicators)
-                                        presLayoutVars = prSet.find('.//dgm:presLayoutVars', self.namespaces)
-                                        if presLayoutVars is not None:
-                                            # Some SmartArt diagrams have depth/level indicators
-                                            for child in presLayoutVars:
-                                                if 'depth' in child.tag.lower() or 'level' in child.tag.lower():
-                                                    try:
-                                                        node_data["level"] = int(child.get('val', 0))
-                                                    except:
-                                                        pass
-                                    
-                                    # Extract text for this node
-                                    t_elem = pt.find('.//dgm:t', self.namespaces)
-                                    if t_elem is None:
-                                        t_elem = pt.find('.//a:t', self.namespaces)
-                                    
-                                    if t_elem is not None and t_elem.text:
-                                        node_data["text"] = t_elem.text.strip()
-                                        smartart_element["texts"].append(node_data["text"])
-                                    
-                                    smartart_element["nodes"].append(node_data)
-                            
-                            # NEW: Extract parent-child relationships from cxnLst (connections list)
-                            cxnLst = root.find('.//dgm:cxnLst', self.namespaces)
-                            if cxnLst is not None:
-                                connections = cxnLst.findall('.//dgm:cxn', self.namespaces)
-                                
-                                for cxn in connections:
-                                    cxn_type = cxn.get('type', '')
-                                    if cxn_type in ['parOf', 'presOf']:  # Parent-child relationship
-                                        src_id = cxn.get('srcId')
-                                        dest_id = cxn.get('destId')
-                                        
-                                        # Update node with parent information
-                                        for node in smartart_element["nodes"]:
-                                            if node["node_id"] == src_id:
-                                                node["parent_id"] = dest_id
-                                                break
-                            
-                            # NEW: If levels weren't found in prSet, infer from parent-child relationships
-                            if smartart_element["nodes"]:
-                                # Find root nodes (nodes without parents)
-                                root_nodes = [n for n in smartart_element["nodes"] if n["parent_id"] is None]
-                                
-                                # Assign levels based on depth from root
-                                def assign_level(node_id, level, nodes):
-                                    for node in nodes:
-                                        if node["node_id"] == node_id and node["level"] is None:
-                                            node["level"] = level
-                                            # Find children
-                                            children = [n for n in nodes if n["parent_id"] == node_id]
-                                            for child in children:
-                                                assign_level(child["node_id"], level + 1, nodes)
-                                
-                                for root_node in root_nodes:
-                                    assign_level(root_node["node_id"], 0, smartart_element["nodes"])
-                        
-                        except Exception as e:
-                            # Fallback to simple text extraction if hierarchical extraction fails
-                            pass
-                        
-                        # Fallback: Extract all text if nodes didn't capture everything
-                        if not smartart_element["texts"]:
-                            for xpath in ['.//dgm:t', './/a:t', './/dgm:text', './/*[local-name()="t"]']:
-                                try:
-                                    text_elems = root.xpath(xpath, namespaces=self.namespaces)
-                                    for elem in text_elems:
-                                        if elem.text and elem.text.strip():
-                                            smartart_element["texts"].append(elem.text.strip())
-                                except:
-                                    pass
-                        
-                        smartart_element["full_text"] = " ".join(smartart_element["texts"])
-                        
-                        if smartart_element["texts"] or smartart_element["nodes"]:
-                            smartart_data.append(smartart_element)
-                            
-                    except Exception as e:
-                        print(f"Error parsing SmartArt file {diagram_file}: {e}")
+                for pt in points:
+                    node_data = {
+                        "node_id": pt.get('modelId'),
+                        "level": None,       # NEW: Hierarchy level
+                        "parent_id": None,   # NEW: Parent node reference
+                        "text": ""
+                    }
+                    
+                    # NEW: Try to determine hierarchy level
+                    prSet = pt.find('.//dgm:prSet', self.namespaces)
+                    if prSet is not None:
+                        # Check for hierarchy level (presLayoutVars or other indicators)
+                        presLayoutVars = prSet.find('.//dgm:presLayoutVars', self.namespaces)
+                        if presLayoutVars is not None:
+                            # Some SmartArt diagrams have depth/level indicators
+                            for child in presLayoutVars:
+                                if 'depth' in child.tag.lower() or 'level' in child.tag.lower():
+                                    try:
+                                        node_data["level"] = int(child.get('val', 0))
+                                    except:
+                                        pass
+                    
+                    # Extract text for this node
+                    t_elem = pt.find('.//dgm:t', self.namespaces)
+                    if t_elem is None:
+                        t_elem = pt.find('.//a:t', self.namespaces)
+                    
+                    if t_elem is not None and t_elem.text:
+                        node_data["text"] = t_elem.text.strip()
+                        smartart_element["texts"].append(node_data["text"])
+                    
+                    smartart_element["nodes"].append(node_data)
+            
+            # Index nodes by modelId (the first node wins for duplicate ids)
+            nodes = smartart_element["nodes"]
+            nodes_by_id = {}
+            for node in nodes:
+                nodes_by_id.setdefault(node["node_id"], node)
+            
+            # NEW: Extract parent-child relationships from cxnLst (connections list)
+            cxnLst = root.find('.//dgm:cxnLst', self.namespaces)
+            if cxnLst is not None:
+                for cxn in cxnLst.iterfind('.//dgm:cxn', self.namespaces):
+                    cxn_type = cxn.get('type', '')
+                    if cxn_type in ['parOf', 'presOf']:  # Parent-child relationship
+                        # Update node with parent information
+                        node = nodes_by_id.get(cxn.get('srcId'))
+                        if node is not None:
+                            node["parent_id"] = cxn.get('destId')
+            
+            # NEW: If levels weren't found in prSet, infer from parent-child relationships
+            if nodes:
+                children = {}
+                for node in nodes:
+                    if node["parent_id"] is not None:
+                        children.setdefault(node["parent_id"], []).append(node)
+                
+                # Assign levels breadth-first from the root nodes (nodes without
+                # parents); a node that already has a level is not descended into
+                queue = deque((node, 0) for node in nodes if node["parent_id"] is None)
+                while queue:
+                    node, level = queue.popleft()
+                    if node["level"] is not None:
                         continue
-                        
+                    node["level"] = level
+                    for child in children.get(node["node_id"], ()):
+                        queue.append((child, level + 1))
+        
         except Exception as e:
-            print(f"SmartArt extraction error: {e}")
+            # Fallback to simple text extraction if hierarchical extraction fails
+            pass
+        
+        # Fallback: Extract all text if nodes didn't capture everything
+        if not smartart_element["texts"]:
+            for xpath in ['.//dgm:t', './/a:t', './/dgm:text', './/*[local-name()="t"]']:
+                try:
+                    text_elems = root.xpath(xpath, namespaces=self.namespaces)
+                    for elem in text_elems:
+                        if elem.text and elem.text.strip():
+                            smartart_element["texts"].append(elem.text.strip())
+                except:
+                    pass
+        
+        smartart_element["full_text"] = " ".join(smartart_element["texts"])
         
+        if smartart_element["texts"] or smartart_element["nodes"]:
+            return smartart_element
+        return None
+    
+    def extract_smartart_frame(self, graphic_frame, read_part):
+        """
+        Extract the SmartArt diagram shown by a graphic frame.
+        
+        Args:
+            graphic_frame: p:graphicFrame element holding dgm:relIds
+            read_part: Callable(rId) -> bytes of the slide's related part
+        """
+        relIds = graphic_frame.find('a:graphic/a:graphicData/dgm:relIds', self.namespaces)
+        data_rId = relIds.get(f"{{{self.namespaces['r']}}}dm")
+        cNvPr = graphic_frame.find('p:nvGraphicFramePr/p:cNvPr', self.namespaces)
+        shape_id = int(cNvPr.get('id')) if cNvPr is not None else None
+        
+        try:
+            smartart_element = self.extract_smartart_diagram(etree.fromstring(read_part(data_rId)))
+        except Exception as e:
+            print(f"Error parsing SmartArt shape {shape_id}: {e}")
+            return None
+        if smartart_element:
+            smartart_element["shape_id"] = shape_id
+        return smartart_element
+    
+    def extract_slide_smartart(self, slide):
+        """Extract SmartArt diagrams placed on a slide, following the slide's relationships"""
+        smartart_data = []
+        read_part = lambda rId: slide.part.related_part(rId).blob
+        for graphic_frame in self.smartart_frames(slide._element):
+            smartart_element = self.extract_smartart_frame(graphic_frame, read_part)
+            if smartart_element:
+                smartart_data.append(smartart_element)
         return smartart_data
     
     def extract_links(self, shape):
@@ -969,6 +1022,9 @@ class PPTXExtractor:
     
     def extract_slide(self, slide, slide_num):
         """Extract all content from a single slide"""
+        if self.text_only:
+            return self.extract_slide_text(slide, slide_num)
+        
         slide_data = {
             "slide_number": slide_num,
             "layout_info": self.get_slide_layout_info(slide),  # NEW: Layout information
@@ -1004,48 +1060,180 @@ class PPTXExtractor:
                     "element_type": "SpeakerNotes"
                 }
         
+        # Extract SmartArt diagrams shown on this slide
+        slide_data["smartart"] = self.extract_slide_smartart(slide)
+        
         return slide_data
     
-    def extract_all(self):
-        """Extract all content from presentation"""
-        # NEW: Extract slide masters and layouts first
-        print("Extracting slide masters and layouts...")
-        self.data["slide_masters"] = self.extract_slide_masters()
+    def extract_slide_text(self, slide, slide_num):
+        """Extract a slide for the translation profile: elements, speaker notes and SmartArt only"""
+        elements = []
+        for shape in slide.shapes:
+            if shape.shape_type == MSO_SHAPE_TYPE.GROUP:
+                elements.extend(self.extract_grouped_shapes(shape, slide_num))
+            else:
+                elements.append(self.extract_shape(shape, slide_num))
         
-        # Extract slides
-        print("Extracting slides...")
-        for idx, slide in enumerate(self.presentation.slides, start=1):
-            slide_data = self.extract_slide(slide, idx)
-            self.data["slides"].append(slide_data)
+        speaker_notes = None
+        if slide.has_notes_slide:
+            notes_frame = slide.notes_slide.notes_text_frame
+            if notes_frame.text.strip():
+                speaker_notes = {"text": notes_frame.text, "element_type": "SpeakerNotes"}
+        
+        return {
+            "slide_number": slide_num,
+            "elements": elements,
+            "speaker_notes": speaker_notes,
+            "smartart": self.extract_slide_smartart(slide)
+        }
+    
+    def extract_slide_at(self, slide_index):
+        """Extract the slide at a 0-based index"""
+        return self.extract_slide(self.presentation.slides[slide_index], slide_index + 1)
+    
+    def iter_slides(self, workers=1, progress_callback=None):
+        """
+        Extract slides one at a time, in slide order.
+        
+        Slide masters and layouts (full profile) are extracted before this
+        returns, so self.data is complete apart from its slides. Slides are
+        not added to self.data: each one can be written (see save_to_json)
+        or translated as soon as it is yielded, and memory does not grow
+        with the number of slides.
+        
+        With several workers, each opens the package once and extracts
+        contiguous ranges of slides; finished ranges are yielded in order.
+        
+        Args:
+            workers: Number of worker processes (1 = extract in this process)
+            progress_callback: Optional callable(slides_done, slides_total)
+            
+        Returns:
+            Generator of slide dictionaries
+        """
+        if not self.text_only and not self.data["slide_masters"]:
+            self.data["slide_masters"] = self.extract_slide_masters()
+        return self._generate_slides(workers, progress_callback)
+    
+    def _generate_slides(self, workers, progress_callback):
+        """Yield extracted slides in order (see iter_slides)"""
+        total = self.data["total_slides"]
+        workers = min(workers or 1, total)
         
-        # Extract SmartArt globally
-        print("Extracting SmartArt...")
-        smartart_elements = self.extract_smartart_xml()
+        if workers <= 1:
+            for idx in range(total):
+                slide_data = self.extract_slide_at(idx)
+                if progress_callback:
+                    progress_callback(idx + 1, total)
+                yield slide_data
+            return
         
-        # Distribute SmartArt to slides (simplified - assign to first slide for now)
-        if smartart_elements and self.data["slides"]:
-            for smartart in smartart_elements:
-                self.data["slides"][0]["smartart"].append(smartart)
+        # A few ranges per worker, so a range of heavy slides does not leave
+        # the other workers idle at the end
+        chunk_size = max(1, -(-total // (workers * 4)))
+        ranges = [(start, min(start + chunk_size, total)) for start in range(0, total, chunk_size)]
+        finished = {}
+        next_range = 0
+        done = 0
+        
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_slide_worker,
+                                 initargs=(type(self), self.pptx_path, self.profile)) as pool:
+            futures = {pool.submit(_extract_slide_range, start, end): idx
+                       for idx, (start, end) in enumerate(ranges)}
+            for future in as_completed(futures):
+                idx = futures[future]
+                finished[idx] = json.loads(future.result())
+                done += len(finished[idx])
+                if progress_callback:
+                    progress_callback(done, total)
+                # Ranges finished ahead of an earlier one wait for it
+                while next_range in finished:
+                    yield from finished.pop(next_range)
+                    next_range += 1
+    
+    def extract_slides(self, workers=1, progress_callback=None):
+        """
+        Extract every slide, optionally across worker processes.
+        
+        Args:
+            workers: Number of worker processes (1 = extract in this process)
+            progress_callback: Optional callable(slides_done, slides_total)
+            
+        Returns:
+            List of slide dictionaries in slide order
+        """
+        return list(self.iter_slides(workers, progress_callback))
+    
+    def extract_all(self, workers=1, progress_callback=None):
+        """
+        Extract all content from presentation
+        
+        Args:
+            workers: Number of worker processes for slide extraction (1 = serial)
+            progress_callback: Optional callable(slides_done, slides_total)
+        """
+        # NEW: Extract slide masters and layouts first (not read downstream of
+        # a translation-profile extraction)
+        if not self.text_only:
+            print("Extracting slide masters and layouts...")
+            self.data["slide_masters"] = self.extract_slide_masters()
+        
+        # Extract slides
+        print("Extracting slides..." if workers <= 1 else f"Extracting slides with {workers} workers...")
+        self.data["slides"] = self.extract_slides(workers, progress_callback)
         
         return self.data
     
-    def save_to_json(self, output_path):
-        """Save extracted data to JSON file"""
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(self.data, f, indent=2, ensure_ascii=False)
+    def save_to_json(self, output_path, compact=False, slides=None):
+        """
+        Save extracted data to JSON file
+        
+        Args:
+            output_path: Output path (.msgpack writes the binary format, see binary_format.py)
+            compact: Write the compact schema (styles interned into tables, see compact_schema.py)
+            slides: Slides to write instead of self.data["slides"], e.g. iter_slides();
+                each is written as it is produced and not kept
+        """
+        if slides is None:
+            save_extraction(compact_extraction(self.data) if compact else self.data, output_path)
+        else:
+            count = stream_extraction(self.data, slides, output_path, compact=compact)
+            print(f"Streamed {count} slides")
         print(f"Extraction complete! Saved to {output_path}")
 
 
 # Usage example
 if __name__ == "__main__":
-    # Replace with your PPTX file path
-    pptx_file = "BI SAM_Negotiations.pptx"
-    output_file = "extracted_content_with_layouts.json"
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Extract PowerPoint content to JSON")
+    # Replace the defaults with your PPTX file path
+    parser.add_argument("pptx_file", nargs="?", default="BI SAM_Negotiations.pptx", help="Input .pptx file")
+    parser.add_argument("-o", "--output", default="extracted_content_with_layouts.json",
+                        help="Output path (.msgpack writes the binary format)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Worker processes for slide extraction (default: 1; 0 = one per CPU)")
+    parser.add_argument("--compact", action="store_true",
+                        help="Write the compact schema (run, paragraph, fill, line and shadow styles interned)")
+    parser.add_argument("--profile", choices=EXTRACTION_PROFILES, default="full",
+                        help="full: every formatting detail (default); translation: only what translation and reassembly read")
+    parser.add_argument("--stream", action="store_true",
+                        help="Write each slide as soon as it is extracted instead of holding the whole deck in memory")
+    args = parser.parse_args()
+    
+    workers = args.workers or os.cpu_count()
+    progress = lambda done, total: print(f"  {done}/{total} slides")
     
-    extractor = PPTXExtractor(pptx_file)
-    extracted_data = extractor.extract_all()
-    extractor.save_to_json(output_file)
+    extractor = PPTXExtractor(args.pptx_file, profile=args.profile)
+    if args.stream:
+        extractor.save_to_json(args.output, compact=args.compact,
+                               slides=extractor.iter_slides(workers=workers, progress_callback=progress))
+    else:
+        extractor.extract_all(workers=workers, progress_callback=progress)
+        extractor.save_to_json(args.output, compact=args.compact)
+    extracted_data = extractor.data
     
     print(f"\nTotal slides processed: {extracted_data['total_slides']}")
     print(f"Total slide masters: {len(extracted_data['slide_masters'])}")
-    print(f"Total elements extracted: {sum(len(s['elements']) for s in extracted_data['slides'])}")
\ No newline at end of file
+    if not args.stream:
+        print(f"Total elements extracted: {sum(len(s['elements']) for s in extracted_data['slides'])}")
\ No newline at end of file
@@ -0,0 +1,305 @@
+"""
+Terminology Glossary
+
+Loads a glossary of fixed translations (drug, product and target names) and
+finds the terms used in each segment with an Aho-Corasick automaton, so every
+segment is scanned in one linear pass no matter how many terms the glossary
+has. PPTTranslator injects only the entries found in a batch into that batch's
+prompt and counts translations that do not use the required term.
+
+Glossary file: UTF-8 TSV, one entry per line
+    PDE4B                       (one column: keep the term untranslated)
+    adverse event<TAB>événement indésirable
+Lines starting with '#' are comments. Matching is case-insensitive and only
+on whole words (a term must not be glued to letters or digits).
+
+The compiled automaton is cached in memory and as JSON in the app's own cache
+directory (~/.cache/ppt-translator/glossaries, one file per content hash), so
+large glossaries are only compiled once. The cache holds plain data only:
+nothing is written next to the glossary and loading it cannot run code.
+
+Usage:
+    python glossary.py terms.tsv "Inhibiting PDE4B reduces adverse events"
+"""
+
+import hashlib
+import json
+import os
+import threading
+from collections import deque
+from typing import Dict, List, Set
+
+
+# Bump when the cached automaton layout changes
+AUTOMATON_VERSION = 2
+GLOSSARY_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "ppt-translator", "glossaries")
+
+_cache = {}
+_cache_lock = threading.Lock()
+
+
+class AhoCorasick:
+    """
+    Aho-Corasick automaton over a list of lowercase terms.
+    
+    States are list indexes: `goto[state]` maps a character to the next state,
+    `fail[state]` is the longest proper suffix state, and `output[state]` holds
+    the indexes of terms ending at that state (including via fail links).
+    """
+    
+    def __init__(self, terms: List[str]):
+        self.lengths = [len(term) for term in terms]
+        self.goto = [{}]
+        self.output = [()]
+        
+        for term_idx, term in enumerate(terms):
+            state = 0
+            for char in term:
+                next_state = self.goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self.goto)
+                    self.goto[state][char] = next_state
+                    self.goto.append({})
+                    self.output.append(())
+                state = next_state
+            self.output[state] += (term_idx,)
+        
+        # Breadth-first pass to set fail links and merge outputs
+        self.fail = [0] * len(self.goto)
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self.goto[state].items():
+                queue.append(next_state)
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                target = self.goto[fallback].get(char, 0)
+                self.fail[next_state] = target if target != next_state else 0
+                if self.output[self.fail[next_state]]:
+                    self.output[next_state] += self.output[self.fail[next_state]]
+    
+    def find(self, text: str):
+        """
+        Scan a text once and yield every term occurrence.
+        
+        Args:
+            text: Text to scan (already lowercased)
+            
+        Yields:
+            Tuples of (term index, start offset, end offset)
+        """
+        goto = self.goto
+        fail = self.fail
+        output = self.output
+        state = 0
+        for end, char in enumerate(text, 1):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for term_idx in output[state]:
+                yield term_idx, end - self.lengths[term_idx], end
+    
+    def to_dict(self) -> Dict:
+        """Get the automaton's tables as JSON-serializable data"""
+        return {"lengths": self.lengths, "goto": self.goto, "fail": self.fail, "output": self.output}
+    
+    @classmethod
+    def from_dict(cls, tables: Dict) -> "AhoCorasick":
+        """
+        Rebuild an automaton from to_dict() data without recompiling it.
+        
+        The tables are used as decoded (JSON objects map characters to states
+        already), which is what makes the cache faster than compiling.
+        """
+        automaton = cls.__new__(cls)
+        automaton.lengths = tables["lengths"]
+        automaton.goto = tables["goto"]
+        automaton.fail = tables["fail"]
+        automaton.output = tables["output"]
+        if not len(automaton.goto) == len(automaton.fail) == len(automaton.output):
+            raise ValueError("automaton tables have different lengths")
+        return automaton
+
+
+def is_word_char(char: str) -> bool:
+    """Return True if a character continues a word (so a term cannot end there)"""
+    return char.isalnum() or char == "_"
+
+
+def load_entries(path: str) -> Dict[str, str]:
+    """
+    Read glossary entries from a TSV file.
+    
+    Args:
+        path: Glossary file path
+        
+    Returns:
+        Dictionary of term -> required translation (the term itself for
+        do-not-translate entries); later lines override earlier ones
+    """
+    entries = {}
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.rstrip("\r\n")
+            if not line.strip() or line.startswith("#"):
+                continue
+            fields = line.split("\t")
+            term = fields[0].strip()
+            if not term:
+                continue
+            target = fields[1].strip() if len(fields) > 1 else ""
+            entries[term] = target or term
+    return entries
+
+
+class Glossary:
+    """Glossary entries plus the compiled automaton used to find them"""
+    
+    def __init__(self, entries: Dict[str, str], automaton: AhoCorasick = None, digest: str = None):
+        """
+        Args:
+            entries: Dictionary of term -> required translation
+            automaton: Precompiled automaton over the lowercased terms (built if None)
+            digest: Content hash identifying the glossary (computed if None)
+        """
+        self.terms = list(entries)
+        self.targets = [entries[term] for term in self.terms]
+        self.digest = digest or hashlib.sha1(
+            "\n".join(f"{term}\t{target}" for term, target in entries.items()).encode("utf-8")
+        ).hexdigest()
+        self.automaton = automaton or AhoCorasick([term.lower() for term in self.terms])
+    
+    def __len__(self):
+        return len(self.terms)
+    
+    def find_terms(self, text: str) -> Set[int]:
+        """
+        Find the glossary terms used in a text, as whole words.
+        
+        Args:
+            text: Segment text
+            
+        Returns:
+            Set of term indexes
+        """
+        lowered = text.lower()
+        found = set()
+        for term_idx, start, end in self.automaton.find(lowered):
+            if start > 0 and is_word_char(lowered[start - 1]) and is_word_char(lowered[start]):
+                continue
+            if end < len(lowered) and is_word_char(lowered[end]) and is_word_char(lowered[end - 1]):
+                continue
+            found.add(term_idx)
+        return found
+    
+    def entries_for(self, texts: List[str]) -> List[tuple]:
+        """
+        Get the glossary entries relevant to a batch.
+        
+        Args:
+            texts: Segment texts in the batch
+            
+        Returns:
+            List of (term, translation) tuples in glossary order
+        """
+        found = set()
+        for text in texts:
+            if isinstance(text, str):
+                found |= self.find_terms(text)
+        return [(self.terms[idx], self.targets[idx]) for idx in sorted(found)]
+    
+    def violations(self, source: str, translation: str) -> List[tuple]:
+        """
+        Get the entries used in a source text whose required translation is
+        missing from its translation.
+        
+        Args:
+            source: Source segment
+            translation: Translated segment
+            
+        Returns:
+            List of (term, translation) tuples that were not respected
+        """
+        lowered = translation.lower()
+        return [(term, target) for term, target in self.entries_for([source])
+                if target.lower() not in lowered]
+
+
+def load_glossary(path: str, use_cache: bool = True, cache_dir: str = GLOSSARY_CACHE_DIR) -> Glossary:
+    """
+    Load a glossary, reusing a compiled automaton when the file is unchanged.
+    
+    The automaton is looked up in memory first, then in the JSON cache file
+    named after the glossary's content hash; it is only compiled when neither
+    exists.
+    
+    Args:
+        path: Glossary TSV path
+        use_cache: Read and write the on-disk automaton cache
+        cache_dir: Directory of the on-disk cache
+        
+    Returns:
+        Glossary
+    """
+    with open(path, "rb") as f:
+        digest = hashlib.sha1(f.read()).hexdigest()
+    
+    with _cache_lock:
+        glossary = _cache.get(digest)
+    if glossary is not None:
+        return glossary
+    
+    cache_path = os.path.join(cache_dir, f"{digest}.json")
+    glossary = None
+    if use_cache and os.path.exists(cache_path):
+        try:
+            with open(cache_path, "r", encoding="utf-8") as f:
+                cached = json.load(f)
+            if cached.get("version") == AUTOMATON_VERSION and cached.get("digest") == digest:
+                entries = {str(term): str(target) for term, target in cached["entries"]}
+                glossary = Glossary(entries, AhoCorasick.from_dict(cached["automaton"]), digest)
+        except Exception as e:
+            print(f"Ignoring unreadable glossary cache {cache_path}: {e}")
+    
+    if glossary is None:
+        entries = load_entries(path)
+        glossary = Glossary(entries, digest=digest)
+        if use_cache:
+            try:
+                os.makedirs(cache_dir, exist_ok=True)
+                # Write then rename, so concurrent loads never read a partial file
+                tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump({
+                        "version": AUTOMATON_VERSION,
+                        "digest": digest,
+                        "entries": list(entries.items()),
+                        "automaton": glossary.automaton.to_dict()
+                    }, f, ensure_ascii=False, separators=(",", ":"))
+                os.replace(tmp_path, cache_path)
+            except OSError as e:
+                print(f"Could not write glossary cache {cache_path}: {e}")
+    
+    with _cache_lock:
+        _cache[digest] = glossary
+    return glossary
+
+
+def main():
+    """Show the glossary entries found in a text"""
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Find glossary terms in a text")
+    parser.add_argument("glossary", help="Glossary TSV file (term<TAB>translation)")
+    parser.add_argument("text", help="Text to scan")
+    args = parser.parse_args()
+    
+    glossary = load_glossary(args.glossary)
+    print(f"Glossary: {len(glossary)} terms")
+    for term, target in glossary.entries_for([args.text]):
+        print(f"  {term} -> {target}")
+
+
+if __name__ == "__main__":
+    main()
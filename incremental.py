@@ -0,0 +1,228 @@
+"""
+Incremental Re-translation
+
+Aligns a new extraction of a deck with the previous extraction and its
+translation, so only new or changed segments are sent to the model.
+
+- Slides are aligned by content hash, then by position
+- Shapes within aligned slides are aligned by shape_id, then text hash, then
+  position (always within the same element type)
+- Every aligned shape contributes its (previous source -> previous translation)
+  segment pairs to a per-slide reuse map that PPTTranslator consults before
+  the translation memory or the API
+
+Usage:
+    python translator.py new_extracted.json -l French \
+        --previous-extracted old_extracted.json \
+        --previous-translated old_extracted_translated_french.json
+"""
+
+import hashlib
+import json
+from typing import Dict, List, Tuple
+
+from binary_format import TEXT_COLUMNS
+from compact_schema import load_extraction
+
+
+def paragraph_texts(paragraphs: List[Dict]) -> List[str]:
+    """Get run texts of a list of paragraphs, in order"""
+    return [run.get("text", "") for para in paragraphs or [] for run in para.get("runs", [])]
+
+
+def element_texts(element: Dict) -> List[str]:
+    """
+    Get an element's translatable texts in the order the translator visits them.
+    
+    Args:
+        element: Element dictionary (extracted or translated)
+        
+    Returns:
+        List of texts (non-string entries such as numeric categories are kept
+        so extracted and translated lists stay aligned)
+    """
+    element_type = element.get("element_type")
+    if element_type in ["TextBox", "AutoShape"]:
+        return paragraph_texts(element.get("paragraphs"))
+    if element_type == "Table" and "table_data" in element:
+        return [text for cell in element["table_data"].get("cells", [])
+                for text in paragraph_texts(cell.get("paragraphs"))]
+    if element_type == "Chart" and "chart_data" in element:
+        chart = element["chart_data"]
+        texts = [chart.get("title")]
+        texts += list((chart.get("axis_titles") or {}).values())
+        texts += chart.get("legend_entries") or []
+        for series in chart.get("data_values") or []:
+            texts.append(series.get("series_name"))
+            texts += [label.get("text") for label in series.get("data_labels") or []]
+        texts += chart.get("series_names") or []
+        texts += chart.get("categories") or []
+        return texts
+    return []
+
+
+def smartart_texts(smartart: Dict) -> List[str]:
+    """Get a SmartArt diagram's texts (text list, then node texts)"""
+    return list(smartart.get("texts") or []) + [node.get("text") for node in smartart.get("nodes") or []]
+
+
+def text_hash(texts: List[str]) -> str:
+    """Hash a list of texts (order-sensitive)"""
+    joined = "\x1f".join(text if isinstance(text, str) else json.dumps(text) for text in texts)
+    return hashlib.sha1(joined.encode("utf-8")).hexdigest()
+
+
+def slide_hash(slide: Dict) -> str:
+    """Hash all source text on a slide (elements, notes and SmartArt)"""
+    texts = [text for element in slide.get("elements", []) for text in element_texts(element)]
+    texts.append((slide.get("speaker_notes") or {}).get("text"))
+    texts += [text for smartart in slide.get("smartart") or [] for text in smartart_texts(smartart)]
+    return text_hash(texts)
+
+
+def align_items(old_items: List[Dict], new_items: List[Dict], key_funcs) -> Dict[int, int]:
+    """
+    Align two lists in passes, each matching still-unaligned items on one key.
+    
+    Args:
+        old_items: Items from the previous version
+        new_items: Items from the new version
+        key_funcs: Functions (item, index) -> hashable key or None, tried in order
+        
+    Returns:
+        Dictionary of new index -> old index
+    """
+    aligned = {}
+    used = set()
+    for key_func in key_funcs:
+        candidates = {}
+        for old_idx, item in enumerate(old_items):
+            if old_idx in used:
+                continue
+            key = key_func(item, old_idx)
+            if key is not None:
+                candidates.setdefault(key, []).append(old_idx)
+        for new_idx, item in enumerate(new_items):
+            if new_idx in aligned:
+                continue
+            key = key_func(item, new_idx)
+            if key is None or not candidates.get(key):
+                continue
+            old_idx = candidates[key].pop(0)
+            aligned[new_idx] = old_idx
+            used.add(old_idx)
+    return aligned
+
+
+def align_slides(old_slides: List[Dict], new_slides: List[Dict]) -> Dict[int, int]:
+    """Align slides by content hash, then by position"""
+    return align_items(old_slides, new_slides, [
+        lambda slide, idx: slide_hash(slide),
+        lambda slide, idx: idx
+    ])
+
+
+def align_elements(old_elements: List[Dict], new_elements: List[Dict]) -> Dict[int, int]:
+    """Align shapes by shape_id, then text hash, then position, within the same element type"""
+    return align_items(old_elements, new_elements, [
+        lambda element, idx: (element.get("element_type"), element.get("shape_id"))
+        if element.get("shape_id") is not None else None,
+        lambda element, idx: (element.get("element_type"), text_hash(element_texts(element)))
+        if element_texts(element) else None,
+        lambda element, idx: (element.get("element_type"), idx)
+    ])
+
+
+def align_smartart(old_diagrams: List[Dict], new_diagrams: List[Dict]) -> Dict[int, int]:
+    """Align SmartArt diagrams by text hash, then shape_id, then position"""
+    return align_items(old_diagrams, new_diagrams, [
+        lambda smartart, idx: text_hash(smartart_texts(smartart)),
+        lambda smartart, idx: ("shape", smartart.get("shape_id")) if smartart.get("shape_id") is not None else None,
+        lambda smartart, idx: idx
+    ])
+
+
+def add_pairs(reuse: Dict[str, str], sources: List[str], translations: List[str]):
+    """Add aligned (source -> translation) segment pairs to a reuse map"""
+    if len(sources) != len(translations):
+        return
+    for source, translation in zip(sources, translations):
+        if isinstance(source, str) and source.strip() and isinstance(translation, str):
+            reuse.setdefault(source, translation)
+
+
+def build_reuse_maps(old_extracted: Dict, old_translated: Dict, new_extracted: Dict) -> Tuple[List[Dict[str, str]], Dict]:
+    """
+    Build per-slide maps of reusable translations for a new deck version.
+    
+    The previous extraction and its translation share the same structure
+    (the translator only replaces text), so their slides, elements and texts
+    line up by index; the new extraction is aligned against the previous one.
+    
+    Args:
+        old_extracted: Previous extraction data
+        old_translated: Translation of the previous extraction
+        new_extracted: New extraction data
+        
+    Returns:
+        Tuple of (list with one {source: translation} map per new slide,
+        alignment statistics)
+    """
+    old_slides = old_extracted.get("slides", [])
+    translated_slides = old_translated.get("slides", [])
+    new_slides = new_extracted.get("slides", [])
+    
+    slide_alignment = align_slides(old_slides, new_slides)
+    stats = {"slides_aligned": len(slide_alignment), "slides_unchanged": 0, "elements_aligned": 0}
+    reuse_maps = []
+    
+    for new_idx, new_slide in enumerate(new_slides):
+        reuse = {}
+        reuse_maps.append(reuse)
+        old_idx = slide_alignment.get(new_idx)
+        if old_idx is None or old_idx >= len(translated_slides):
+            continue
+        old_slide = old_slides[old_idx]
+        translated_slide = translated_slides[old_idx]
+        if slide_hash(old_slide) == slide_hash(new_slide):
+            stats["slides_unchanged"] += 1
+        
+        old_elements = old_slide.get("elements", [])
+        translated_elements = translated_slide.get("elements", [])
+        element_alignment = align_elements(old_elements, new_slide.get("elements", []))
+        stats["elements_aligned"] += len(element_alignment)
+        for old_element_idx in element_alignment.values():
+            if old_element_idx < len(translated_elements):
+                add_pairs(reuse, element_texts(old_elements[old_element_idx]),
+                          element_texts(translated_elements[old_element_idx]))
+        
+        old_notes = old_slide.get("speaker_notes") or {}
+        translated_notes = translated_slide.get("speaker_notes") or {}
+        add_pairs(reuse, [old_notes.get("text")], [translated_notes.get("text")])
+        
+        old_diagrams = old_slide.get("smartart") or []
+        translated_diagrams = translated_slide.get("smartart") or []
+        for old_diagram_idx in align_smartart(old_diagrams, new_slide.get("smartart") or []).values():
+            if old_diagram_idx < len(translated_diagrams):
+                add_pairs(reuse, smartart_texts(old_diagrams[old_diagram_idx]),
+                          smartart_texts(translated_diagrams[old_diagram_idx]))
+    
+    return reuse_maps, stats
+
+
+def load_reuse_maps(previous_extracted_path: str, previous_translated_path: str, new_extracted_path: str):
+    """
+    Load the three files (JSON or binary, text columns only) and build per-slide reuse maps.
+    
+    Args:
+        previous_extracted_path: Previous extraction JSON
+        previous_translated_path: Translated JSON of the previous extraction
+        new_extracted_path: New extraction JSON
+        
+    Returns:
+        Tuple of (reuse maps, alignment statistics)
+    """
+    old_extracted = load_extraction(previous_extracted_path, columns=TEXT_COLUMNS)
+    old_translated = load_extraction(previous_translated_path, columns=TEXT_COLUMNS)
+    new_extracted = load_extraction(new_extracted_path, columns=TEXT_COLUMNS)
+    return build_reuse_maps(old_extracted, old_translated, new_extracted)
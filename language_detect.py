@@ -0,0 +1,421 @@
+"""
+Offline Language Detection
+
+Lightweight language identifier used to skip segments that are already in the
+target language (e.g. French quotes or slides inside an "English" deck). No
+network or model files are needed:
+
+- Scripts are told apart with a code point lookup table (Arabic, Hebrew,
+  Greek, Cyrillic, Thai, Devanagari, Hangul, kana, Han), which is enough for
+  languages with their own script
+- Latin-script languages are scored against character trigram profiles built
+  at first use from the sample texts below; because those profiles are small,
+  a segment must also contain more of the language's function words than of
+  any other language's before it is attributed to that language
+
+All segments are scored together: the texts are concatenated into one code
+point array, and script counts, trigram log-likelihoods and function word
+hits are summed per segment with numpy bincount.
+
+Usage:
+    python language_detect.py "Résultats du premier trimestre" "Q1 results"
+"""
+
+from typing import Dict, List
+
+import numpy as np
+
+from translation_memory import language_code
+
+
+# Segments with fewer letters than this are never treated as detected
+# (Han, kana and Hangul characters carry more information per letter)
+MIN_LETTERS = 8
+DENSE_SCRIPT_MIN_LETTERS = 4
+DENSE_SCRIPT_LANGUAGES = ["ja", "zh", "ko"]
+
+# Default posterior probability needed to treat a segment as the target language
+CONFIDENCE_THRESHOLD = 0.9
+
+# Trigram hash buckets per profile and add-k smoothing
+PROFILE_BUCKETS = 8192
+PROFILE_SMOOTHING = 0.5
+
+# Script classes of the code point lookup table. The Arabic marker classes are
+# Arabic-script letters specific to Persian or Urdu (or to Arabic itself).
+SCRIPT_CLASSES = ["other", "latin", "arabic", "hebrew", "greek", "cyrillic", "thai",
+                  "devanagari", "hangul", "kana", "han", "arabic_ar", "arabic_fa", "arabic_ur"]
+SCRIPT_RANGES = {
+    "arabic": [(0x0600, 0x06FF), (0x0750, 0x077F), (0xFB50, 0xFDFF), (0xFE70, 0xFEFF)],
+    "hebrew": [(0x0590, 0x05FF)],
+    "greek": [(0x0370, 0x03FF), (0x1F00, 0x1FFF)],
+    "cyrillic": [(0x0400, 0x04FF)],
+    "thai": [(0x0E00, 0x0E7F)],
+    "devanagari": [(0x0900, 0x097F)],
+    "hangul": [(0x1100, 0x11FF), (0x3130, 0x318F), (0xAC00, 0xD7AF)],
+    "kana": [(0x3040, 0x30FF), (0x31F0, 0x31FF)],
+    "han": [(0x3400, 0x4DBF), (0x4E00, 0x9FFF), (0xF900, 0xFAFF)]
+}
+ARABIC_MARKERS = {
+    "arabic_ar": "ةيك",
+    "arabic_fa": "پچژگکی",
+    "arabic_ur": "ٹڈڑںھے"
+}
+ARABIC_CLASSES = ["arabic", "arabic_ar", "arabic_fa", "arabic_ur"]
+
+# Languages identified by script: code -> script classes that count as the language
+SCRIPT_LANGUAGES = {
+    "ar": ARABIC_CLASSES, "fa": ARABIC_CLASSES, "ur": ARABIC_CLASSES,
+    "he": ["hebrew"], "el": ["greek"], "th": ["thai"], "hi": ["devanagari"],
+    "ru": ["cyrillic"], "uk": ["cyrillic"], "bg": ["cyrillic"], "sr": ["cyrillic"],
+    "ko": ["hangul"], "ja": ["kana", "han"], "zh": ["han"]
+}
+
+# Sample texts for the Latin-script trigram profiles
+PROFILE_SAMPLES = {
+    "en": """The results of the first quarter show that revenue grew faster than expected in all regions.
+Our team will present the new strategy and the main objectives for the next year. Please review the
+attached report before the meeting and share your questions with the project manager. The clinical
+trial is still ongoing and the first patients have completed the study with good safety data. We
+need to improve the quality of our products while reducing costs and delivering on time. This slide
+summarizes the key findings, the next steps and the risks that we have identified with our partners.
+Thank you for your attention, and do not hesitate to contact us if you would like more information.""",
+    "fr": """Les résultats du premier trimestre montrent que le chiffre d'affaires a augmenté plus vite que prévu
+dans toutes les régions. Notre équipe présentera la nouvelle stratégie et les principaux objectifs pour
+l'année prochaine. Veuillez consulter le rapport joint avant la réunion et transmettre vos questions au
+chef de projet. L'essai clinique est toujours en cours et les premiers patients ont terminé l'étude avec
+de bonnes données de sécurité. Nous devons améliorer la qualité de nos produits tout en réduisant les
+coûts et en respectant les délais. Cette diapositive résume les principales conclusions, les prochaines
+étapes et les risques que nous avons identifiés avec nos partenaires. Merci de votre attention.""",
+    "es": """Los resultados del primer trimestre muestran que los ingresos crecieron más rápido de lo esperado en
+todas las regiones. Nuestro equipo presentará la nueva estrategia y los principales objetivos para el
+próximo año. Por favor, revise el informe adjunto antes de la reunión y envíe sus preguntas al jefe de
+proyecto. El ensayo clínico sigue en curso y los primeros pacientes han completado el estudio con buenos
+datos de seguridad. Tenemos que mejorar la calidad de nuestros productos, reducir los costes y cumplir
+los plazos. Esta diapositiva resume las principales conclusiones, los próximos pasos y los riesgos que
+hemos identificado con nuestros socios. Gracias por su atención y no dude en ponerse en contacto con nosotros.""",
+    "de": """Die Ergebnisse des ersten Quartals zeigen, dass der Umsatz in allen Regionen schneller gewachsen ist als
+erwartet. Unser Team wird die neue Strategie und die wichtigsten Ziele für das nächste Jahr vorstellen.
+Bitte lesen Sie den beigefügten Bericht vor der Besprechung und senden Sie Ihre Fragen an den
+Projektleiter. Die klinische Studie läuft noch, und die ersten Patienten haben die Studie mit guten
+Sicherheitsdaten abgeschlossen. Wir müssen die Qualität unserer Produkte verbessern, die Kosten senken
+und die Termine einhalten. Diese Folie fasst die wichtigsten Erkenntnisse, die nächsten Schritte und die
+Risiken zusammen, die wir mit unseren Partnern ermittelt haben. Vielen Dank für Ihre Aufmerksamkeit.""",
+    "it": """I risultati del primo trimestre mostrano che il fatturato è cresciuto più rapidamente del previsto in
+tutte le regioni. Il nostro team presenterà la nuova strategia e gli obiettivi principali per il prossimo
+anno. Si prega di leggere la relazione allegata prima della riunione e di inviare le domande al
+responsabile del progetto. Lo studio clinico è ancora in corso e i primi pazienti hanno completato lo
+studio con buoni dati di sicurezza. Dobbiamo migliorare la qualità dei nostri prodotti riducendo i costi
+e rispettando le scadenze. Questa diapositiva riassume i risultati principali, i prossimi passi e i
+rischi che abbiamo individuato con i nostri partner. Grazie per l'attenzione e non esitate a contattarci.""",
+    "pt": """Os resultados do primeiro trimestre mostram que a receita cresceu mais rápido do que o esperado em
+todas as regiões. A nossa equipa vai apresentar a nova estratégia e os principais objetivos para o
+próximo ano. Por favor, leia o relatório em anexo antes da reunião e envie as suas perguntas ao gestor
+do projeto. O ensaio clínico ainda está em curso e os primeiros pacientes concluíram o estudo com bons
+dados de segurança. Precisamos de melhorar a qualidade dos nossos produtos, reduzindo os custos e
+cumprindo os prazos. Este diapositivo resume as principais conclusões, os próximos passos e os riscos
+que identificámos com os nossos parceiros. Obrigado pela vossa atenção e não hesitem em contactar-nos.""",
+    "nl": """De resultaten van het eerste kwartaal laten zien dat de omzet in alle regio's sneller is gegroeid dan
+verwacht. Ons team presenteert de nieuwe strategie en de belangrijkste doelstellingen voor volgend jaar.
+Lees het bijgevoegde rapport voor de vergadering en stuur uw vragen naar de projectleider. Het klinische
+onderzoek loopt nog en de eerste patiënten hebben de studie afgerond met goede veiligheidsgegevens. We
+moeten de kwaliteit van onze producten verbeteren, de kosten verlagen en de deadlines halen. Deze dia
+vat de belangrijkste bevindingen, de volgende stappen en de risico's samen die we met onze partners
+hebben vastgesteld. Bedankt voor uw aandacht en neem gerust contact met ons op voor meer informatie.""",
+    "pl": """Wyniki pierwszego kwartału pokazują, że przychody we wszystkich regionach rosły szybciej, niż
+oczekiwano. Nasz zespół przedstawi nową strategię i najważniejsze cele na przyszły rok. Prosimy o
+zapoznanie się z załączonym raportem przed spotkaniem i przesłanie pytań do kierownika projektu. Badanie
+kliniczne wciąż trwa, a pierwsi pacjenci zakończyli udział w badaniu z dobrymi danymi dotyczącymi
+bezpieczeństwa. Musimy poprawić jakość naszych produktów, obniżyć koszty i dotrzymywać terminów. Ten
+slajd podsumowuje najważniejsze wnioski, kolejne kroki oraz ryzyka, które zidentyfikowaliśmy wspólnie z
+naszymi partnerami. Dziękujemy za uwagę i zachęcamy do kontaktu w razie pytań.""",
+    "sv": """Resultaten för första kvartalet visar att intäkterna har ökat snabbare än väntat i alla regioner. Vårt
+team kommer att presentera den nya strategin och de viktigaste målen för nästa år. Läs den bifogade
+rapporten före mötet och skicka dina frågor till projektledaren. Den kliniska prövningen pågår
+fortfarande och de första patienterna har slutfört studien med goda säkerhetsdata. Vi måste förbättra
+kvaliteten på våra produkter, minska kostnaderna och hålla tidsplanen. Den här bilden sammanfattar de
+viktigaste resultaten, nästa steg och de risker som vi har identifierat tillsammans med våra partner.
+Tack för er uppmärksamhet och tveka inte att kontakta oss om ni vill ha mer information."""
+}
+
+# Frequent function words of the profiled languages (lowercase)
+FUNCTION_WORDS = {
+    "en": "the of and to in is for that with on are this be by as at from we our will you your it not "
+          "have has or an was were which their can all more new these they would should been",
+    "fr": "le la les des du de et est une un pour que qui dans sur avec au aux par pas ce cette ces "
+          "nous vous sont ont son sa ses leur plus ou mais être été il elle",
+    "es": "el la los las de del y en es una un para que con por se al como más sus su este esta "
+          "estos son han ha nuestro nuestra pero lo o fue",
+    "de": "der die das und ist nicht ein eine für mit den dem des von zu auf im sich wir sie es "
+          "werden wird sind auch bei oder aus nach wie über noch",
+    "it": "il lo la i gli le di del della dei delle e è un una per che con su non sono nel nella al "
+          "alla si ha più come anche o ma questo questa",
+    "pt": "o a os as de do da dos das e é um uma para que com não em no na nos por se ao mais "
+          "como foi são nossa nosso seu sua",
+    "nl": "de het een en van is dat op te in met voor zijn niet er om ook aan bij naar wordt "
+          "worden door als maar uit dit deze wij we",
+    "pl": "i w z na do nie się że jest to jak o od po dla przez oraz które który ale czy są "
+          "jego jej już tak także",
+    "sv": "och att det som en ett är på av för med till den har inte om de vi kan ska var "
+          "från också men eller detta"
+}
+WORD_HASH_BASE = 1000003
+WORD_MAX_LENGTH = 32
+
+_tables = {}
+
+
+def _class_table() -> np.ndarray:
+    """Build (once) the uint8 script class of every BMP code point"""
+    table = _tables.get("classes")
+    if table is None:
+        table = np.zeros(0x10000, dtype=np.uint8)
+        latin = SCRIPT_CLASSES.index("latin")
+        for code in list(range(0x0250)) + list(range(0x1E00, 0x1F00)):
+            if chr(code).isalpha():
+                table[code] = latin
+        for script, ranges in SCRIPT_RANGES.items():
+            for start, end in ranges:
+                table[start:end + 1] = SCRIPT_CLASSES.index(script)
+        # Non-letters inside script blocks (digits, punctuation) do not count
+        for code in np.flatnonzero(table > latin):
+            if not chr(code).isalpha():
+                table[code] = 0
+        for marker_class, letters in ARABIC_MARKERS.items():
+            for letter in letters:
+                table[ord(letter)] = SCRIPT_CLASSES.index(marker_class)
+        _tables["classes"] = table
+    return table
+
+
+def _concat(texts: List[str]):
+    """
+    Concatenate lowercased texts into one code point array.
+    
+    Returns:
+        Tuple of (code points, segment index of each code point); segments
+        are separated by a NUL that belongs to no segment (index -1)
+    """
+    lowered = [text.lower() if isinstance(text, str) else "" for text in texts]
+    codes = np.frombuffer("\x00".join(lowered).encode("utf-32-le"), dtype=np.uint32)
+    lengths = np.array([len(text) for text in lowered], dtype=np.int64)
+    segment_ids = np.repeat(np.arange(len(lowered)), lengths + 1)[:len(codes)]
+    segment_ids[codes == 0] = -1
+    return codes, segment_ids
+
+
+def script_counts(codes: np.ndarray, segment_ids: np.ndarray, count: int) -> np.ndarray:
+    """
+    Count letters of each script class per segment.
+    
+    Returns:
+        Array of shape (count, len(SCRIPT_CLASSES))
+    """
+    classes = _class_table()[np.minimum(codes, 0xFFFF)]
+    valid = segment_ids >= 0
+    keys = segment_ids[valid] * len(SCRIPT_CLASSES) + classes[valid]
+    return np.bincount(keys, minlength=count * len(SCRIPT_CLASSES)).reshape(count, len(SCRIPT_CLASSES))
+
+
+def _trigrams(codes: np.ndarray, segment_ids: np.ndarray):
+    """
+    Get hashed Latin letter trigrams (non-letters read as spaces).
+    
+    Returns:
+        Tuple of (bucket of each trigram, segment index of each trigram)
+    """
+    latin = _class_table()[np.minimum(codes, 0xFFFF)] == SCRIPT_CLASSES.index("latin")
+    letters = np.where(latin, codes, 32).astype(np.int64)
+    if len(letters) < 3:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    first, middle, last = letters[:-2], letters[1:-1], letters[2:]
+    valid = ((segment_ids[:-2] == segment_ids[2:]) & (segment_ids[:-2] >= 0)
+             & (middle != 32) & ((first != 32) | (last != 32)))
+    buckets = (first * 1000003 + middle * 10007 + last) % PROFILE_BUCKETS
+    return buckets[valid], segment_ids[:-2][valid]
+
+
+def _profiles():
+    """Build (once) the trigram log-probability matrix of the Latin languages"""
+    profiles = _tables.get("profiles")
+    if profiles is None:
+        languages = list(PROFILE_SAMPLES)
+        log_probs = np.empty((len(languages), PROFILE_BUCKETS), dtype=np.float64)
+        for idx, language in enumerate(languages):
+            codes, segment_ids = _concat([PROFILE_SAMPLES[language]])
+            buckets, _ = _trigrams(codes, segment_ids)
+            counts = np.bincount(buckets, minlength=PROFILE_BUCKETS) + PROFILE_SMOOTHING
+            log_probs[idx] = np.log(counts / counts.sum())
+        profiles = (languages, log_probs)
+        _tables["profiles"] = profiles
+    return profiles
+
+
+def _word_hashes(codes: np.ndarray, segment_ids: np.ndarray):
+    """
+    Hash every Latin-letter word.
+    
+    Returns:
+        Tuple of (int64 hash of each word, segment index of each word)
+    """
+    latin = _class_table()[np.minimum(codes, 0xFFFF)] == SCRIPT_CLASSES.index("latin")
+    positions = np.flatnonzero(latin)
+    if not len(positions):
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    starts = np.ones(len(positions), dtype=bool)
+    starts[1:] = np.diff(positions) != 1
+    word_starts = np.flatnonzero(starts)
+    offsets = np.arange(len(positions)) - np.repeat(word_starts, np.diff(np.append(word_starts, len(positions))))
+    powers = _tables.get("powers")
+    if powers is None:
+        powers = np.ones(WORD_MAX_LENGTH, dtype=np.int64)
+        with np.errstate(over="ignore"):
+            for idx in range(1, WORD_MAX_LENGTH):
+                powers[idx] = powers[idx - 1] * WORD_HASH_BASE
+        _tables["powers"] = powers
+    # int64 overflow wraps around, which is fine for hashing
+    with np.errstate(over="ignore"):
+        contributions = codes[positions].astype(np.int64) * powers[np.minimum(offsets, WORD_MAX_LENGTH - 1)]
+        hashes = np.add.reduceat(contributions, word_starts)
+    return hashes, segment_ids[positions[word_starts]]
+
+
+def _function_words():
+    """Build (once) the sorted function word hashes and their language membership"""
+    table = _tables.get("function_words")
+    if table is None:
+        languages = list(PROFILE_SAMPLES)
+        membership = {}
+        for idx, language in enumerate(languages):
+            codes, segment_ids = _concat([FUNCTION_WORDS[language]])
+            for word_hash in _word_hashes(codes, segment_ids)[0]:
+                membership.setdefault(int(word_hash), set()).add(idx)
+        hashes = np.array(sorted(membership), dtype=np.int64)
+        members = np.zeros((len(hashes), len(languages)))
+        for row, word_hash in enumerate(hashes):
+            members[row, list(membership[int(word_hash)])] = 1.0
+        table = (hashes, members)
+        _tables["function_words"] = table
+    return table
+
+
+def function_word_counts(codes: np.ndarray, segment_ids: np.ndarray, count: int) -> np.ndarray:
+    """
+    Count function words of each profiled language per segment.
+    
+    Returns:
+        Array of shape (count, len(PROFILE_SAMPLES))
+    """
+    hashes, members = _function_words()
+    word_hashes, word_segments = _word_hashes(codes, segment_ids)
+    rows = np.minimum(np.searchsorted(hashes, word_hashes), len(hashes) - 1)
+    found = hashes[rows] == word_hashes
+    counts = np.empty((count, members.shape[1]))
+    for idx in range(members.shape[1]):
+        counts[:, idx] = np.bincount(word_segments[found], weights=members[rows[found], idx], minlength=count)
+    return counts
+
+
+def latin_posteriors(codes: np.ndarray, segment_ids: np.ndarray, count: int) -> np.ndarray:
+    """
+    Score every segment against every Latin-script profile.
+    
+    Returns:
+        Array of shape (count, len(PROFILE_SAMPLES)) with the posterior
+        probability of each profiled language (uniform prior)
+    """
+    languages, log_probs = _profiles()
+    buckets, trigram_segments = _trigrams(codes, segment_ids)
+    scores = np.empty((count, len(languages)))
+    for idx in range(len(languages)):
+        scores[:, idx] = np.bincount(trigram_segments, weights=log_probs[idx][buckets], minlength=count)
+    scores -= scores.max(axis=1, keepdims=True)
+    posteriors = np.exp(scores)
+    return posteriors / posteriors.sum(axis=1, keepdims=True)
+
+
+def supported_language(language: str) -> bool:
+    """Return True if segments in `language` can be detected"""
+    code = language_code(language)
+    return code in SCRIPT_LANGUAGES or code in PROFILE_SAMPLES
+
+
+def language_confidence(texts: List[str], language: str) -> np.ndarray:
+    """
+    Estimate, for every text at once, the probability that it is in `language`.
+    
+    Args:
+        texts: Segment texts
+        language: Language name (e.g. "French") or ISO code
+        
+    Returns:
+        Float array with one confidence per text (0 for texts with fewer than
+        MIN_LETTERS letters or when the language is not supported)
+    """
+    count = len(texts)
+    code = language_code(language)
+    if not count or not supported_language(code):
+        return np.zeros(count)
+    
+    codes, segment_ids = _concat(texts)
+    counts = script_counts(codes, segment_ids, count)
+    letters = counts[:, 1:].sum(axis=1)
+    
+    def share(names):
+        return counts[:, [SCRIPT_CLASSES.index(name) for name in names]].sum(axis=1) / np.maximum(letters, 1)
+    
+    if code in SCRIPT_LANGUAGES:
+        confidence = share(SCRIPT_LANGUAGES[code])
+        kana = counts[:, SCRIPT_CLASSES.index("kana")]
+        if code == "ja":
+            confidence = np.where(kana > 0, confidence, 0.0)
+        elif code == "zh":
+            confidence = np.where(kana == 0, confidence, 0.0)
+        elif code in ("ar", "fa", "ur"):
+            # Letters specific to the other two languages rule a segment out
+            others = [f"arabic_{other}" for other in ("ar", "fa", "ur") if other != code]
+            confidence = np.where(share(others) > 0, 0.0, confidence)
+    else:
+        language_idx = list(PROFILE_SAMPLES).index(code)
+        posteriors = latin_posteriors(codes, segment_ids, count)
+        confidence = share(["latin"]) * posteriors[:, language_idx]
+        # The language must also lead the function word vote outright
+        votes = function_word_counts(codes, segment_ids, count)
+        target_votes = votes[:, language_idx].copy()
+        votes[:, language_idx] = -1
+        confidence = np.where((target_votes > 0) & (target_votes > votes.max(axis=1)), confidence, 0.0)
+    
+    min_letters = DENSE_SCRIPT_MIN_LETTERS if code in DENSE_SCRIPT_LANGUAGES else MIN_LETTERS
+    return np.where(letters >= min_letters, confidence, 0.0)
+
+
+def detect_languages(texts: List[str]) -> List[Dict[str, float]]:
+    """
+    Get the confidence of every supported language for each text.
+    
+    Args:
+        texts: Segment texts
+        
+    Returns:
+        List with one {language code: confidence} dictionary per text
+    """
+    codes = list(SCRIPT_LANGUAGES) + list(PROFILE_SAMPLES)
+    table = np.column_stack([language_confidence(texts, code) for code in codes]) if texts else []
+    return [dict(zip(codes, row)) for row in table]
+
+
+def main():
+    """Print the most likely languages of each text"""
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Detect the language of short texts offline")
+    parser.add_argument("texts", nargs="+", help="Texts to classify")
+    args = parser.parse_args()
+    
+    for text, scores in zip(args.texts, detect_languages(args.texts)):
+        best = sorted(scores.items(), key=lambda item: -item[1])[:3]
+        print(f"{text[:60]!r}: " + ", ".join(f"{code} {score:.2f}" for code, score in best))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,317 @@
+"""
+Post-translation QA
+
+Compares every source segment of an extracted deck with its translation and
+flags segments that lost something on the way:
+
+- numbers: the multiset of numbers differs (thousands/decimal separators and
+  non-ASCII digits are normalized, so 1,250.5 matches 1 250,5)
+- urls: a URL or email address of the source is missing from the target
+- line_breaks: the number of line breaks differs
+- empty: the target is empty although the source is not
+- identical: the target is unchanged although the source is real text
+- length_ratio: the target is implausibly short or long for its source
+
+Number, URL and email extraction runs as one regex pass over all segments
+joined together, with matches mapped back to segments by offset; the other
+checks are numpy comparisons over per-segment arrays.
+
+PPTTranslator runs this after translating (--qa), re-translates only the
+failing segments and writes a summary report. It can also be run on its own:
+
+Usage:
+    python qa.py extracted.json translated.json --report qa_report.json
+"""
+
+import json
+import re
+from collections import Counter
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from binary_format import TEXT_COLUMNS
+from compact_schema import load_extraction
+from translation_memory import language_code
+
+
+# Numbers, with thousands separators (comma, dot or thin/no-break space)
+# and a decimal part
+NUMBER_PATTERN = r"\d+(?:[.,]\d+|[\u00a0\u202f ]\d{3}(?!\d))*"
+URL_PATTERN = r"(?:https?://|www\.)[^\s<>\"')\]\x00]+|[\w.+-]+@[\w-]+(?:\.[\w-]+)+"
+TOKEN_PATTERN = re.compile(f"(?P<url>{URL_PATTERN})|(?P<number>{NUMBER_PATTERN})")
+
+# Target/source length ratio bounds, checked for sources of at least
+# LENGTH_RATIO_MIN_CHARS characters (dense scripts get a lower floor)
+LENGTH_RATIO_MIN_CHARS = 20
+LENGTH_RATIO_BOUNDS = (0.3, 3.0)
+DENSE_LENGTH_RATIO_BOUNDS = (0.1, 3.0)
+DENSE_SCRIPT_LANGUAGES = ["ja", "zh", "ko"]
+
+# Identical output is only suspicious for sources with this many letters
+IDENTICAL_MIN_LETTERS = 12
+
+CHECKS = ["numbers", "urls", "line_breaks", "empty", "identical", "length_ratio"]
+
+
+def iter_segments(slides: List[Dict]):
+    """
+    Walk the translatable segments of a deck in translator order.
+    
+    Args:
+        slides: List of slide dictionaries (extracted or translated)
+        
+    Yields:
+        Tuples of (path, text), where path is a tuple of keys/indexes into
+        the slides list
+    """
+    for slide_idx, slide in enumerate(slides):
+        for element_idx, element in enumerate(slide.get("elements", [])):
+            base = (slide_idx, "elements", element_idx)
+            element_type = element.get("element_type")
+            if element_type in ["TextBox", "AutoShape"]:
+                yield from _iter_paragraphs(base, element.get("paragraphs"))
+            elif element_type == "Table" and "table_data" in element:
+                for cell_idx, cell in enumerate(element["table_data"].get("cells", [])):
+                    yield from _iter_paragraphs(base + ("table_data", "cells", cell_idx), cell.get("paragraphs"))
+            elif element_type == "Chart" and "chart_data" in element:
+                chart = element["chart_data"]
+                chart_base = base + ("chart_data",)
+                yield chart_base + ("title",), chart.get("title")
+                for axis in (chart.get("axis_titles") or {}):
+                    yield chart_base + ("axis_titles", axis), chart["axis_titles"][axis]
+                for idx, entry in enumerate(chart.get("legend_entries") or []):
+                    yield chart_base + ("legend_entries", idx), entry
+                for series_idx, series in enumerate(chart.get("data_values") or []):
+                    series_base = chart_base + ("data_values", series_idx)
+                    yield series_base + ("series_name",), series.get("series_name")
+                    for label_idx, label in enumerate(series.get("data_labels") or []):
+                        yield series_base + ("data_labels", label_idx, "text"), label.get("text")
+                for idx, name in enumerate(chart.get("series_names") or []):
+                    yield chart_base + ("series_names", idx), name
+                for idx, category in enumerate(chart.get("categories") or []):
+                    yield chart_base + ("categories", idx), category
+        
+        if slide.get("speaker_notes"):
+            yield (slide_idx, "speaker_notes", "text"), slide["speaker_notes"].get("text")
+        for smartart_idx, smartart in enumerate(slide.get("smartart") or []):
+            base = (slide_idx, "smartart", smartart_idx)
+            for idx, text in enumerate(smartart.get("texts") or []):
+                yield base + ("texts", idx), text
+            for idx, node in enumerate(smartart.get("nodes") or []):
+                yield base + ("nodes", idx, "text"), node.get("text")
+
+
+def _iter_paragraphs(base: Tuple, paragraphs: List[Dict]):
+    for para_idx, para in enumerate(paragraphs or []):
+        for run_idx, run in enumerate(para.get("runs", [])):
+            yield base + ("paragraphs", para_idx, "runs", run_idx, "text"), run.get("text", "")
+
+
+def get_path(slides: List[Dict], path: Tuple):
+    """Get the value at a segment path (None if the path does not exist)"""
+    node = slides
+    for key in path:
+        try:
+            node = node[key]
+        except (KeyError, IndexError, TypeError):
+            return None
+    return node
+
+
+def set_path(slides: List[Dict], path: Tuple, value):
+    """Set the value at a segment path"""
+    node = slides
+    for key in path[:-1]:
+        node = node[key]
+    node[path[-1]] = value
+
+
+def refresh_full_text(slides: List[Dict], path: Tuple):
+    """
+    Recompute the derived full_text/text of the element, cell or SmartArt a
+    segment belongs to, the way the translator builds them.
+    
+    Args:
+        slides: Translated slides
+        path: Path of a segment that was changed
+    """
+    if "paragraphs" in path:
+        owner = get_path(slides, path[:path.index("paragraphs")])
+        runs_text = ["".join(run.get("text") or "" for run in para.get("runs", []))
+                     for para in owner.get("paragraphs", [])]
+        joined = "\n".join(text for text in runs_text if text)
+        if "cells" in path:
+            if "text" in owner:
+                owner["text"] = joined
+        else:
+            owner["full_text"] = joined
+    elif "smartart" in path and path[path.index("smartart") + 2] == "texts":
+        smartart = get_path(slides, path[:path.index("smartart") + 2])
+        smartart["full_text"] = " ".join(smartart.get("texts") or [])
+
+
+def _bulk_tokens(texts: List[str]):
+    """
+    Extract URLs/emails and normalized numbers from all texts in one regex pass.
+    
+    Returns:
+        Tuple of (list of URL Counters, list of number Counters), one per text
+    """
+    urls = [Counter() for _ in texts]
+    numbers = [Counter() for _ in texts]
+    joined = "\x00".join(texts)
+    starts = np.cumsum([0] + [len(text) + 1 for text in texts[:-1]])
+    matches = list(TOKEN_PATTERN.finditer(joined))
+    positions = np.fromiter((match.start() for match in matches), dtype=np.int64, count=len(matches))
+    segments = np.searchsorted(starts, positions, side="right") - 1
+    for match, segment in zip(matches, segments.tolist()):
+        if match.group("url"):
+            urls[segment][match.group("url").rstrip(".,;:!?")] += 1
+        else:
+            numbers[segment]["".join(str(int(char)) for char in match.group("number") if char.isdigit())] += 1
+    return urls, numbers
+
+
+def validate_pairs(sources: List[str], targets: List[str], target_language: str = None) -> List[List[str]]:
+    """
+    Run every check over aligned source/target segments at once.
+    
+    Args:
+        sources: Source texts
+        targets: Translated texts (same length)
+        target_language: Target language name or code (for length ratio bounds)
+        
+    Returns:
+        List with the failed check names of each pair (empty when it passed)
+    """
+    count = len(sources)
+    if not count:
+        return []
+    sources = [text if isinstance(text, str) else "" for text in sources]
+    targets = [text if isinstance(text, str) else "" for text in targets]
+    
+    source_len = np.fromiter((len(text.strip()) for text in sources), dtype=np.int64, count=count)
+    target_len = np.fromiter((len(text.strip()) for text in targets), dtype=np.int64, count=count)
+    source_breaks = np.fromiter((text.count("\n") for text in sources), dtype=np.int64, count=count)
+    target_breaks = np.fromiter((text.count("\n") for text in targets), dtype=np.int64, count=count)
+    source_letters = np.fromiter((sum(char.isalpha() for char in text) for text in sources), dtype=np.int64, count=count)
+    identical = np.fromiter((source == target for source, target in zip(sources, targets)), dtype=bool, count=count)
+    
+    has_source = source_len > 0
+    low, high = (DENSE_LENGTH_RATIO_BOUNDS
+                 if target_language and language_code(target_language) in DENSE_SCRIPT_LANGUAGES
+                 else LENGTH_RATIO_BOUNDS)
+    ratio = target_len / np.maximum(source_len, 1)
+    
+    failed = {
+        "empty": has_source & (target_len == 0),
+        "line_breaks": has_source & (target_len > 0) & (source_breaks != target_breaks),
+        "identical": identical & (source_letters >= IDENTICAL_MIN_LETTERS),
+        "length_ratio": (source_len >= LENGTH_RATIO_MIN_CHARS) & (target_len > 0) & ((ratio < low) | (ratio > high))
+    }
+    
+    source_urls, source_numbers = _bulk_tokens(sources)
+    target_urls, target_numbers = _bulk_tokens(targets)
+    failed["numbers"] = np.fromiter((source != target for source, target in zip(source_numbers, target_numbers)),
+                                    dtype=bool, count=count) & has_source & (target_len > 0)
+    failed["urls"] = np.fromiter((bool(source - target) for source, target in zip(source_urls, target_urls)),
+                                 dtype=bool, count=count) & has_source & (target_len > 0)
+    
+    return [[check for check in CHECKS if failed[check][idx]] for idx in range(count)]
+
+
+def validate_deck(source_slides: List[Dict], translated_slides: List[Dict], target_language: str = None) -> List[Dict]:
+    """
+    Validate every segment of a translated deck against its source.
+    
+    Args:
+        source_slides: Extracted slides
+        translated_slides: Translated slides (same structure)
+        target_language: Target language name or code
+        
+    Returns:
+        List of failures: {"slide", "path", "source", "target", "issues"}
+    """
+    paths = []
+    sources = []
+    for path, text in iter_segments(source_slides):
+        if isinstance(text, str) and text.strip():
+            paths.append(path)
+            sources.append(text)
+    targets = [get_path(translated_slides, path) for path in paths]
+    
+    failures = []
+    for path, source, target, issues in zip(paths, sources, targets, validate_pairs(sources, targets, target_language)):
+        if issues:
+            failures.append({
+                "slide": path[0] + 1,
+                "path": list(path),
+                "source": source,
+                "target": target,
+                "issues": issues
+            })
+    return failures
+
+
+def summarize(failures: List[Dict], segments_checked: int) -> Dict:
+    """
+    Build the summary section of a QA report.
+    
+    Args:
+        failures: Failures from validate_deck
+        segments_checked: Number of segments validated
+        
+    Returns:
+        Dictionary with totals per check and per slide
+    """
+    by_check = Counter(issue for failure in failures for issue in failure["issues"])
+    by_slide = Counter(failure["slide"] for failure in failures)
+    return {
+        "segments_checked": segments_checked,
+        "segments_failed": len(failures),
+        "by_check": {check: by_check.get(check, 0) for check in CHECKS},
+        "by_slide": dict(sorted(by_slide.items()))
+    }
+
+
+def count_segments(slides: List[Dict]) -> int:
+    """Count the non-empty segments validate_deck checks"""
+    return sum(1 for _, text in iter_segments(slides) if isinstance(text, str) and text.strip())
+
+
+def print_summary(summary: Dict):
+    """Print a QA summary"""
+    print(f"QA: {summary['segments_failed']} of {summary['segments_checked']} segments failed")
+    for check, failed in summary["by_check"].items():
+        if failed:
+            print(f"  - {check}: {failed}")
+
+
+def main():
+    """Validate a translated JSON against its extraction"""
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Check translated segments against their sources")
+    parser.add_argument("extracted", help="Extracted JSON (source)")
+    parser.add_argument("translated", help="Translated JSON")
+    parser.add_argument("--report", help="Write the QA report to this JSON file")
+    args = parser.parse_args()
+    
+    source = load_extraction(args.extracted, columns=TEXT_COLUMNS)
+    translated = load_extraction(args.translated, columns=TEXT_COLUMNS)
+    
+    failures = validate_deck(source["slides"], translated["slides"], translated.get("target_language"))
+    summary = summarize(failures, count_segments(source["slides"]))
+    print_summary(summary)
+    for failure in failures[:20]:
+        print(f"  slide {failure['slide']}: {', '.join(failure['issues'])}: {failure['source'][:60]!r} -> {str(failure['target'])[:60]!r}")
+    
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump({"summary": summary, "failures": failures}, f, indent=2, ensure_ascii=False)
+        print(f"Report saved to {args.report}")
+
+
+if __name__ == "__main__":
+    main()
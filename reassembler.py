@@ -465,6 +465,9 @@ from pptx.enum.text import PP_ALIGN, MSO_AUTO_SIZE, MSO_ANCHOR
 from copy import deepcopy
 import argparse
 
+from binary_format import TEXT_COLUMNS
+from compact_schema import load_extraction
+
 class PPTXReassembler:
     """
     Reassembles PowerPoint presentation from translated JSON.
@@ -497,8 +500,7 @@ class PPTXReassembler:
         
         # Load translated JSON
         print(f"Loading translated content: {translated_json_path}")
-        with open(translated_json_path, 'r', encoding='utf-8') as f:
-            self.translated_data = json.load(f)
+        self.translated_data = load_extraction(translated_json_path, expand=True, columns=TEXT_COLUMNS)
         
         # Check if target language is RTL
         self.is_rtl = self.translated_data.get('is_rtl', False)
@@ -0,0 +1,111 @@
+"""
+In-flight Request Coalescing
+
+Process-wide registry of segments currently being translated, so concurrent
+PPTTranslator jobs (e.g. several app.py users translating decks built from the
+same template) send each identical segment to the API only once. The first
+requester of a key becomes its leader and sends the request; later requesters
+wait for the leader's result instead of issuing their own.
+
+Keys are (text with runs of spaces and tabs collapsed, target language, model,
+prompt version), so a result is only shared between requests that would have
+produced it anyway. Line breaks stay in the key: texts that differ only in
+them need different translations.
+
+Usage:
+    from singleflight import get_in_flight_registry
+    registry = get_in_flight_registry()
+    flight, leader = registry.claim(key)
+    if leader:
+        registry.resolve(key, flight, (text, translate(text)))
+    else:
+        result = flight.wait()   # None if the leader failed or timed out
+"""
+
+import threading
+from typing import Any, Dict, Hashable, Tuple
+
+
+# Seconds a follower waits for a leader before translating the segment itself
+FOLLOWER_TIMEOUT = 300.0
+
+
+class Flight:
+    """One in-flight segment: its result is published once by the leader"""
+    
+    def __init__(self):
+        self._done = threading.Event()
+        self.result = None
+        self.followers = 0
+    
+    def wait(self, timeout: float = FOLLOWER_TIMEOUT) -> Any:
+        """
+        Wait for the leader's result.
+        
+        Args:
+            timeout: Seconds to wait
+            
+        Returns:
+            The leader's result, or None if the leader failed or the wait timed out
+        """
+        if not self._done.wait(timeout):
+            return None
+        return self.result
+
+
+class InFlightRegistry:
+    """Thread-safe map of key -> Flight for requests that have not finished yet"""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._flights: Dict[Hashable, Flight] = {}
+        self.stats = {"leaders": 0, "followers": 0}
+    
+    def claim(self, key: Hashable) -> Tuple[Flight, bool]:
+        """
+        Join the flight for a key, starting one if none is in progress.
+        
+        Args:
+            key: Request key
+            
+        Returns:
+            Tuple of (flight, True if the caller is the leader and must resolve it)
+        """
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight is not None:
+                flight.followers += 1
+                self.stats["followers"] += 1
+                return flight, False
+            flight = Flight()
+            self._flights[key] = flight
+            self.stats["leaders"] += 1
+            return flight, True
+    
+    def resolve(self, key: Hashable, flight: Flight, result: Any):
+        """
+        Publish a leader's result (None on failure) and retire the flight.
+        
+        Args:
+            key: Request key the flight was claimed under
+            flight: Flight returned by claim()
+            result: Result to share, or None so followers translate it themselves
+        """
+        with self._lock:
+            if self._flights.get(key) is flight:
+                del self._flights[key]
+        flight.result = result
+        flight._done.set()
+    
+    def in_flight(self) -> int:
+        """Return the number of keys currently being translated"""
+        with self._lock:
+            return len(self._flights)
+
+
+_registry = InFlightRegistry()
+
+
+def get_in_flight_registry() -> InFlightRegistry:
+    """Get the process-wide in-flight registry shared by all translators"""
+    return _registry
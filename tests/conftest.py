@@ -0,0 +1,58 @@
+"""Shared fixtures: a fake OpenAI client so tests never call the API"""
+
+import json
+import os
+import sys
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def fake_translation(text):
+    return f"FR:{text}"
+
+
+class FakeCompletions:
+    """chat.completions stand-in answering batch prompts with "FR:<text>" items"""
+    
+    def __init__(self, latency=0.0, translate=fake_translation):
+        self.latency = latency
+        self.translate = translate
+        self.calls = []
+        self._lock = threading.Lock()
+    
+    def create(self, **request):
+        with self._lock:
+            self.calls.append(request)
+        if self.latency:
+            time.sleep(self.latency)
+        try:
+            items = json.loads(request["messages"][-1]["content"])
+        except ValueError:
+            items = None
+        if isinstance(items, list):
+            content = json.dumps([self.translate(item) for item in items], ensure_ascii=False)
+        else:
+            content = self.translate(request["messages"][-1]["content"])
+        usage = SimpleNamespace(prompt_tokens=100, completion_tokens=20, total_tokens=120,
+                                prompt_tokens_details=SimpleNamespace(cached_tokens=0))
+        if request.get("stream"):
+            chunks = [SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=content[i:i + 7]))],
+                                      usage=None)
+                      for i in range(0, len(content), 7)]
+            return iter(chunks + [SimpleNamespace(choices=[], usage=usage)])
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))], usage=usage)
+
+
+@pytest.fixture
+def fake_client(monkeypatch):
+    """Patch the translator's OpenAI client with a FakeCompletions-backed one"""
+    import translator
+    
+    client = SimpleNamespace(chat=SimpleNamespace(completions=FakeCompletions()))
+    monkeypatch.setattr(translator, "get_openai_client", lambda api_key=None: client)
+    return client
@@ -0,0 +1,32 @@
+"""Offline benchmark harnesses"""
+
+from benchmarks import collect_batches
+from compact_schema import save_extraction
+
+EXTRACTION = {
+    "presentation_name": "deck.pptx",
+    "total_slides": 1,
+    "slides": [{
+        "slide_number": 1,
+        "elements": [{
+            "shape_id": 2,
+            "shape_name": "TextBox 1",
+            "element_type": "TextBox",
+            "paragraphs": [{"runs": [{"text": "Quarterly results"}, {"text": " are in"}]}],
+            "full_text": "Quarterly results are in"
+        }],
+        "speaker_notes": {"text": "Mention the new region", "element_type": "SpeakerNotes"}
+    }]
+}
+
+
+def test_collect_batches_reads_binary_extractions(fake_client, tmp_path):
+    json_path = str(tmp_path / "deck.json")
+    msgpack_path = str(tmp_path / "deck.msgpack")
+    save_extraction(EXTRACTION, json_path)
+    save_extraction(EXTRACTION, msgpack_path)
+    
+    batches = collect_batches(msgpack_path, "French")
+    assert batches == collect_batches(json_path, "French")
+    assert ["Quarterly results", " are in"] in batches
+    assert ["Mention the new region"] in batches
@@ -0,0 +1,73 @@
+"""PPTTranslator behaviour that does not need the OpenAI API"""
+
+import itertools
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from cassette import Cassette, CassetteMiss
+from translation_memory import TranslationMemory
+from translator import HEDGE_MIN_SAMPLES, PPTTranslator
+
+_route_ids = itertools.count()
+
+
+def make_translator(**kwargs):
+    kwargs.setdefault("deck_summary", False)
+    kwargs.setdefault("coalesce_requests", False)
+    return PPTTranslator(api_key="test", target_language="French", **kwargs)
+
+
+def test_constant_latency_with_rate_spacing_is_never_hedged(fake_client):
+    # Requests queue for the rate limit (50 ms apart, 8 at a time) but every
+    # call takes the same 100 ms once it starts, so none is slow
+    fake_client.chat.completions.latency = 0.1
+    route = {"model": f"hedge-test-{next(_route_ids)}", "max_concurrency": 8, "requests_per_minute": 1200}
+    translator = make_translator(hedge_requests=True, hedge_max_rate=1.0, routes={"fast": route})
+    
+    def request(idx):
+        return translator._create_completion("fast", messages=[{"role": "user", "content": f"text {idx}"}])
+    
+    for idx in range(HEDGE_MIN_SAMPLES):
+        request(idx)
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(request, range(HEDGE_MIN_SAMPLES, HEDGE_MIN_SAMPLES + 24)))
+    
+    assert translator.stats["hedged_requests"] == 0
+
+
+def test_replay_fails_on_unrecorded_request(fake_client, tmp_path):
+    cassette_path = str(tmp_path / "run.cassette.gz")
+    recorder = Cassette(cassette_path, mode="record")
+    assert make_translator(cassette=recorder).translate_batch(["Growth", "Q1"]) == ["FR:Growth", "FR:Q1"]
+    recorder.close()
+    
+    replayer = Cassette(cassette_path, mode="replay")
+    translator = PPTTranslator(target_language="French", cassette=replayer, deck_summary=False,
+                               coalesce_requests=False)
+    assert translator.translate_batch(["Growth", "Q1"]) == ["FR:Growth", "FR:Q1"]
+    assert all(route["requests_per_minute"] == 0 for route in translator.routes.values())
+    with pytest.raises(CassetteMiss):
+        translator.translate_batch(["Revenue"])
+
+
+def text_slide(*texts):
+    return {"slide_number": 1, "elements": [
+        {"element_type": "TextBox", "paragraphs": [{"runs": [{"text": text}]}], "full_text": text}
+        for text in texts
+    ]}
+
+
+def test_qa_stores_only_accepted_retries_in_translation_memory(fake_client, tmp_path):
+    kept, rejected = "Revenue grew in every region", "Quarterly results are in"
+    # The retry of `rejected` comes back untranslated again, so QA keeps the original
+    fake_client.chat.completions.translate = lambda text: text if text == rejected else f"FR:{text}"
+    memory = TranslationMemory(str(tmp_path / "tm.db"))
+    translator = make_translator(translation_memory=memory)
+    
+    translated = [text_slide(kept, rejected)]
+    translator.run_qa([text_slide(kept, rejected)], translated)
+    
+    assert translated[0]["elements"][0]["full_text"] == f"FR:{kept}"
+    assert memory.get(kept, "French") == f"FR:{kept}"
+    assert memory.get(rejected, "French") is None
@@ -0,0 +1,732 @@
+"""
+Translation Memory
+
+Local store of approved source -> target segment pairs, used by PPTTranslator to
+skip the API for text it has translated before.
+
+- Pairs are persisted in SQLite, keyed by (target language, exact source text)
+- Near duplicates ("Q3 results" vs "Q4 results") are found with an in-memory
+  character trigram index, scored by Dice similarity over trigram sets
+- The index is built with vectorized numpy sorts, and lookups count shared
+  trigrams for all units at once, so a lookup takes around a millisecond
+  even across hundreds of thousands of units
+
+- Approved translations from CAT tools can be bulk-loaded from TMX or TSV
+  (one transaction, deduplicated on the unique key) and exported back
+
+Usage:
+    from translation_memory import TranslationMemory
+    tm = TranslationMemory("translation_memory.db")
+    tm.add("Q3 results", "Résultats du T3", "French")
+    tm.search("Q4 results", "French", min_similarity=0.6)
+    
+    # Bulk import/export
+    python translation_memory.py import approved.tmx -l French
+    python translation_memory.py export french.tsv -l French
+"""
+
+import argparse
+import math
+import os
+import re
+import sqlite3
+import threading
+import time
+from array import array
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
+from lxml import etree
+from xml.sax.saxutils import escape
+
+
+DEFAULT_TM_PATH = "translation_memory.db"
+
+# Character n-gram size for the fuzzy index
+NGRAM_SIZE = 3
+
+# Units added after a bulk index build before the index is rebuilt
+# (at least this many, or a quarter of the bulk-built units)
+DELTA_REBUILD_MIN = 10000
+
+# Rows per executemany call during bulk imports (all in one transaction)
+IMPORT_CHUNK_SIZE = 50000
+SQLITE_CACHE_KB = 131072
+
+# ISO 639-1 codes for the target language names used by the translator,
+# for matching TMX xml:lang attributes (regional subtags are ignored)
+LANGUAGE_CODES = {
+    "English": "en", "Spanish": "es", "French": "fr", "German": "de", "Italian": "it",
+    "Portuguese": "pt", "Dutch": "nl", "Polish": "pl", "Swedish": "sv", "Danish": "da",
+    "Norwegian": "no", "Finnish": "fi", "Greek": "el", "Czech": "cs", "Hungarian": "hu",
+    "Romanian": "ro", "Bulgarian": "bg", "Croatian": "hr", "Japanese": "ja", "Chinese": "zh",
+    "Arabic": "ar", "Hebrew": "he", "Urdu": "ur", "Persian": "fa", "Farsi": "fa"
+}
+LANGUAGE_CODE_ALIASES = {"nb": "no", "nn": "no", "iw": "he"}
+
+XML_LANG = "{http://www.w3.org/XML/1998/namespace}lang"
+
+# Characters that are not allowed in XML 1.0 documents
+INVALID_XML_CHARS = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f\ufffe\uffff]")
+
+# Backslash escapes for tabs and line breaks inside TSV fields
+TSV_ESCAPES = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"})
+TSV_UNESCAPES = {"\\\\": "\\", "\\t": "\t", "\\n": "\n", "\\r": "\r"}
+TSV_UNESCAPE = re.compile(r"\\[\\tnr]")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS units (
+    id INTEGER PRIMARY KEY,
+    target_language TEXT NOT NULL,
+    source TEXT NOT NULL,
+    target TEXT NOT NULL,
+    source_language TEXT NOT NULL DEFAULT '',
+    origin TEXT NOT NULL DEFAULT '',
+    updated_at REAL NOT NULL,
+    UNIQUE (target_language, source)
+)
+"""
+
+
+def normalize_text(text: str) -> str:
+    """Collapse runs of whitespace so spacing differences do not affect matching"""
+    return " ".join(text.split())
+
+
+def normalize_spacing(text: str) -> str:
+    """Collapse runs of spaces and tabs and strip the ends, keeping line breaks"""
+    return "\n".join(" ".join(line.split()) for line in text.strip().splitlines())
+
+
+def padded_codes(text: str) -> np.ndarray:
+    """Get the code points of a whitespace-normalized text padded with one space each side"""
+    return np.frombuffer(f" {normalize_text(text)} ".encode("utf-32-le"), dtype=np.uint32)
+
+
+def trigram_keys(text: str) -> np.ndarray:
+    """
+    Get the distinct character trigrams of a text as integer keys.
+    
+    Each trigram is packed as three 21-bit code points, so keys are exact and
+    independent of any index built so far.
+    
+    Args:
+        text: Text to split
+        
+    Returns:
+        Sorted array of unique uint64 keys (empty for blank text)
+    """
+    codes = padded_codes(text).astype(np.uint64)
+    if len(codes) < NGRAM_SIZE:
+        return np.empty(0, dtype=np.uint64)
+    keys = (codes[:-2] << np.uint64(42)) | (codes[1:-1] << np.uint64(21)) | codes[2:]
+    return np.unique(keys)
+
+
+class NGramIndex:
+    """
+    Inverted character trigram index over the units of one target language.
+    
+    The bulk of the index is a CSR layout built with a single vectorized sort:
+    sorted trigram keys, offsets, and one int32 array of unit ids. Code points
+    are ranked over the indexed alphabet so a (trigram, unit) pair packs into
+    one int64 sort key. Units added afterwards go to small per-trigram delta
+    postings, and the CSR arrays are rebuilt once the delta grows large.
+    
+    Lookups count shared trigrams for every unit at once (bincount over the
+    query's postings) and score candidates by Dice similarity,
+    2|A∩B| / (|A|+|B|) over trigram sets.
+    """
+    
+    def __init__(self, sources: List[str] = (), targets: List[str] = ()):
+        self._sources = list(sources)
+        self._targets = list(targets)
+        self._by_source = {source: unit_id for unit_id, source in enumerate(self._sources)}
+        self._build()
+    
+    def __len__(self):
+        return len(self._sources)
+    
+    def _build(self):
+        """Rebuild the CSR arrays over every unit and clear the delta postings"""
+        self._base_count = len(self._sources)
+        self._delta = {}
+        self._rank = None
+        self._gram_keys = np.empty(0, dtype=np.int64)
+        self._gram_lookup = None
+        self._offsets = np.zeros(1, dtype=np.int64)
+        self._postings = np.empty(0, dtype=np.int32)
+        self._sizes = array("i", bytes(4 * self._base_count))
+        if not self._base_count:
+            return
+        
+        padded = [f" {normalize_text(source)} " for source in self._sources]
+        lengths = np.fromiter(map(len, padded), dtype=np.int64, count=len(padded))
+        codes = np.frombuffer("".join(padded).encode("utf-32-le"), dtype=np.uint32)
+        if len(codes) < NGRAM_SIZE:
+            return
+        
+        # Dense code point ranks keep trigram keys small enough to pack with unit ids
+        present = np.zeros(0x110000, dtype=bool)
+        present[codes] = True
+        alphabet_size = int(present.sum())
+        self._rank = np.cumsum(present, dtype=np.int64) - 1
+        self._rank[~present] = -1
+        self._alphabet_size = alphabet_size
+        ranks = self._rank[codes]
+        
+        units = np.repeat(np.arange(self._base_count, dtype=np.int64), lengths)
+        valid = units[:-2] == units[2:]
+        grams = ((ranks[:-2] * alphabet_size + ranks[1:-1]) * alphabet_size + ranks[2:])[valid]
+        units = units[:-2][valid]
+        
+        unit_bits = max(1, self._base_count.bit_length())
+        if (alphabet_size ** 3).bit_length() + unit_bits > 63:
+            # Very large alphabets (e.g. CJK): renumber the trigrams that occur
+            self._gram_lookup = np.sort(grams)
+            keep = np.ones(len(self._gram_lookup), dtype=bool)
+            keep[1:] = self._gram_lookup[1:] != self._gram_lookup[:-1]
+            self._gram_lookup = self._gram_lookup[keep]
+            grams = np.searchsorted(self._gram_lookup, grams)
+        
+        pairs = np.sort((grams << unit_bits) | units)
+        keep = np.ones(len(pairs), dtype=bool)
+        keep[1:] = pairs[1:] != pairs[:-1]
+        pairs = pairs[keep]
+        
+        grams = pairs >> unit_bits
+        self._postings = (pairs & ((1 << unit_bits) - 1)).astype(np.int32)
+        starts = np.flatnonzero(np.concatenate(([True], grams[1:] != grams[:-1])))
+        self._gram_keys = grams[starts]
+        self._offsets = np.append(starts, len(grams))
+        self._sizes = array("i", np.bincount(self._postings, minlength=self._base_count).astype(np.int32).tobytes())
+    
+    def _base_postings(self, text: str) -> List[np.ndarray]:
+        """Get the CSR posting slices for the trigrams of a text"""
+        if self._rank is None:
+            return []
+        codes = padded_codes(text)
+        if len(codes) < NGRAM_SIZE:
+            return []
+        ranks = self._rank[codes]
+        grams = (ranks[:-2] * self._alphabet_size + ranks[1:-1]) * self._alphabet_size + ranks[2:]
+        grams = np.unique(grams[(ranks[:-2] >= 0) & (ranks[1:-1] >= 0) & (ranks[2:] >= 0)])
+        if self._gram_lookup is not None:
+            positions = np.searchsorted(self._gram_lookup, grams)
+            found = positions < len(self._gram_lookup)
+            found[found] = self._gram_lookup[positions[found]] == grams[found]
+            grams = positions[found]
+        
+        positions = np.searchsorted(self._gram_keys, grams)
+        found = positions < len(self._gram_keys)
+        found[found] = self._gram_keys[positions[found]] == grams[found]
+        return [self._postings[self._offsets[pos]:self._offsets[pos + 1]] for pos in positions[found]]
+    
+    def add(self, source: str, target: str):
+        """Add a unit, or replace the target of an existing source"""
+        unit_id = self._by_source.get(source)
+        if unit_id is not None:
+            self._targets[unit_id] = target
+            return
+        
+        unit_id = len(self._sources)
+        keys = trigram_keys(source).tolist()
+        self._by_source[source] = unit_id
+        self._sources.append(source)
+        self._targets.append(target)
+        self._sizes.append(len(keys))
+        for key in keys:
+            self._delta.setdefault(key, array("i")).append(unit_id)
+        
+        if len(self._sources) - self._base_count > max(DELTA_REBUILD_MIN, self._base_count // 4):
+            self._build()
+    
+    def get(self, source: str):
+        """Get the target for an exact source, or None"""
+        unit_id = self._by_source.get(source)
+        return None if unit_id is None else self._targets[unit_id]
+    
+    def search(self, text: str, min_similarity: float) -> Dict:
+        """
+        Find the most similar unit at or above a Dice similarity threshold.
+        
+        Args:
+            text: Query text
+            min_similarity: Minimum similarity in (0, 1]
+            
+        Returns:
+            Dictionary with source, target and similarity, or None
+        """
+        unit_id = self._by_source.get(text)
+        if unit_id is not None:
+            return {"source": text, "target": self._targets[unit_id], "similarity": 1.0}
+        
+        keys = trigram_keys(text)
+        query_size = len(keys)
+        if not query_size:
+            return None
+        
+        postings = self._base_postings(text)
+        for key in keys.tolist():
+            delta = self._delta.get(key)
+            if delta:
+                postings.append(np.frombuffer(delta, dtype=np.int32))
+        if not postings:
+            return None
+        
+        # A unit needs at least ceil(s*|A|/(2-s)) shared trigrams to reach similarity s
+        overlaps = np.bincount(np.concatenate(postings), minlength=len(self._sources))
+        min_overlap = max(1, math.ceil(min_similarity * query_size / (2 - min_similarity)))
+        candidates = np.flatnonzero(overlaps >= min_overlap)
+        if not len(candidates):
+            return None
+        
+        sizes = np.frombuffer(self._sizes, dtype=np.int32)[candidates]
+        similarities = 2 * overlaps[candidates] / (sizes + query_size)
+        best = int(similarities.argmax())
+        if similarities[best] < min_similarity:
+            return None
+        unit_id = int(candidates[best])
+        return {"source": self._sources[unit_id], "target": self._targets[unit_id],
+                "similarity": float(similarities[best])}
+
+
+def language_code(language: str) -> str:
+    """
+    Get the ISO 639-1 code for a target language name (or pass a code through).
+    
+    Args:
+        language: Language name (e.g. "French") or code (e.g. "fr", "fr-FR")
+        
+    Returns:
+        Lowercase primary language code
+    """
+    code = LANGUAGE_CODES.get(language, language).split("-")[0].split("_")[0].lower()
+    return LANGUAGE_CODE_ALIASES.get(code, code)
+
+
+def segment_text(seg) -> str:
+    """Get a TMX <seg>'s text, dropping inline markup (bpt/ept/ph codes) but keeping text around it"""
+    return "".join([seg.text or ""] + [child.tail or "" for child in seg])
+
+
+def iter_tmx(path: str, target_code: str, source_code: str = None):
+    """
+    Stream translation units out of a TMX file.
+    
+    The file is parsed incrementally and each <tu> is freed once read, so
+    memory stays flat for million-unit files.
+    
+    Args:
+        path: TMX file path
+        target_code: Target language code to read (e.g. "fr")
+        source_code: Source language code (default: the header's srclang)
+        
+    Yields:
+        Tuples of (source, target, source_language); units without both
+        languages are yielded with target None so they can be counted
+    """
+    header_source = None
+    codes = {}
+    for _, elem in etree.iterparse(path, events=("end",), tag=("header", "tu"), huge_tree=True):
+        if elem.tag == "header":
+            srclang = elem.get("srclang")
+            if srclang and srclang != "*all*":
+                header_source = language_code(srclang)
+            continue
+        
+        wanted_source = source_code or header_source or "en"
+        source = target = None
+        source_language = ""
+        for tuv in elem:
+            lang = tuv.get(XML_LANG) or tuv.get("lang") or ""
+            code = codes.get(lang)
+            if code is None:
+                code = codes[lang] = language_code(lang)
+            if code != wanted_source and code != target_code:
+                continue
+            seg = tuv.find("seg")
+            if seg is None:
+                continue
+            text = segment_text(seg) if len(seg) else (seg.text or "")
+            if code == wanted_source and source is None:
+                source, source_language = text, lang
+            elif code == target_code and target is None:
+                target = text
+        yield source, target, source_language
+        
+        elem.clear()
+        while elem.getprevious() is not None:
+            del elem.getparent()[0]
+
+
+def iter_tsv(path: str):
+    """
+    Stream translation units out of a two-column TSV file (source, target).
+    
+    Tabs, newlines and backslashes inside fields are backslash-escapes.
+    
+    Args:
+        path: TSV file path
+        
+    Yields:
+        Tuples of (source, target, source_language); malformed lines are
+        yielded with target None so they can be counted
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            fields = line.rstrip("\r\n").split("\t")
+            if len(fields) != 2:
+                yield None, None, ""
+                continue
+            source, target = (TSV_UNESCAPE.sub(lambda m: TSV_UNESCAPES[m.group(0)], field) for field in fields)
+            yield source, target, ""
+
+
+def write_tmx(path: str, units, source_code: str, target_code: str):
+    """
+    Write translation units as TMX 1.4.
+    
+    Args:
+        path: Output path
+        units: Iterable of (source, target) tuples
+        source_code: Source language code for xml:lang
+        target_code: Target language code for xml:lang
+        
+    Returns:
+        Number of units written
+    """
+    count = 0
+    with open(path, "w", encoding="utf-8") as f:
+        f.write('<?xml version="1.0" encoding="UTF-8"?>\n<tmx version="1.4">\n')
+        f.write(f'  <header creationtool="ppt-translation" creationtoolversion="1.0" datatype="plaintext" '
+                f'segtype="sentence" adminlang="en" srclang="{source_code}" o-tmf="sqlite"/>\n  <body>\n')
+        for source, target in units:
+            source = escape(INVALID_XML_CHARS.sub("", source))
+            target = escape(INVALID_XML_CHARS.sub("", target))
+            f.write(f'    <tu>\n      <tuv xml:lang="{source_code}"><seg>{source}</seg></tuv>\n'
+                    f'      <tuv xml:lang="{target_code}"><seg>{target}</seg></tuv>\n    </tu>\n')
+            count += 1
+        f.write("  </body>\n</tmx>\n")
+    return count
+
+
+def write_tsv(path: str, units):
+    """
+    Write translation units as a two-column TSV file (source, target).
+    
+    Args:
+        path: Output path
+        units: Iterable of (source, target) tuples
+        
+    Returns:
+        Number of units written
+    """
+    count = 0
+    with open(path, "w", encoding="utf-8") as f:
+        for source, target in units:
+            f.write(f"{source.translate(TSV_ESCAPES)}\t{target.translate(TSV_ESCAPES)}\n")
+            count += 1
+    return count
+
+
+class TranslationMemory:
+    """
+    SQLite-backed translation memory with a fuzzy n-gram index per language.
+    
+    Safe to share between threads and PPTTranslator instances. Indexes are
+    built lazily, the first time a target language is queried.
+    """
+    
+    def __init__(self, path: str = DEFAULT_TM_PATH):
+        """
+        Open (or create) a translation memory.
+        
+        Args:
+            path: SQLite database path (":memory:" for a throwaway memory)
+        """
+        self.path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        # A larger page cache keeps bulk imports from thrashing the unique index
+        self._conn.execute(f"PRAGMA cache_size=-{SQLITE_CACHE_KB}")
+        self._conn.execute(SCHEMA)
+        self._conn.commit()
+        self._lock = threading.RLock()
+        self._indexes = {}
+    
+    def _index(self, language: str) -> NGramIndex:
+        """Get the n-gram index for a target language, loading it on first use"""
+        index = self._indexes.get(language)
+        if index is None:
+            rows = self._conn.execute(
+                "SELECT source, target FROM units WHERE target_language = ? ORDER BY id", (language,)).fetchall()
+            index = NGramIndex([row[0] for row in rows], [row[1] for row in rows])
+            self._indexes[language] = index
+        return index
+    
+    def get(self, text: str, language: str):
+        """
+        Get the stored translation of an exact source text.
+        
+        Args:
+            text: Source text
+            language: Target language
+            
+        Returns:
+            Translated text, or None
+        """
+        with self._lock:
+            return self._index(language).get(text)
+    
+    def search(self, text: str, language: str, min_similarity: float = 0.75) -> Dict:
+        """
+        Find the closest stored segment for a source text.
+        
+        Args:
+            text: Source text
+            language: Target language
+            min_similarity: Minimum trigram Dice similarity. Similarity is
+                computed over trigram sets after collapsing all whitespace, so
+                1.0 does not mean the same text: "ha ha" and "ha ha ha", or two
+                texts differing only in spacing or line breaks, also score 1.0
+                
+        Returns:
+            Dictionary with source, target and similarity, or None
+        """
+        with self._lock:
+            return self._index(language).search(text, min_similarity)
+    
+    def add(self, source: str, target: str, language: str, origin: str = "translator"):
+        """Store one translation (replacing any previous target for the source)"""
+        self.add_many([(source, target)], language, origin)
+    
+    def add_many(self, pairs: Iterable[Tuple[str, str]], language: str, origin: str = "translator"):
+        """
+        Store translations in one transaction and add them to the index.
+        
+        Args:
+            pairs: Iterable of (source, target) tuples
+            language: Target language
+            origin: Where the translations came from (e.g. "translator")
+        """
+        pairs = [(source, target) for source, target in pairs if source and source.strip()]
+        if not pairs:
+            return
+        now = time.time()
+        with self._lock:
+            with self._conn:
+                self._conn.executemany(
+                    "INSERT INTO units (target_language, source, target, origin, updated_at) "
+                    "VALUES (?, ?, ?, ?, ?) "
+                    "ON CONFLICT (target_language, source) DO UPDATE SET "
+                    "target = excluded.target, origin = excluded.origin, updated_at = excluded.updated_at",
+                    [(language, source, target, origin, now) for source, target in pairs])
+            index = self._indexes.get(language)
+            if index is not None:
+                for source, target in pairs:
+                    index.add(source, target)
+    
+    def import_units(self, units, language: str, origin: str = "import") -> Dict:
+        """
+        Bulk-load translation units in a single transaction.
+        
+        Units are upserted on (target language, source), so duplicates within
+        the input and against stored units collapse to one row (the last one
+        wins). If the load fails part-way nothing is stored. The language's
+        fuzzy index is dropped and rebuilt in bulk on the next lookup.
+        
+        Args:
+            units: Iterable of (source, target, source_language) tuples; units
+                with a blank source or target are skipped
+            language: Target language
+            origin: Where the units came from (e.g. "tmx:approved.tmx")
+            
+        Returns:
+            Dictionary with counts of units read, skipped, added and merged
+            (duplicates or updates of stored units)
+        """
+        stats = {"read": 0, "skipped": 0, "added": 0, "merged": 0}
+        now = time.time()
+        sql = ("INSERT INTO units (target_language, source, target, source_language, origin, updated_at) "
+               "VALUES (?, ?, ?, ?, ?, ?) "
+               "ON CONFLICT (target_language, source) DO UPDATE SET "
+               "target = excluded.target, source_language = excluded.source_language, "
+               "origin = excluded.origin, updated_at = excluded.updated_at")
+        
+        with self._lock:
+            before = self.count(language)
+            with self._conn:
+                chunk = []
+                for source, target, source_language in units:
+                    stats["read"] += 1
+                    if not source or not source.strip() or not target or not target.strip():
+                        stats["skipped"] += 1
+                        continue
+                    chunk.append((language, source, target, source_language or "", origin, now))
+                    if len(chunk) >= IMPORT_CHUNK_SIZE:
+                        self._conn.executemany(sql, chunk)
+                        chunk = []
+                if chunk:
+                    self._conn.executemany(sql, chunk)
+            self._indexes.pop(language, None)
+            stats["added"] = self.count(language) - before
+        
+        stats["merged"] = stats["read"] - stats["skipped"] - stats["added"]
+        return stats
+    
+    def import_tmx(self, path: str, language: str, source_code: str = None) -> Dict:
+        """
+        Import the `language` side of a TMX file.
+        
+        Args:
+            path: TMX file path
+            language: Target language name (matched to xml:lang by ISO code)
+            source_code: Source language code (default: the header's srclang, else "en")
+            
+        Returns:
+            Import statistics (see import_units)
+        """
+        units = iter_tmx(path, language_code(language), source_code and language_code(source_code))
+        return self.import_units(units, language, origin=f"tmx:{os.path.basename(path)}")
+    
+    def import_tsv(self, path: str, language: str) -> Dict:
+        """
+        Import a two-column TSV file (source, target).
+        
+        Args:
+            path: TSV file path
+            language: Target language of the second column
+            
+        Returns:
+            Import statistics (see import_units)
+        """
+        return self.import_units(iter_tsv(path), language, origin=f"tsv:{os.path.basename(path)}")
+    
+    def _iter_pairs(self, language: str):
+        """Iterate stored (source, target) pairs for a language in insertion order"""
+        cursor = self._conn.execute(
+            "SELECT source, target FROM units WHERE target_language = ? ORDER BY id", (language,))
+        while True:
+            rows = cursor.fetchmany(IMPORT_CHUNK_SIZE)
+            if not rows:
+                return
+            yield from rows
+    
+    def export_tmx(self, path: str, language: str, source_code: str = "en") -> int:
+        """
+        Export a language's units as TMX 1.4.
+        
+        Args:
+            path: Output path
+            language: Target language
+            source_code: Source language code written to xml:lang
+            
+        Returns:
+            Number of units written
+        """
+        with self._lock:
+            return write_tmx(path, self._iter_pairs(language), language_code(source_code), language_code(language))
+    
+    def export_tsv(self, path: str, language: str) -> int:
+        """
+        Export a language's units as a two-column TSV file.
+        
+        Args:
+            path: Output path
+            language: Target language
+            
+        Returns:
+            Number of units written
+        """
+        with self._lock:
+            return write_tsv(path, self._iter_pairs(language))
+    
+    def count(self, language: str = None) -> int:
+        """Count stored units, optionally for one target language"""
+        with self._lock:
+            if language is None:
+                return self._conn.execute("SELECT COUNT(*) FROM units").fetchone()[0]
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM units WHERE target_language = ?", (language,)).fetchone()[0]
+    
+    def languages(self) -> List[str]:
+        """List target languages with stored units"""
+        with self._lock:
+            rows = self._conn.execute("SELECT DISTINCT target_language FROM units ORDER BY 1")
+            return [row[0] for row in rows]
+    
+    def close(self):
+        """Close the database connection"""
+        with self._lock:
+            self._conn.close()
+            self._indexes.clear()
+
+
+def main():
+    """Main function to inspect, import into and export a translation memory"""
+    parser = argparse.ArgumentParser(description="Inspect, import into and export a local translation memory")
+    parser.add_argument("--db", default=DEFAULT_TM_PATH, help=f"Translation memory path (default: {DEFAULT_TM_PATH})")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    
+    subparsers.add_parser("stats", help="Show unit counts per target language")
+    
+    search_parser = subparsers.add_parser("search", help="Find the closest stored segment for a text")
+    search_parser.add_argument("text", help="Source text to look up")
+    search_parser.add_argument("-l", "--language", required=True, help="Target language")
+    search_parser.add_argument("--min-similarity", type=float, default=0.75,
+                               help="Minimum trigram similarity (default: 0.75)")
+    
+    import_parser = subparsers.add_parser("import", help="Bulk-load a TMX or TSV file")
+    import_parser.add_argument("file", help="TMX (.tmx) or TSV (.tsv/.txt) file")
+    import_parser.add_argument("-l", "--language", required=True, help="Target language (e.g. French)")
+    import_parser.add_argument("--source-lang", help="TMX source language code (default: header srclang, else en)")
+    import_parser.add_argument("--format", choices=["tmx", "tsv"], help="File format (default: from extension)")
+    
+    export_parser = subparsers.add_parser("export", help="Write a language's units to TMX or TSV")
+    export_parser.add_argument("file", help="Output TMX (.tmx) or TSV (.tsv/.txt) file")
+    export_parser.add_argument("-l", "--language", required=True, help="Target language (e.g. French)")
+    export_parser.add_argument("--source-lang", default="en", help="TMX source language code (default: en)")
+    export_parser.add_argument("--format", choices=["tmx", "tsv"], help="File format (default: from extension)")
+    
+    args = parser.parse_args()
+    tm = TranslationMemory(args.db)
+    
+    if args.command in ("import", "export"):
+        file_format = args.format or ("tmx" if args.file.lower().endswith(".tmx") else "tsv")
+        start_time = time.perf_counter()
+        if args.command == "import":
+            if file_format == "tmx":
+                stats = tm.import_tmx(args.file, args.language, args.source_lang)
+            else:
+                stats = tm.import_tsv(args.file, args.language)
+            print(f"Read {stats['read']:,} units: {stats['added']:,} added, "
+                  f"{stats['merged']:,} merged with existing or duplicate units, {stats['skipped']:,} skipped")
+        else:
+            if file_format == "tmx":
+                count = tm.export_tmx(args.file, args.language, args.source_lang)
+            else:
+                count = tm.export_tsv(args.file, args.language)
+            print(f"Exported {count:,} units to {args.file}")
+        print(f"Time elapsed: {time.perf_counter() - start_time:.2f} seconds")
+    elif args.command == "stats":
+        for language in tm.languages():
+            print(f"{language}: {tm.count(language):,} units")
+        print(f"Total: {tm.count():,} units")
+    else:
+        start_time = time.perf_counter()
+        match = tm.search(args.text, args.language, args.min_similarity)
+        elapsed_ms = (time.perf_counter() - start_time) * 1000
+        if match:
+            print(f"Similarity: {match['similarity']:.3f}")
+            print(f"Source: {match['source']}")
+            print(f"Target: {match['target']}")
+        else:
+            print("No match")
+        print(f"Lookup time: {elapsed_ms:.2f} ms (includes index load on first use)")
+    
+    tm.close()
+
+
+if __name__ == "__main__":
+    main()
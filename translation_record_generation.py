@@ -7,6 +7,8 @@ from openpyxl.utils import get_column_letter
 import argparse
 from datetime import datetime
 
+from compact_schema import StyleTables, load_extraction
+
 
 class TranslationRecordGenerator:
     """
@@ -31,12 +33,13 @@ class TranslationRecordGenerator:
         
         # Load both JSONs
         print(f"Loading extraction JSON: {extraction_json_path}")
-        with open(extraction_json_path, 'r', encoding='utf-8') as f:
-            self.extraction_data = json.load(f)
+        self.extraction_data = load_extraction(extraction_json_path)
         
         print(f"Loading translation JSON: {translation_json_path}")
-        with open(translation_json_path, 'r', encoding='utf-8') as f:
-            self.translation_data = json.load(f)
+        self.translation_data = load_extraction(translation_json_path)
+        
+        # Formatting lookups (style ids of compact extractions resolve through the tables)
+        self.styles = StyleTables(self.extraction_data)
         
         # Get target language
         self.target_language = self.translation_data.get('target_language', 'Unknown')
@@ -277,6 +280,7 @@ class TranslationRecordGenerator:
         }
         
         # Extract from run (font formatting)
+        run = self.styles.run_format(run)
         if run:
             metadata["font_name"] = run.get("font_name", "")
             metadata["font_size"] = f"{run.get('font_size', '')}pt" if run.get('font_size') else ""
@@ -345,7 +349,7 @@ class TranslationRecordGenerator:
                     metadata["shape_height"] = str(height)
             
             # Fill/Background color
-            fill_info = element.get("fill", {})
+            fill_info = self.styles.element_style(element, "fill") or {}
             if fill_info:
                 solid_color = fill_info.get("solid_color")
                 if solid_color:
@@ -358,7 +362,7 @@ class TranslationRecordGenerator:
                         metadata["background_color"] = str(solid_color)
             
             # Shadow
-            shadow_info = element.get("shadow", {})
+            shadow_info = self.styles.element_style(element, "shadow") or {}
             if shadow_info:
                 metadata["has_shadow"] = "Yes" if shadow_info.get("has_shadow") else "No"
             
@@ -411,7 +415,7 @@ class TranslationRecordGenerator:
         for para_idx, (orig_para, trans_para) in enumerate(zip(original_paragraphs, translated_paragraphs)):
             orig_runs = orig_para.get("runs", [])
             trans_runs = trans_para.get("runs", [])
-            para_format = orig_para.get("paragraph_formatting", {})
+            para_format = self.styles.paragraph_format(orig_para)
             
             for run_idx, (orig_run, trans_run) in enumerate(zip(orig_runs, trans_runs)):
                 original_text = orig_run.get("text", "")
@@ -435,13 +439,14 @@ class TranslationRecordGenerator:
                 
                 # Build notes
                 notes_parts = []
+                run_format = self.styles.run_format(orig_run)
                 if metadata["is_bulleted"] == "Yes":
                     notes_parts.append(f"Bullet: {metadata['bullet_type']}")
-                if orig_run.get("superscript"):
+                if run_format.get("superscript"):
                     notes_parts.append("Superscript")
-                if orig_run.get("subscript"):
+                if run_format.get("subscript"):
                     notes_parts.append("Subscript")
-                if orig_run.get("strike"):
+                if run_format.get("strike") not in (None, "noStrike"):
                     notes_parts.append("Strikethrough")
                 
                 notes = ", ".join(notes_parts) if notes_parts else ""
@@ -514,7 +519,7 @@ class TranslationRecordGenerator:
                 # Extract metadata from first run if available
                 orig_runs = orig_para.get("runs", [])
                 first_run = orig_runs[0] if orig_runs else None
-                para_format = orig_para.get("paragraph_formatting", {})
+                para_format = self.styles.paragraph_format(orig_para)
                 
                 metadata = self.extract_metadata_from_element(element, first_run, para_format)
                 
@@ -593,12 +593,382 @@
 
 import json
 import os
-from openai import OpenAI
+import re
 from typing import Dict, List, Any
-from dotenv import load_dotenv
+import hashlib
+import heapq
+import itertools
+import threading
 import time
+from collections import deque
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from copy import deepcopy
 
+from cassette import Cassette, CassetteMiss
+from compact_schema import is_compact, load_extraction, save_extraction
+from client_pool import get_openai_client, resolve_api_key
+from translation_memory import TranslationMemory, DEFAULT_TM_PATH, normalize_spacing
+from singleflight import get_in_flight_registry
+from glossary import load_glossary
+from incremental import load_reuse_maps, element_texts, smartart_texts
+from language_detect import language_confidence, supported_language, CONFIDENCE_THRESHOLD
+import qa
+
+# Static instructions for the compact batch format. Kept byte-identical across
+# calls (and placed before anything variable) so provider-side prompt caching
+# can discount it.
+BATCH_SYSTEM_PROMPT = """You are a professional translator for PowerPoint content.
+The user message is a JSON array of strings. Reply with ONLY a JSON array of the same length holding the translation of each string, in the same order.
+Rules:
+- Preserve line breaks (\\n), numbers, URLs, placeholders and special characters
+- Never merge, split, drop or add items
+- No explanations, markdown or text outside the JSON array"""
+
+# Fuzzy translation memory matches are sent as [new source, previous source,
+# previous translation] triples so the model only edits what changed
+TM_EDIT_SYSTEM_PROMPT = """You are a professional translator updating existing translations of PowerPoint content.
+The user message is a JSON array of [new_source, previous_source, previous_translation] triples. Reply with ONLY a JSON array of strings of the same length: for each triple, the previous translation edited as little as possible so that it translates new_source.
+Rules:
+- Change only what differs between previous_source and new_source; keep the rest verbatim
+- Preserve line breaks (\\n), numbers, URLs, placeholders and special characters
+- No explanations, markdown or text outside the JSON array"""
+
+# Deck summary requested once per deck from its slide titles. The rendered
+# summary follows the static instructions in every batch's system prompt, so
+# the prefix stays byte-identical for the whole deck.
+DECK_SUMMARY_SYSTEM_PROMPT = """You summarize PowerPoint decks for translators.
+The user message is a JSON array of the deck's slide titles. Reply with ONLY a JSON object:
+{"domain": "<subject area, at most 8 words>", "tone": "<register, at most 6 words>", "key_terms": ["<recurring domain terms and names, as written in the titles>"]}"""
+DECK_SUMMARY_MAX_TITLES = 60
+DECK_SUMMARY_MAX_TERMS = 12
+
+PROMPT_FORMATS = ["compact", "json"]
+
+# Translation memory: fuzzy matches at or above TM_FUZZY_THRESHOLD are sent as
+# edit context. Matches with the same source up to spacing within lines are
+# reused directly; other matches only below a TM_REUSE_THRESHOLD of 1.0
+# (trigram-set similarity is 1.0 for different texts such as "No no" and
+# "No no no", so 1.0 never reuses a different text)
+TM_FUZZY_THRESHOLD = 0.75
+TM_REUSE_THRESHOLD = 1.0
+
+# Request hedging: latency samples kept for the p95 estimate, samples needed
+# before hedging starts, and worker threads for primary/hedge requests (one
+# pool shared by every translator in the process, enough for a primary and a
+# hedge on every route budget slot)
+HEDGE_LATENCY_WINDOW = 200
+HEDGE_MIN_SAMPLES = 20
+# Hedge only once a request runs this much past the p95, so timer and thread
+# scheduling jitter on a steady latency never sends duplicates
+HEDGE_THRESHOLD_MARGIN = 1.1
+HEDGE_MAX_WORKERS = 32
+
+# Model routes: short UI-like strings go to "fast", long notes and dense
+# paragraphs to "strong". Prices are USD per 1M tokens (prompt tokens served
+# from the provider's prompt cache are billed at the cached input price);
+# concurrency and requests_per_minute form each route's budget, shared
+# process-wide.
+DEFAULT_ROUTES = {
+    "fast": {
+        "model": "gpt-4o-mini",
+        "input_price_per_1m": 0.150,
+        "cached_input_price_per_1m": 0.075,
+        "output_price_per_1m": 0.600,
+        "max_concurrency": 8,
+        "requests_per_minute": 500
+    },
+    "strong": {
+        "model": "gpt-4o",
+        "input_price_per_1m": 2.50,
+        "cached_input_price_per_1m": 1.25,
+        "output_price_per_1m": 10.00,
+        "max_concurrency": 4,
+        "requests_per_minute": 100
+    }
+}
+
+# Failing segments are re-translated in batches of this size after QA
+QA_BATCH_SIZE = 20
+
+# Segment kinds passed to translate_batch, and the size routing threshold
+SEGMENT_KINDS = ["body", "label", "notes"]
+STRONG_ROUTE_MIN_CHARS = 400
+
+# Priority scheduling: segment classes in the order translate_presentation
+# translates them (visible text first, notes last), and job priorities for
+# route budget slots (interactive app.py jobs ahead of bulk CLI jobs)
+SEGMENT_CLASSES = ["titles", "body", "tables_charts", "notes"]
+SCHEDULES = ["priority", "slide"]
+JOB_PRIORITIES = {"interactive": 0, "bulk": 1}
+
+
+def element_segment_class(element: Dict) -> str:
+    """
+    Get the scheduling class of a slide element.
+    
+    Args:
+        element: Element dictionary
+        
+    Returns:
+        "titles" for title/subtitle placeholders, "tables_charts" for tables
+        and charts, otherwise "body"
+    """
+    element_type = element.get("element_type")
+    if element_type in ["Table", "Chart"]:
+        return "tables_charts"
+    placeholder_type = (element.get("placeholder_info") or {}).get("placeholder_type") or ""
+    if "TITLE" in placeholder_type:
+        return "titles"
+    return "body"
+
+
+class RouteBudget:
+    """
+    Concurrency and request-rate budget for one model route.
+    
+    Used around each API call: it holds one of `max_concurrency` slots for
+    the duration of the call and spaces call starts at least
+    60 / requests_per_minute seconds apart. When calls queue for a slot, the
+    lowest priority value is served first (ties in arrival order).
+    """
+    
+    def __init__(self, max_concurrency: int, requests_per_minute: int):
+        self._capacity = max(1, max_concurrency)
+        self._in_use = 0
+        self._waiting = []
+        self._tickets = itertools.count()
+        self._slots = threading.Condition()
+        self._min_interval = 60.0 / requests_per_minute if requests_per_minute else 0.0
+        self._lock = threading.Lock()
+        self._next_start = 0.0
+    
+    def acquire(self, priority=(0,)):
+        """
+        Wait for a slot (and the rate limit), highest priority first.
+        
+        Args:
+            priority: Comparable priority, lower values are served first
+        """
+        with self._slots:
+            ticket = (priority, next(self._tickets))
+            heapq.heappush(self._waiting, ticket)
+            while self._in_use >= self._capacity or self._waiting[0] != ticket:
+                self._slots.wait()
+            heapq.heappop(self._waiting)
+            self._in_use += 1
+            # The next waiter in line may fit in a remaining slot
+            self._slots.notify_all()
+        if self._min_interval:
+            with self._lock:
+                now = time.monotonic()
+                start = max(now, self._next_start)
+                self._next_start = start + self._min_interval
+            if start > now:
+                time.sleep(start - now)
+    
+    def release(self):
+        """Return a slot to the budget"""
+        with self._slots:
+            self._in_use -= 1
+            self._slots.notify_all()
+    
+    @contextmanager
+    def slot(self, priority=(0,)):
+        """Hold a slot for the duration of a `with` block"""
+        self.acquire(priority)
+        try:
+            yield self
+        finally:
+            self.release()
+    
+    def __enter__(self):
+        self.acquire()
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.release()
+        return False
+
+
+_route_budgets = {}
+_route_budgets_lock = threading.Lock()
+
+
+def get_route_budget(route_name: str, route: Dict) -> RouteBudget:
+    """
+    Get the process-wide budget for a route, creating it on first use.
+    
+    Budgets are keyed by route name, model and rate limit, so every translator
+    instance sending to the same route draws from the same concurrency and
+    rate limit (replaying translators, which have none, get their own).
+    
+    Args:
+        route_name: Route name (e.g. "fast", "strong")
+        route: Route configuration dictionary
+        
+    Returns:
+        RouteBudget for the route
+    """
+    key = (route_name, route["model"], route.get("requests_per_minute", 0))
+    with _route_budgets_lock:
+        budget = _route_budgets.get(key)
+        if budget is None:
+            budget = RouteBudget(route.get("max_concurrency", 8), route.get("requests_per_minute", 0))
+            _route_budgets[key] = budget
+        return budget
+
+
+_hedge_executor = None
+_hedge_executor_lock = threading.Lock()
+
+
+def get_hedge_executor() -> ThreadPoolExecutor:
+    """
+    Get the process-wide thread pool that runs hedged requests.
+    
+    Shared so translators created per job (e.g. one per app.py upload) do not
+    each leave a pool of idle threads behind.
+    """
+    global _hedge_executor
+    with _hedge_executor_lock:
+        if _hedge_executor is None:
+            _hedge_executor = ThreadPoolExecutor(max_workers=HEDGE_MAX_WORKERS,
+                                                 thread_name_prefix="translator-hedge")
+        return _hedge_executor
+
+
+def parse_json_array(response_text: str):
+    """
+    Parse a JSON array out of a model response, tolerating markdown code
+    fences and extra text around the array.
+    
+    Args:
+        response_text: Raw model output
+        
+    Returns:
+        Parsed JSON value
+        
+    Raises:
+        json.JSONDecodeError: If no JSON array can be parsed
+    """
+    response_text = response_text.strip()
+    
+    # Extract JSON from response (handle markdown code blocks and extra text)
+    if "```json" in response_text:
+        response_text = response_text.split("```json")[1].split("```")[0].strip()
+    elif "```" in response_text:
+        response_text = response_text.split("```")[1].split("```")[0].strip()
+    
+    # Try to find JSON array boundaries
+    if not response_text.startswith('['):
+        start_idx = response_text.find('[')
+        if start_idx != -1:
+            response_text = response_text[start_idx:]
+    
+    if not response_text.endswith(']'):
+        end_idx = response_text.rfind(']')
+        if end_idx != -1:
+            response_text = response_text[:end_idx + 1]
+    
+    try:
+        return json.loads(response_text)
+    except json.JSONDecodeError:
+        match = re.search(r'\[.*\]', response_text, re.DOTALL)
+        if match:
+            return json.loads(match.group(0))
+        raise
+
+
+def match_spacing(text: str, translation: str) -> str:
+    """Give a translation the leading/trailing whitespace of its source text"""
+    leading = text[:len(text) - len(text.lstrip())]
+    trailing = text[len(text.rstrip()):]
+    return leading + translation.strip() + trailing
+
+
+class IncrementalArrayParser:
+    """
+    Incrementally parses the items of a top-level JSON array from streamed text.
+    
+    Each item is returned as soon as its closing character arrives, so a
+    truncated stream still yields every item completed before the cut. Any
+    text before the opening bracket (e.g. a ```json fence) is skipped.
+    """
+    
+    def __init__(self):
+        self.started = False
+        self.finished = False
+        self.depth = 0
+        self.in_string = False
+        self.escape = False
+        self.buffer = []
+        self.position = 0
+    
+    def _emit(self, items: List):
+        text = "".join(self.buffer).strip()
+        self.buffer = []
+        if not text:
+            return
+        try:
+            items.append((self.position, json.loads(text)))
+        except json.JSONDecodeError:
+            pass
+        self.position += 1
+    
+    def feed(self, chunk: str) -> List:
+        """
+        Feed the next piece of streamed text.
+        
+        Args:
+            chunk: Streamed content delta
+            
+        Returns:
+            List of (position, item) tuples completed by this chunk
+        """
+        items = []
+        for char in chunk:
+            if self.finished:
+                break
+            if not self.started:
+                self.started = char == '['
+                continue
+            
+            if self.in_string:
+                self.buffer.append(char)
+                if self.escape:
+                    self.escape = False
+                elif char == '\\':
+                    self.escape = True
+                elif char == '"':
+                    self.in_string = False
+                    if self.depth == 0:
+                        self._emit(items)
+                continue
+            
+            if char == '"':
+                self.in_string = True
+                self.buffer.append(char)
+            elif char in '{[':
+                self.depth += 1
+                self.buffer.append(char)
+            elif char in '}]':
+                if self.depth == 0:
+                    # End of the top-level array
+                    self._emit(items)
+                    self.finished = True
+                else:
+                    self.depth -= 1
+                    self.buffer.append(char)
+                    if self.depth == 0:
+                        self._emit(items)
+            elif char == ',' and self.depth == 0:
+                self._emit(items)
+            else:
+                self.buffer.append(char)
+        return items
+
+
 class PPTTranslator:
     """
     Translates PowerPoint extracted content while preserving 100% of metadata.
@@ -612,31 +982,137 @@ class PPTTranslator:
     - RTL (Right-to-Left) language detection for Arabic, Hebrew, etc.
     """
     
-    def __init__(self, api_key: str = None, target_language: str = "Spanish"):
+    def __init__(self, api_key: str = None, target_language: str = "Spanish",
+                 prompt_format: str = "compact", hedge_requests: bool = False,
+                 hedge_max_rate: float = 0.1, stream: bool = True,
+                 segment_callback=None, strong_model: str = None,
+                 routes: Dict = None, strong_min_chars: int = STRONG_ROUTE_MIN_CHARS,
+                 translation_memory=None, tm_fuzzy_threshold: float = TM_FUZZY_THRESHOLD,
+                 tm_reuse_threshold: float = TM_REUSE_THRESHOLD,
+                 coalesce_requests: bool = True, priority: str = "bulk",
+                 glossary=None, skip_target_language: bool = False,
+                 language_threshold: float = CONFIDENCE_THRESHOLD, cassette: Cassette = None,
+                 deck_summary: bool = False):
         """
         Initialize the translator.
         
         Args:
             api_key: OpenAI API key (if None, loads from .env)
             target_language: Target language for translation (default: Spanish)
+            prompt_format: Batch wire format, "compact" (JSON array of strings
+                with a static, cacheable system prompt) or "json" (legacy
+                id/text objects)
+            hedge_requests: Fire a duplicate request when a call runs past the
+                p95 latency seen so far, and use whichever finishes first
+            hedge_max_rate: Maximum fraction of requests that may be hedged
+            stream: Stream completions and parse batch items as they arrive
+            segment_callback: Optional callable(source_text, translated_text)
+                invoked for each segment once its batch reply has been checked
+            strong_model: Model for the "strong" route (long notes, dense
+                paragraphs); overrides the model in `routes`
+            routes: Route configuration overrides, merged into DEFAULT_ROUTES
+                per route (model, prices, concurrency, requests per minute)
+            strong_min_chars: Batches with at least this many characters go
+                to the strong route
+            translation_memory: Optional TranslationMemory consulted before
+                calling the API and updated with every new translation
+            tm_fuzzy_threshold: Minimum similarity for a memory match to be
+                sent to the model as an "edit this translation" hint
+            tm_reuse_threshold: Minimum similarity for a memory match with a
+                different source to be reused without calling the API (1.0,
+                the default, only reuses the same text up to spacing within
+                lines)
+            coalesce_requests: Share in-flight requests for identical segments
+                with other translators in the process instead of sending
+                duplicates (see singleflight.py)
+            priority: Job priority for shared route budgets, "interactive"
+                (app.py) or "bulk" (CLI); interactive requests get free slots first
+            glossary: Optional Glossary (see glossary.py); the entries found in
+                each batch are added to its prompt
+            skip_target_language: Keep segments that are already in the target
+                language (offline detection, see language_detect.py) instead
+                of sending them to the model
+            language_threshold: Detection confidence needed to keep a segment
+            cassette: Optional Cassette (see cassette.py) that records every
+                completion or replays recorded ones; a replaying cassette
+                needs no API key, is not rate limited, and raises CassetteMiss
+                (instead of keeping the source text) for an unrecorded request
+            deck_summary: Summarize each deck (domain, tone, key terms) from
+                its slide titles with one request, and add the summary to the
+                system prompt of every batch of that deck. Off by default: the
+                summary costs a request per deck and is part of prompt_version,
+                so segments are then only coalesced with jobs of the same deck
         """
-        # Load environment variables
-        load_dotenv()
-        
-        # Get API key
-        self.api_key = api_key or os.getenv('OPENAI_API_KEY')
-        if not self.api_key:
-            raise ValueError("OPENAI_API_KEY not found. Please set it in .env file or pass it as parameter.")
-        
-        # Initialize OpenAI client
-        self.client = OpenAI(api_key=self.api_key)
+        if prompt_format not in PROMPT_FORMATS:
+            raise ValueError(f"Unknown prompt format '{prompt_format}'. Choose from: {', '.join(PROMPT_FORMATS)}")
+        self.prompt_format = prompt_format
+        if priority not in JOB_PRIORITIES:
+            raise ValueError(f"Unknown priority '{priority}'. Choose from: {', '.join(JOB_PRIORITIES)}")
+        self.priority = priority
+        
+        # Segment class being translated by the priority scheduler (None = all)
+        self._segment_class = None
+        
+        # Get API key (.env is loaded once per process by the client pool) and
+        # the shared, connection-pooled OpenAI client (reused across translator
+        # instances). Replayed runs are served from the cassette alone.
+        self.cassette = cassette
+        if cassette is not None and cassette.mode == "replay":
+            self.api_key = api_key
+            self.client = cassette.wrap()
+        else:
+            self.api_key = resolve_api_key(api_key)
+            self.client = get_openai_client(self.api_key)
+            if cassette is not None:
+                self.client = cassette.wrap(self.client)
         self.target_language = target_language
         
         # RTL language detection
         self.rtl_languages = ['Arabic', 'Hebrew', 'Urdu', 'Persian', 'Farsi']
         self.is_rtl = target_language in self.rtl_languages
         
-        self.model = "gpt-4o-mini"
+        # Model routing (per-route model, pricing and budget)
+        self.routes = deepcopy(DEFAULT_ROUTES)
+        for name, overrides in (routes or {}).items():
+            self.routes.setdefault(name, {}).update(overrides)
+        if strong_model:
+            self.routes["strong"]["model"] = strong_model
+        for name in ("fast", "strong"):
+            if not self.routes.get(name, {}).get("model"):
+                raise ValueError(f"Route '{name}' has no model configured")
+        if cassette is not None and cassette.mode == "replay":
+            # Replayed responses cost nothing, so only concurrency is limited
+            for route in self.routes.values():
+                route["requests_per_minute"] = 0
+        self.strong_min_chars = strong_min_chars
+        
+        # Translation memory (exact and fuzzy reuse of earlier translations)
+        self.translation_memory = translation_memory
+        self.tm_fuzzy_threshold = tm_fuzzy_threshold
+        self.tm_reuse_threshold = tm_reuse_threshold
+        
+        # Terminology glossary (only the entries found in a batch are sent)
+        self.glossary = glossary
+        
+        # Deck summary shared by every batch of the deck being translated
+        self.deck_summary = deck_summary
+        self.deck_context = None
+        self._deck_prompt = ""
+        
+        # Previous translations of the slide being translated (incremental mode)
+        self._reuse = None
+        
+        # Segments already in the target language (detected per presentation)
+        self.skip_target_language = skip_target_language
+        self.language_threshold = language_threshold
+        self._passthrough = set()
+        
+        # In-flight request coalescing across translator instances. The prompt
+        # version fingerprints the batch prompt, so jobs only share results
+        # they would have requested identically.
+        self.coalesce_requests = coalesce_requests
+        self._stats_lock = threading.Lock()
+        self._update_prompt_version()
         
         # Statistics
         self.stats = {
@@ -644,48 +1120,413 @@ class PPTTranslator:
             "api_calls": 0,
             "total_tokens_used": 0,
             "input_tokens": 0,
+            "cached_input_tokens": 0,
             "output_tokens": 0,
-            "total_cost_usd": 0.0
+            "total_cost_usd": 0.0,
+            "hedged_requests": 0,
+            "hedge_wins": 0,
+            "hedge_latency_saved_s": 0.0,
+            "tm_exact_hits": 0,
+            "tm_fuzzy_hits": 0,
+            "tm_fuzzy_edits": 0,
+            "reused_segments": 0,
+            "coalesced_segments": 0,
+            "passthrough_segments": 0,
+            "qa_failed": 0,
+            "qa_fixed": 0,
+            "glossary_terms_sent": 0,
+            "glossary_violations": 0,
+            "routes": {
+                name: {
+                    "model": route["model"],
+                    "api_calls": 0,
+                    "input_tokens": 0,
+                    "cached_input_tokens": 0,
+                    "output_tokens": 0,
+                    "cost_usd": 0.0
+                }
+                for name, route in self.routes.items()
+            }
         }
+        # Request hedging (tail-latency control), latency samples per route
+        self.hedge_requests = hedge_requests
+        self.hedge_max_rate = hedge_max_rate
+        self._latencies = {name: deque(maxlen=HEDGE_LATENCY_WINDOW) for name in self.routes}
+        self._requests_started = 0
+        
+        # Streaming and incremental progress
+        self.stream = stream
+        self.segment_callback = segment_callback
+        self._progress_callback = None
+        self._segments_done = 0
+        self._segments_total = 0
+    
+    def select_route(self, texts: List[str], kind: str = "body") -> str:
+        """
+        Pick the model route for a batch.
+        
+        Labels (chart titles, legend entries, categories, SmartArt nodes) always
+        go to the fast route. Body text and speaker notes go to the strong
+        route once the batch reaches `strong_min_chars` characters.
         
-        # GPT-4o-mini pricing (per 1M tokens)
-        self.input_token_price = 0.150 / 1_000_000  # $0.150 per 1M input tokens
-        self.output_token_price = 0.600 / 1_000_000  # $0.600 per 1M output tokens
+        Args:
+            texts: Non-empty texts in the batch
+            kind: Segment kind, one of SEGMENT_KINDS
+            
+        Returns:
+            Route name
+        """
+        if kind == "label":
+            return "fast"
+        if sum(len(text) for text in texts) >= self.strong_min_chars:
+            return "strong"
+        return "fast"
     
-    def translate_batch(self, texts: List[str]) -> List[str]:
+    def _record_usage(self, route_name: str, usage):
         """
-        Translate a batch of texts using GPT-4o-mini.
+        Add a completed request's token usage and cost to the statistics.
+        
+        Prompt tokens served from the provider's prompt cache are counted
+        separately and priced at the route's cached input price.
         
         Args:
-            texts: List of text strings to translate
+            route_name: Route the request was sent on (selects the pricing)
+            usage: Usage object from the response (None if the API sent none)
+        """
+        route = self.routes[route_name]
+        with self._stats_lock:
+            route_stats = self.stats["routes"][route_name]
+            self.stats["api_calls"] += 1
+            route_stats["api_calls"] += 1
+            if usage is None:
+                return
+            details = getattr(usage, "prompt_tokens_details", None)
+            cached_tokens = getattr(details, "cached_tokens", None) or 0
+            self.stats["input_tokens"] += usage.prompt_tokens
+            self.stats["cached_input_tokens"] += cached_tokens
+            self.stats["output_tokens"] += usage.completion_tokens
+            self.stats["total_tokens_used"] += usage.total_tokens
+            route_stats["input_tokens"] += usage.prompt_tokens
+            route_stats["cached_input_tokens"] += cached_tokens
+            route_stats["output_tokens"] += usage.completion_tokens
+            
+            # Calculate cost with the route's per-1M-token prices; cached
+            # prompt tokens are billed at the cached input price
+            input_price = route.get("input_price_per_1m", 0.0)
+            cost = ((usage.prompt_tokens - cached_tokens) * input_price +
+                    cached_tokens * route.get("cached_input_price_per_1m", input_price) +
+                    usage.completion_tokens * route.get("output_price_per_1m", 0.0)) / 1_000_000
+            self.stats["total_cost_usd"] += cost
+            route_stats["cost_usd"] += cost
+    
+    def _timed_completion(self, route_name: str, request: Dict, on_text=None, on_start=None):
+        """
+        Run one chat completion, record its usage and latency.
+        
+        Streaming requests are consumed here, passing each content delta to
+        `on_text` as it arrives. If the stream breaks off, the error is raised
+        after the deltas received so far have been delivered.
+        
+        The call holds a slot of the route's budget while it runs, queued by
+        job priority and then by the segment class being translated; the
+        latency is measured from when the slot was granted.
+        
+        Args:
+            route_name: Route to send the request on
+            request: Keyword arguments for chat.completions.create (without model)
+            on_text: Optional callback receiving streamed content deltas
+            on_start: Optional callback run once the slot is granted, when
+                the latency measurement starts
             
         Returns:
-            List of translated text strings in the same order
+            Tuple of (content, finish_time)
         """
-        if not texts:
-            return []
+        route = self.routes[route_name]
+        priority = (JOB_PRIORITIES[self.priority], SEGMENT_CLASSES.index(self._segment_class or SEGMENT_CLASSES[0]))
+        with get_route_budget(route_name, route).slot(priority):
+            start_time = time.monotonic()
+            if on_start:
+                on_start()
+            response = self.client.chat.completions.create(model=route["model"], **request)
+            
+            if request.get("stream"):
+                parts = []
+                usage = None
+                for chunk in response:
+                    if getattr(chunk, "usage", None) is not None:
+                        usage = chunk.usage
+                    if not chunk.choices:
+                        continue
+                    delta = chunk.choices[0].delta.content
+                    if delta:
+                        parts.append(delta)
+                        if on_text:
+                            on_text(delta)
+                content = "".join(parts)
+            else:
+                usage = response.usage
+                content = response.choices[0].message.content or ""
+            finish_time = time.monotonic()
+        
+        self._record_usage(route_name, usage)
+        with self._stats_lock:
+            self._latencies[route_name].append(finish_time - start_time)
+        return content, finish_time
+    
+    def _hedge_threshold(self, route_name: str):
+        """
+        Get the latency after which a request is hedged (p95 so far, plus
+        HEDGE_THRESHOLD_MARGIN).
         
-        # Filter out empty texts but remember their positions
-        text_map = {}
-        non_empty_texts = []
-        for idx, text in enumerate(texts):
-            if text and text.strip():
-                text_map[len(non_empty_texts)] = idx
-                non_empty_texts.append(text)
+        Args:
+            route_name: Route whose latency samples to use
+            
+        Returns:
+            Threshold in seconds, or None until enough samples are collected
+        """
+        with self._stats_lock:
+            latencies = self._latencies[route_name]
+            if len(latencies) < HEDGE_MIN_SAMPLES:
+                return None
+            samples = sorted(latencies)
+        return samples[min(len(samples) - 1, int(len(samples) * 0.95))] * HEDGE_THRESHOLD_MARGIN
+    
+    def _hedge_allowed(self) -> bool:
+        """Check the hedge rate cap so duplicate requests keep cost bounded"""
+        with self._stats_lock:
+            return self.stats["hedged_requests"] + 1 <= self.hedge_max_rate * self._requests_started
+    
+    def _create_completion(self, route_name: str, on_item=None, **request) -> str:
+        """
+        Create a chat completion, hedging it if it runs unusually long.
         
-        if not non_empty_texts:
-            return texts
+        With hedging enabled, a request that has not returned 10% past the
+        p95 latency seen so far gets a duplicate. The hedge clock starts when the
+        request gets its route budget slot (after any queueing and rate-limit
+        spacing), like the latency samples it is compared against. The first
+        successful response wins; the other is cancelled if it has not
+        started, otherwise its result is discarded (its usage is still
+        counted, since it is billed).
+        
+        When `on_item` is given the request is streamed and every top-level
+        JSON array item is passed to `on_item(position, item)` as soon as it
+        is complete. Each position is delivered once, even when a hedged
+        duplicate streams the same items.
+        
+        Args:
+            route_name: Route to send the request on (selects model and budget)
+            on_item: Optional callback for incrementally parsed array items
+            **request: Keyword arguments for chat.completions.create (without model)
+            
+        Returns:
+            Response content
+        """
+        with self._stats_lock:
+            self._requests_started += 1
+        
+        delivered = set()
+        delivery_lock = threading.Lock()
+        
+        def attempt(on_start=None):
+            on_text = None
+            if on_item is not None:
+                parser = IncrementalArrayParser()
+                
+                def on_text(delta):
+                    for position, item in parser.feed(delta):
+                        with delivery_lock:
+                            if position in delivered:
+                                continue
+                            delivered.add(position)
+                        on_item(position, item)
+            return self._timed_completion(route_name, request, on_text, on_start)
+        
+        threshold = self._hedge_threshold(route_name) if self.hedge_requests else None
+        if threshold is None:
+            content, _ = attempt()
+            return content
+        
+        executor = get_hedge_executor()
+        started = threading.Event()
+        primary_start = []
+        
+        def on_primary_start():
+            primary_start.append(time.monotonic())
+            started.set()
+        
+        primary = executor.submit(attempt, on_primary_start)
+        # A primary that fails before getting its slot must not leave us waiting
+        primary.add_done_callback(lambda _: started.set())
+        started.wait()
+        deadline = primary_start[0] + threshold if primary_start else time.monotonic()
+        done, _ = wait([primary], timeout=max(0.0, deadline - time.monotonic()))
+        if done or not self._hedge_allowed():
+            return primary.result()[0]
+        
+        with self._stats_lock:
+            self.stats["hedged_requests"] += 1
+        hedge = executor.submit(attempt)
+        
+        # Take the first successful response; fall back to the other on error
+        pending = {primary, hedge}
+        error = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is not None:
+                    error = future.exception()
+                    continue
+                
+                content, finish_time = future.result()
+                loser = hedge if future is primary else primary
+                if not loser.cancel() and future is hedge:
+                    # Latency saved = how much later the primary would have answered
+                    def record_saved(primary_future, hedge_finish=finish_time):
+                        if primary_future.exception() is None:
+                            saved = primary_future.result()[1] - hedge_finish
+                            with self._stats_lock:
+                                self.stats["hedge_latency_saved_s"] += max(0.0, saved)
+                    loser.add_done_callback(record_saved)
+                if future is hedge:
+                    with self._stats_lock:
+                        self.stats["hedge_wins"] += 1
+                return content
+        
+        raise error
+    
+    def _update_prompt_version(self):
+        """Fingerprint the batch prompt (static part, deck summary, glossary) for coalescing keys"""
+        prompt_fingerprint = json.dumps(self.build_batch_messages([""]))
+        if self.glossary is not None:
+            prompt_fingerprint += self.glossary.digest
+        self.prompt_version = hashlib.sha1(prompt_fingerprint.encode("utf-8")).hexdigest()[:12]
+    
+    def summarize_deck(self, slides: List[Dict]) -> Dict:
+        """
+        Summarize a deck's domain, tone and key terms from its slide titles.
+        
+        One request on the fast route; the summary is used as shared context
+        for every batch of the deck.
+        
+        Args:
+            slides: Extracted slides
+            
+        Returns:
+            Dictionary with "domain", "tone" and "key_terms", or None if the
+            deck has no titles or the summary could not be parsed
+        """
+        titles = []
+        for slide in slides:
+            for element in slide.get("elements", []):
+                if element_segment_class(element) != "titles":
+                    continue
+                for text in element_texts(element):
+                    if isinstance(text, str) and text.strip() and text.strip() not in titles:
+                        titles.append(text.strip())
+        titles = titles[:DECK_SUMMARY_MAX_TITLES]
+        if not titles:
+            return None
+        
+        try:
+            response_text = self._create_completion(
+                "fast",
+                messages=[
+                    {"role": "system", "content": DECK_SUMMARY_SYSTEM_PROMPT},
+                    {"role": "user", "content": json.dumps(titles, ensure_ascii=False)}
+                ],
+                temperature=0,
+                max_tokens=300
+            )
+            start_idx = response_text.find("{")
+            end_idx = response_text.rfind("}")
+            summary = json.loads(response_text[start_idx:end_idx + 1])
+        except CassetteMiss:
+            raise
+        except Exception as e:
+            print(f"Deck summary failed, translating without it: {e}")
+            return None
+        
+        key_terms = summary.get("key_terms")
+        if not isinstance(key_terms, list):
+            key_terms = []
+        return {
+            "domain": str(summary.get("domain") or "").strip(),
+            "tone": str(summary.get("tone") or "").strip(),
+            "key_terms": [str(term).strip() for term in key_terms if str(term).strip()][:DECK_SUMMARY_MAX_TERMS]
+        }
+    
+    def set_deck_context(self, summary: Dict = None):
+        """
+        Set (or clear) the deck summary added to every batch prompt.
+        
+        The summary is rendered once, so every batch of the deck carries the
+        same bytes after the static instructions.
+        
+        Args:
+            summary: Result of summarize_deck, or None to clear it
+        """
+        self.deck_context = summary
+        lines = []
+        if summary:
+            if summary.get("domain"):
+                lines.append(f"Domain: {summary['domain']}")
+            if summary.get("tone"):
+                lines.append(f"Tone: {summary['tone']}")
+            if summary.get("key_terms"):
+                lines.append(f"Key terms (translate consistently): {', '.join(summary['key_terms'])}")
+        self._deck_prompt = ("\nDeck context:\n" + "\n".join(lines)) if lines else ""
+        self._update_prompt_version()
+    
+    def glossary_instructions(self, texts: List[str]) -> str:
+        """
+        Build the glossary section for a batch prompt.
+        
+        Only entries whose terms occur in the batch are included, so prompt
+        size grows with the terms a batch uses, not with the glossary.
+        
+        Args:
+            texts: Source texts in the batch
+            
+        Returns:
+            Text to append to the system prompt ("" if no entries apply)
+        """
+        if self.glossary is None:
+            return ""
+        entries = self.glossary.entries_for(texts)
+        if not entries:
+            return ""
+        with self._stats_lock:
+            self.stats["glossary_terms_sent"] += len(entries)
+        lines = [f"{term} = {target}" for term, target in entries]
+        return ("\nGlossary (always translate these terms exactly as given; "
+                "terms mapped to themselves stay untranslated):\n" + "\n".join(lines))
+    
+    def build_batch_messages(self, texts: List[str]) -> List[Dict]:
+        """
+        Build the chat messages for a batch in the configured wire format.
         
-        # Use JSON format for more reliable parsing
-        texts_json = []
-        for idx, text in enumerate(non_empty_texts):
-            texts_json.append({
-                "id": idx,
-                "text": text
-            })
+        The compact format sends a bare JSON array of strings and keeps all
+        instructions in a static system prompt placed first, followed by the
+        deck summary (identical for every batch of a deck), so the identical
+        prefix can be served from the provider's prompt cache. Glossary
+        entries found in the batch are appended after the static part.
         
-        import json as json_module
-        batch_json = json_module.dumps(texts_json, ensure_ascii=False)
+        Args:
+            texts: Non-empty text strings to translate
+            
+        Returns:
+            List of chat message dictionaries
+        """
+        if self.prompt_format == "compact":
+            return [
+                {"role": "system", "content": f"{BATCH_SYSTEM_PROMPT}\nTarget language: {self.target_language}"
+                                              f"{self._deck_prompt}{self.glossary_instructions(texts)}"},
+                {"role": "user", "content": json.dumps(texts, ensure_ascii=False)}
+            ]
+        
+        # Legacy format: [{"id": 0, "text": "..."}, ...] wrapped in a rules prompt
+        texts_json = [{"id": idx, "text": text} for idx, text in enumerate(texts)]
+        batch_json = json.dumps(texts_json, ensure_ascii=False)
         
         prompt = f"""Translate the texts in the following JSON array to {self.target_language}.
 
@@ -702,92 +1543,456 @@ Input JSON:
 
 Output (JSON array only):"""
 
-        try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": f"You are a professional translator. Return only valid JSON. Translate to {self.target_language}."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.3,
-                max_tokens=4096
-            )
+        return [
+            {"role": "system", "content": f"You are a professional translator. Return only valid JSON. Translate to {self.target_language}."
+                                          f"{self._deck_prompt}{self.glossary_instructions(texts)}"},
+            {"role": "user", "content": prompt}
+        ]
+    
+    def build_edit_messages(self, texts: List[str], matches: List[Dict]) -> List[Dict]:
+        """
+        Build the chat messages asking the model to edit fuzzy memory matches.
+        
+        Args:
+            texts: New source texts
+            matches: Translation memory match (source, target) for each text
             
-            # Update statistics
-            self.stats["api_calls"] += 1
-            self.stats["input_tokens"] += response.usage.prompt_tokens
-            self.stats["output_tokens"] += response.usage.completion_tokens
-            self.stats["total_tokens_used"] += response.usage.total_tokens
+        Returns:
+            List of chat message dictionaries (the reply is a compact JSON array)
+        """
+        triples = [[text, match["source"], match["target"]] for text, match in zip(texts, matches)]
+        return [
+            {"role": "system", "content": f"{TM_EDIT_SYSTEM_PROMPT}\nTarget language: {self.target_language}"
+                                          f"{self._deck_prompt}{self.glossary_instructions(texts)}"},
+            {"role": "user", "content": json.dumps(triples, ensure_ascii=False)}
+        ]
+    
+    def parse_batch_response(self, response_text: str, texts: List[str], prompt_format: str = None) -> List[str]:
+        """
+        Parse a batch response in the configured wire format.
+        
+        Args:
+            response_text: Raw model output
+            texts: The non-empty texts that were sent
+            prompt_format: Wire format of the request (default: the configured one)
             
-            # Calculate cost
-            cost = (response.usage.prompt_tokens * self.input_token_price + 
-                   response.usage.completion_tokens * self.output_token_price)
-            self.stats["total_cost_usd"] += cost
+        Returns:
+            Translated texts aligned with `texts`, or None if the response
+            cannot be aligned with the input
             
-            # Parse response
-            response_text = response.choices[0].message.content.strip()
+        Raises:
+            json.JSONDecodeError: If no JSON array can be parsed
+        """
+        translated_json = parse_json_array(response_text)
+        
+        if (prompt_format or self.prompt_format) == "compact":
+            if not isinstance(translated_json, list) or len(translated_json) != len(texts):
+                return None
+            return [item if isinstance(item, str) else str(item) for item in translated_json]
+        
+        # Verify structure
+        if not isinstance(translated_json, list) or len(translated_json) != len(texts):
+            if isinstance(translated_json, list) and all(isinstance(item, dict) and 'id' in item for item in translated_json):
+                translated_json = sorted(translated_json, key=lambda x: x.get('id', 0))
+                return [item.get('text', texts[i]) for i, item in enumerate(translated_json[:len(texts)])]
+            return None
+        
+        translated_json = sorted(translated_json, key=lambda x: x.get('id', 0))
+        return [item.get('text', '') for item in translated_json]
+    
+    def _batch_item(self, position: int, item, count: int, prompt_format: str = None):
+        """
+        Map a streamed array item to its batch index and translated text.
+        
+        Args:
+            position: Position of the item in the response array
+            item: Parsed item (a string, or an {"id", "text"} object in the legacy format)
+            count: Number of texts in the batch
+            prompt_format: Wire format of the request (default: the configured one)
             
-            # Extract JSON from response (handle markdown code blocks and extra text)
-            if "```json" in response_text:
-                response_text = response_text.split("```json")[1].split("```")[0].strip()
-            elif "```" in response_text:
-                response_text = response_text.split("```")[1].split("```")[0].strip()
+        Returns:
+            Tuple of (index, text), or (None, None) if the item is unusable
+        """
+        if (prompt_format or self.prompt_format) == "compact":
+            index, text = position, item
+        elif isinstance(item, dict):
+            index, text = item.get("id"), item.get("text")
+        else:
+            return None, None
+        
+        if not isinstance(index, int) or not 0 <= index < count or text is None:
+            return None, None
+        return index, text if isinstance(text, str) else str(text)
+    
+    def _segment_done(self, source_text: str, translated_text: str):
+        """
+        Report a finished segment to the segment and progress callbacks.
+        
+        Args:
+            source_text: Original text
+            translated_text: Translated text
+        """
+        self._segments_done += 1
+        if self.glossary is not None and self.glossary.violations(source_text, translated_text):
+            with self._stats_lock:
+                self.stats["glossary_violations"] += 1
+        if self.segment_callback:
+            self.segment_callback(source_text, translated_text)
+        if self._progress_callback:
+            self._progress_callback(self._segments_done, self._segments_total)
+    
+    def _remember(self, pairs):
+        """
+        Store new translations in the translation memory (if one is configured).
+        
+        Args:
+            pairs: Iterable of (source_text, translated_text) tuples
+        """
+        if self.translation_memory is not None:
+            self.translation_memory.add_many(pairs, self.target_language)
+    
+    def _lookup_previous(self, texts: List[str], indexes: List[int], translated: Dict[int, str]) -> List[int]:
+        """
+        Resolve batch texts from the previous version of the deck (incremental mode).
+        
+        Args:
+            texts: Non-empty texts in the batch
+            indexes: Indexes of `texts` still to resolve
+            translated: Dictionary of index -> translation, filled in place
             
-            # Try to find JSON array boundaries
-            if not response_text.startswith('['):
-                start_idx = response_text.find('[')
-                if start_idx != -1:
-                    response_text = response_text[start_idx:]
+        Returns:
+            Indexes still to translate
+        """
+        fresh = []
+        for idx in indexes:
+            previous = self._reuse.get(texts[idx])
+            if previous is None:
+                fresh.append(idx)
+                continue
+            translated[idx] = previous
+            self.stats["reused_segments"] += 1
+            self.stats["total_texts_translated"] += 1
+            self._segment_done(texts[idx], previous)
+        return fresh
+    
+    def _lookup_passthrough(self, texts: List[str], indexes: List[int], translated: Dict[int, str]) -> List[int]:
+        """
+        Keep texts detected as already being in the target language.
+        
+        Args:
+            texts: Non-empty texts in the batch
+            indexes: Indexes of `texts` still to resolve
+            translated: Dictionary of index -> translation, filled in place
             
-            if not response_text.endswith(']'):
-                end_idx = response_text.rfind(']')
-                if end_idx != -1:
-                    response_text = response_text[:end_idx + 1]
+        Returns:
+            Indexes still to translate
+        """
+        fresh = []
+        for idx in indexes:
+            if texts[idx] not in self._passthrough:
+                fresh.append(idx)
+                continue
+            translated[idx] = texts[idx]
+            self.stats["passthrough_segments"] += 1
+            self._segment_done(texts[idx], texts[idx])
+        return fresh
+    
+    def detect_target_language_segments(self, slides: List[Dict]) -> set:
+        """
+        Find the segments of a deck that are already in the target language.
+        
+        All distinct segments are scored in one vectorized pass.
+        
+        Args:
+            slides: List of slide dictionaries
             
-            # Parse JSON
-            try:
-                translated_json = json_module.loads(response_text)
-            except json_module.JSONDecodeError:
-                import re
-                match = re.search(r'\[.*\]', response_text, re.DOTALL)
-                if match:
-                    response_text = match.group(0)
-                    translated_json = json_module.loads(response_text)
-                else:
-                    raise
+        Returns:
+            Set of segment texts to keep as they are
+        """
+        texts = set()
+        for slide in slides:
+            for element in slide.get("elements", []):
+                texts.update(element_texts(element))
+            texts.add((slide.get("speaker_notes") or {}).get("text"))
+            for smartart in slide.get("smartart") or []:
+                texts.update(smartart_texts(smartart))
+        texts = [text for text in texts if isinstance(text, str) and text.strip()]
+        confidence = language_confidence(texts, self.target_language)
+        return {text for text, score in zip(texts, confidence) if score >= self.language_threshold}
+    
+    def _reusable(self, text: str, match: Dict) -> bool:
+        """Check whether a memory match can be reused without calling the API"""
+        if match["source"] == text or normalize_spacing(match["source"]) == normalize_spacing(text):
+            return True
+        return self.tm_reuse_threshold < 1.0 and match["similarity"] >= self.tm_reuse_threshold
+    
+    def _lookup_translation_memory(self, texts: List[str], indexes: List[int], translated: Dict[int, str]):
+        """
+        Resolve batch texts from the translation memory.
+        
+        Reusable matches (see _reusable) are filled into `translated`
+        directly; other fuzzy matches are returned as edit candidates.
+        
+        Args:
+            texts: Non-empty texts in the batch
+            indexes: Indexes of `texts` still to resolve
+            translated: Dictionary of index -> translation, filled in place
             
-            # Verify structure
-            if not isinstance(translated_json, list) or len(translated_json) != len(non_empty_texts):
-                if isinstance(translated_json, list) and all(isinstance(item, dict) and 'id' in item for item in translated_json):
-                    translated_json = sorted(translated_json, key=lambda x: x.get('id', 0))
-                    translated_texts = [item.get('text', non_empty_texts[i]) for i, item in enumerate(translated_json[:len(non_empty_texts)])]
-                else:
-                    return texts
+        Returns:
+            Tuple of (indexes still to translate, list of (index, match) to edit)
+        """
+        fresh = []
+        edits = []
+        for idx in indexes:
+            text = texts[idx]
+            match = self.translation_memory.search(text, self.target_language, self.tm_fuzzy_threshold)
+            if match is None:
+                fresh.append(idx)
+            elif self._reusable(text, match):
+                target = match["target"]
+                exact = match["source"] == text
+                if not exact:
+                    # Close enough to reuse: keep this run's leading/trailing whitespace
+                    target = match_spacing(text, target)
+                translated[idx] = target
+                with self._stats_lock:
+                    self.stats["tm_exact_hits" if exact else "tm_fuzzy_hits"] += 1
+                    self.stats["total_texts_translated"] += 1
+                self._segment_done(text, target)
             else:
-                translated_json = sorted(translated_json, key=lambda x: x.get('id', 0))
-                translated_texts = [item.get('text', '') for item in translated_json]
-            
-            # Reconstruct full list with empty texts in original positions
-            result = texts.copy()
-            for new_idx, orig_idx in text_map.items():
-                if new_idx < len(translated_texts):
-                    result[orig_idx] = translated_texts[new_idx]
-            
-            self.stats["total_texts_translated"] += len(non_empty_texts)
-            return result
+                edits.append((idx, match))
+        return fresh, edits
+    
+    def _request_batch(self, texts: List[str], kind: str, messages: List[Dict], prompt_format: str,
+                       route_name: str = None, remember: bool = True) -> Dict[int, str]:
+        """
+        Send one batch request and collect the translations it yields.
+        
+        With streaming enabled, array items are collected as they arrive, so a
+        request that fails or a stream that is cut short still yields the
+        segments parsed before the cut. A complete reply that cannot be aligned
+        with the batch (wrong number of items) yields nothing: its items may
+        belong to other segments. Segments are reported to the callbacks and
+        stored in the translation memory only once the reply has been checked.
+        
+        Args:
+            texts: Non-empty texts in the batch
+            kind: Segment kind used for routing
+            messages: Chat messages for the request
+            prompt_format: Wire format of the reply ("compact" or "json")
+            route_name: Route to send the request on (default: select_route)
+            remember: Store the translations in the translation memory (QA
+                retries store only the ones they keep)
             
-        except json_module.JSONDecodeError:
-            return self.translate_one_by_one(texts)
+        Returns:
+            Dictionary of index -> translated text for every segment received
+            (partial or empty if the request failed)
+        """
+        streamed = {}
+        
+        def on_item(position, item):
+            index, text = self._batch_item(position, item, len(texts), prompt_format)
+            if index is None or index in streamed:
+                return
+            streamed[index] = text
+        
+        route_name = route_name or self.select_route(texts, kind)
+        request = {
+            "messages": messages,
+            "temperature": 0.3,
+            "max_tokens": 4096
+        }
+        if self.stream:
+            request["stream"] = True
+            request["stream_options"] = {"include_usage": True}
+        
+        complete = False
+        try:
+            response_text = self._create_completion(route_name, on_item=on_item if self.stream else None, **request)
+            translated_texts = self.parse_batch_response(response_text.strip(), texts, prompt_format)
+            complete = True
+        except json.JSONDecodeError:
+            # Truncated reply (e.g. max_tokens reached mid-array)
+            translated_texts = None
+        except CassetteMiss:
+            # A replay that drifted from its recording must fail, not fall back
+            raise
         except Exception as e:
             print(f"Translation error: {e}")
-            return self.translate_one_by_one(texts)
+            translated_texts = None
+        
+        if translated_texts is not None:
+            results = dict(enumerate(translated_texts))
+        elif complete:
+            # Whole reply with the wrong item count: positions cannot be trusted
+            results = {}
+        else:
+            # Failed or cut off: keep what was parsed before the cut
+            results = streamed
+        
+        for idx, text in results.items():
+            self._segment_done(texts[idx], text)
+        self.stats["total_texts_translated"] += len(results)
+        if remember:
+            self._remember((texts[idx], text) for idx, text in results.items())
+        return results
+    
+    def _request_coalesced(self, texts: List[str], kind: str) -> Dict[int, str]:
+        """
+        Translate a batch, sharing identical in-flight segments with other jobs.
+        
+        Each segment is claimed in the process-wide in-flight registry under
+        (text with spaces and tabs collapsed, language, model, prompt version). Only segments this
+        translator leads are sent; the rest wait for the leading job's result.
+        Leaders are resolved before any follower waits, so jobs (or duplicate
+        segments within one batch) never wait on each other in a cycle.
+        
+        Args:
+            texts: Non-empty texts in the batch
+            kind: Segment kind used for routing
+            
+        Returns:
+            Dictionary of index -> translated text (segments whose leader
+            failed are missing and left to the caller's retry path)
+        """
+        registry = get_in_flight_registry()
+        route_name = self.select_route(texts, kind)
+        model = self.routes[route_name]["model"]
+        
+        claims = []
+        for text in texts:
+            # Line breaks are kept in the key: match_spacing only fixes the ends
+            key = (normalize_spacing(text), self.target_language, model, self.prompt_version)
+            flight, leader = registry.claim(key)
+            claims.append((key, flight, leader))
+        
+        leaders = [idx for idx, (_, _, leader) in enumerate(claims) if leader]
+        results = {}
+        try:
+            if leaders:
+                leader_texts = [texts[idx] for idx in leaders]
+                sent = self._request_batch(leader_texts, kind, self.build_batch_messages(leader_texts),
+                                           self.prompt_format, route_name)
+                for position, text in sent.items():
+                    results[leaders[position]] = text
+        finally:
+            for idx in leaders:
+                key, flight, _ = claims[idx]
+                registry.resolve(key, flight, (texts[idx], results[idx]) if idx in results else None)
+        
+        for idx, (_, flight, leader) in enumerate(claims):
+            if leader:
+                continue
+            shared = flight.wait()
+            if shared is None:
+                continue
+            source, translation = shared
+            if source != texts[idx]:
+                translation = match_spacing(texts[idx], translation)
+            results[idx] = translation
+            with self._stats_lock:
+                self.stats["coalesced_segments"] += 1
+                self.stats["total_texts_translated"] += 1
+            self._segment_done(texts[idx], translation)
+        
+        return results
     
-    def translate_one_by_one(self, texts: List[str]) -> List[str]:
+    def translate_batch(self, texts: List[str], kind: str = "body") -> List[str]:
+        """
+        Translate a batch of texts on the route chosen by select_route.
+        
+        In incremental mode, segments whose source is unchanged since the
+        previous deck version reuse the previous translation. Segments
+        detected as already being in the target language are kept. With a
+        translation memory configured, close matches are reused without
+        an API call, and fuzzy matches are sent as a separate request asking the
+        model to edit the previous translation. Segments already being
+        translated by another job in the process are awaited rather than sent
+        again. If a streamed request is cut
+        short, the segments parsed before the cut are kept and only the rest
+        are retried; a complete reply with the wrong number of items is
+        discarded and the batch is translated one segment at a time.
+        
+        Args:
+            texts: List of text strings to translate
+            kind: Segment kind used for routing ("body", "label" or "notes")
+            
+        Returns:
+            List of translated text strings in the same order
+        """
+        if not texts:
+            return []
+        
+        # Filter out empty texts but remember their positions
+        text_map = {}
+        non_empty_texts = []
+        for idx, text in enumerate(texts):
+            if text and text.strip():
+                text_map[len(non_empty_texts)] = idx
+                non_empty_texts.append(text)
+        
+        if not non_empty_texts:
+            return texts
+        
+        translated = {}
+        fresh = list(range(len(non_empty_texts)))
+        
+        if self._reuse:
+            fresh = self._lookup_previous(non_empty_texts, fresh, translated)
+        
+        if self._passthrough:
+            fresh = self._lookup_passthrough(non_empty_texts, fresh, translated)
+        
+        if self.translation_memory is not None and fresh:
+            fresh, edits = self._lookup_translation_memory(non_empty_texts, fresh, translated)
+            if edits:
+                edit_texts = [non_empty_texts[idx] for idx, _ in edits]
+                messages = self.build_edit_messages(edit_texts, [match for _, match in edits])
+                results = self._request_batch(edit_texts, kind, messages, "compact")
+                with self._stats_lock:
+                    self.stats["tm_fuzzy_edits"] += len(results)
+                for position, (idx, _) in enumerate(edits):
+                    if position in results:
+                        translated[idx] = results[position]
+                    else:
+                        fresh.append(idx)
+                fresh.sort()
+        
+        if fresh:
+            fresh_texts = [non_empty_texts[idx] for idx in fresh]
+            if self.coalesce_requests:
+                results = self._request_coalesced(fresh_texts, kind)
+            else:
+                results = self._request_batch(fresh_texts, kind, self.build_batch_messages(fresh_texts), self.prompt_format)
+            
+            missing = [position for position in range(len(fresh_texts)) if position not in results]
+            if missing:
+                missing_texts = [fresh_texts[position] for position in missing]
+                if results:
+                    # Keep what was parsed before the stream broke off; retry only the rest
+                    retried = self.translate_batch(missing_texts, kind)
+                else:
+                    retried = self.translate_one_by_one(missing_texts, kind)
+                results.update(zip(missing, retried))
+            
+            for position, idx in enumerate(fresh):
+                translated[idx] = results[position]
+        
+        # Reconstruct full list with empty texts in original positions
+        result = texts.copy()
+        for new_idx, orig_idx in text_map.items():
+            result[orig_idx] = translated[new_idx]
+        
+        return result
+    
+    def translate_one_by_one(self, texts: List[str], kind: str = "body", remember: bool = True) -> List[str]:
         """
         Fallback method: translate texts one by one.
         
         Args:
             texts: List of text strings to translate
+            kind: Segment kind used for routing each text
+            remember: Store the translations in the translation memory
             
         Returns:
             List of translated text strings
@@ -799,42 +2004,41 @@ Output (JSON array only):"""
                 continue
             
             try:
-                response = self.client.chat.completions.create(
-                    model=self.model,
+                response_text = self._create_completion(
+                    self.select_route([text], kind),
                     messages=[
-                        {"role": "system", "content": f"You are a professional translator. Translate to {self.target_language}. Return ONLY the translated text, nothing else."},
+                        {"role": "system", "content": f"You are a professional translator. Translate to {self.target_language}. Return ONLY the translated text, nothing else."
+                                                      f"{self._deck_prompt}{self.glossary_instructions([text])}"},
                         {"role": "user", "content": f"Translate this to {self.target_language}:\n\n{text}"}
                     ],
                     temperature=0.3,
                     max_tokens=2048
                 )
                 
-                self.stats["api_calls"] += 1
-                self.stats["input_tokens"] += response.usage.prompt_tokens
-                self.stats["output_tokens"] += response.usage.completion_tokens
-                self.stats["total_tokens_used"] += response.usage.total_tokens
                 self.stats["total_texts_translated"] += 1
                 
-                # Calculate cost
-                cost = (response.usage.prompt_tokens * self.input_token_price + 
-                       response.usage.completion_tokens * self.output_token_price)
-                self.stats["total_cost_usd"] += cost
-                
-                translated_text = response.choices[0].message.content.strip()
+                translated_text = response_text.strip()
                 translated.append(translated_text)
+                if remember:
+                    self._remember([(text, translated_text)])
                 
+            except CassetteMiss:
+                raise
             except Exception as e:
                 print(f"Error translating individual text: {e}")
                 translated.append(text)
+            
+            self._segment_done(text, translated[-1])
         
         return translated
     
-    def translate_text_runs(self, runs: List[Dict]) -> List[Dict]:
+    def translate_text_runs(self, runs: List[Dict], kind: str = "body") -> List[Dict]:
         """
         Translate text runs while preserving all formatting metadata.
         
         Args:
             runs: List of run dictionaries containing text and formatting
+            kind: Segment kind used for routing
             
         Returns:
             List of run dictionaries with translated text
@@ -846,7 +2050,7 @@ Output (JSON array only):"""
         texts = [run.get("text", "") for run in runs]
         
         # Translate
-        translated_texts = self.translate_batch(texts)
+        translated_texts = self.translate_batch(texts, kind)
         
         # Create new runs with translated text but original metadata
         translated_runs = []
@@ -964,45 +2168,45 @@ Output (JSON array only):"""
         
         # Translate chart title
         if "title" in new_chart and new_chart["title"]:
-            translated = self.translate_batch([new_chart["title"]])
+            translated = self.translate_batch([new_chart["title"]], kind="label")
             new_chart["title"] = translated[0]
         
         # Translate axis titles
         if "axis_titles" in new_chart and new_chart["axis_titles"]:
             for axis_type, title in new_chart["axis_titles"].items():
                 if title:
-                    translated = self.translate_batch([title])
+                    translated = self.translate_batch([title], kind="label")
                     new_chart["axis_titles"][axis_type] = translated[0]
         
         # Translate legend entries
         if "legend_entries" in new_chart and new_chart["legend_entries"]:
-            new_chart["legend_entries"] = self.translate_batch(new_chart["legend_entries"])
+            new_chart["legend_entries"] = self.translate_batch(new_chart["legend_entries"], kind="label")
         
         # Translate series names in data_values and data labels
         if "data_values" in new_chart and new_chart["data_values"]:
             for series in new_chart["data_values"]:
                 # Translate series name
                 if series.get("series_name"):
-                    translated = self.translate_batch([series["series_name"]])
+                    translated = self.translate_batch([series["series_name"]], kind="label")
                     series["series_name"] = translated[0]
                 
                 # Translate data labels
                 if "data_labels" in series and series["data_labels"]:
                     for label in series["data_labels"]:
                         if "text" in label and label["text"]:
-                            translated = self.translate_batch([label["text"]])
+                            translated = self.translate_batch([label["text"]], kind="label")
                             label["text"] = translated[0]
         
         # Translate series_names list
         if "series_names" in new_chart and new_chart["series_names"]:
-            new_chart["series_names"] = self.translate_batch(new_chart["series_names"])
+            new_chart["series_names"] = self.translate_batch(new_chart["series_names"], kind="label")
         
         # Translate categories if they are text (not numbers)
         if "categories" in new_chart and new_chart["categories"]:
             # Check if categories are text (strings)
             text_categories = [cat for cat in new_chart["categories"] if isinstance(cat, str)]
             if text_categories:
-                translated_cats = self.translate_batch(new_chart["categories"])
+                translated_cats = self.translate_batch(new_chart["categories"], kind="label")
                 new_chart["categories"] = translated_cats
         
         return new_chart
@@ -1021,13 +2225,13 @@ Output (JSON array only):"""
         
         # Translate texts list
         if "texts" in new_smartart and new_smartart["texts"]:
-            new_smartart["texts"] = self.translate_batch(new_smartart["texts"])
+            new_smartart["texts"] = self.translate_batch(new_smartart["texts"], kind="label")
         
         # Translate node texts
         if "nodes" in new_smartart and new_smartart["nodes"]:
             node_texts = [node.get("text", "") for node in new_smartart["nodes"]]
             if node_texts:
-                translated_node_texts = self.translate_batch(node_texts)
+                translated_node_texts = self.translate_batch(node_texts, kind="label")
                 for idx, node in enumerate(new_smartart["nodes"]):
                     if node.get("text"):
                         node["text"] = translated_node_texts[idx]
@@ -1051,12 +2255,13 @@ Output (JSON array only):"""
         new_notes = deepcopy(notes)
         
         if "text" in new_notes and new_notes["text"]:
-            translated = self.translate_batch([new_notes["text"]])
+            translated = self.translate_batch([new_notes["text"]], kind="notes")
             new_notes["text"] = translated[0]
         
         return new_notes
     
-    def translate_slide(self, slide: Dict, slide_num: int) -> Dict:
+    def translate_slide(self, slide: Dict, slide_num: int, segment_classes: List[str] = None,
+                        in_place: bool = False) -> Dict:
         """
         Translate a single slide while preserving all metadata including:
         - layout_info (NEW)
@@ -1067,17 +2272,23 @@ Output (JSON array only):"""
         Args:
             slide: Slide dictionary
             slide_num: Slide number for progress reporting
+            segment_classes: Only translate content of these SEGMENT_CLASSES
+                (None = everything); other content is copied unchanged
+            in_place: Update `slide` itself instead of a deep copy (for
+                callers that already own a copy, e.g. one per scheduler pass)
             
         Returns:
             Slide dictionary with translated content
         """
-        print(f"Translating slide {slide_num}...", end=" ", flush=True)
-        
-        # Small delay to avoid rate limits
-        if slide_num > 1:
-            time.sleep(0.2)
+        if segment_classes is None:
+            segment_classes = SEGMENT_CLASSES
+            print(f"Translating slide {slide_num}...", end=" ", flush=True)
+            
+            # Small delay to avoid rate limits
+            if slide_num > 1:
+                time.sleep(0.2)
         
-        new_slide = deepcopy(slide)
+        new_slide = slide if in_place else deepcopy(slide)
         
         # Preserve layout_info, background - these don't need translation
         # They are already in new_slide via deepcopy
@@ -1088,6 +2299,11 @@ Output (JSON array only):"""
             for element in new_slide["elements"]:
                 element_type = element.get("element_type")
                 
+                # Left for a later scheduler pass
+                if element_segment_class(element) not in segment_classes:
+                    translated_elements.append(element)
+                    continue
+                
                 # Handle different element types
                 if element_type == "Table":
                     # Table has table_data field
@@ -1106,17 +2322,17 @@ Output (JSON array only):"""
                     translated_elements.append(self.translate_text_element(element))
                     
                 else:
-                    # Picture, Other types - preserve as is
-                    translated_elements.append(deepcopy(element))
+                    # Picture, Other types - preserve as is (new_slide is already a copy)
+                    translated_elements.append(element)
             
             new_slide["elements"] = translated_elements
         
         # Translate speaker notes
-        if "speaker_notes" in new_slide and new_slide["speaker_notes"]:
+        if "notes" in segment_classes and "speaker_notes" in new_slide and new_slide["speaker_notes"]:
             new_slide["speaker_notes"] = self.translate_speaker_notes(new_slide["speaker_notes"])
         
-        # Translate SmartArt
-        if "smartart" in new_slide and new_slide["smartart"]:
+        # Translate SmartArt (scheduled with tables and charts)
+        if "tables_charts" in segment_classes and "smartart" in new_slide and new_slide["smartart"]:
             translated_smartart = []
             for smartart in new_slide["smartart"]:
                 translated_smartart.append(self.translate_smartart(smartart))
@@ -1125,10 +2341,120 @@ Output (JSON array only):"""
         # Preserve links as is (URLs don't need translation)
         # Preserve background, layout_info (already done via deepcopy)
         
-        print("✓")
+        if segment_classes is SEGMENT_CLASSES:
+            print("✓")
         return new_slide
     
-    def translate_presentation(self, input_path: str, output_path: str) -> Dict:
+    def count_segments(self, slides: List[Dict]) -> int:
+        """
+        Count the non-empty text segments translate_slide will send.
+        
+        Args:
+            slides: List of slide dictionaries
+            
+        Returns:
+            Number of segments
+        """
+        def non_empty(texts):
+            return sum(1 for text in texts if isinstance(text, str) and text.strip())
+        
+        def paragraph_texts(paragraphs):
+            return [run.get("text", "") for para in paragraphs or [] for run in para.get("runs", [])]
+        
+        count = 0
+        for slide in slides:
+            for element in slide.get("elements", []):
+                element_type = element.get("element_type")
+                if element_type in ["TextBox", "AutoShape"]:
+                    count += non_empty(paragraph_texts(element.get("paragraphs")))
+                elif element_type == "Table" and "table_data" in element:
+                    for cell in element["table_data"].get("cells", []):
+                        count += non_empty(paragraph_texts(cell.get("paragraphs")))
+                elif element_type == "Chart" and "chart_data" in element:
+                    chart = element["chart_data"]
+                    texts = [chart.get("title")]
+                    texts += list((chart.get("axis_titles") or {}).values())
+                    texts += chart.get("legend_entries") or []
+                    for series in chart.get("data_values") or []:
+                        texts.append(series.get("series_name"))
+                        texts += [label.get("text") for label in series.get("data_labels") or []]
+                    texts += chart.get("series_names") or []
+                    texts += chart.get("categories") or []
+                    count += non_empty(texts)
+            
+            if slide.get("speaker_notes"):
+                count += non_empty([slide["speaker_notes"].get("text")])
+            for smartart in slide.get("smartart") or []:
+                count += non_empty(smartart.get("texts") or [])
+                count += non_empty([node.get("text") for node in smartart.get("nodes") or []])
+        return count
+    
+    def run_qa(self, source_slides: List[Dict], translated_slides: List[Dict], report_path: str = None) -> Dict:
+        """
+        Validate a translated deck, re-translate only the failing segments and
+        keep each new translation that fails fewer checks.
+        
+        Args:
+            source_slides: Extracted slides
+            translated_slides: Translated slides, updated in place
+            report_path: Optional path for the JSON QA report
+            
+        Returns:
+            QA report dictionary (summary of the remaining failures, plus every
+            initial failure with its retry outcome)
+        """
+        failures = qa.validate_deck(source_slides, translated_slides, self.target_language)
+        for failure in failures:
+            # Segments kept because they are already in the target language
+            if failure["source"] in self._passthrough and "identical" in failure["issues"]:
+                failure["issues"].remove("identical")
+        failures = [failure for failure in failures if failure["issues"]]
+        self.stats["qa_failed"] = len(failures)
+        
+        if failures:
+            print(f"QA: re-translating {len(failures)} failing segments...")
+        for start in range(0, len(failures), QA_BATCH_SIZE):
+            chunk = failures[start:start + QA_BATCH_SIZE]
+            texts = [failure["source"] for failure in chunk]
+            # Retries reach the translation memory only if they are kept
+            results = self._request_batch(texts, "body", self.build_batch_messages(texts), self.prompt_format,
+                                          remember=False)
+            missing = [idx for idx in range(len(texts)) if idx not in results]
+            if missing:
+                results.update(zip(missing, self.translate_one_by_one([texts[idx] for idx in missing],
+                                                                      remember=False)))
+            retried = [results[idx] for idx in range(len(texts))]
+            
+            accepted = []
+            for failure, text, issues in zip(chunk, retried, qa.validate_pairs(texts, retried, self.target_language)):
+                failure["retry"] = text
+                failure["retry_issues"] = issues
+                if len(issues) < len(failure["issues"]):
+                    qa.set_path(translated_slides, tuple(failure["path"]), text)
+                    qa.refresh_full_text(translated_slides, tuple(failure["path"]))
+                    accepted.append((failure["source"], text))
+                if not issues:
+                    self.stats["qa_fixed"] += 1
+            self._remember(accepted)
+        
+        remaining = [failure for failure in failures if failure.get("retry_issues", failure["issues"])]
+        report = {
+            "summary": qa.summarize(remaining, qa.count_segments(source_slides)),
+            "retranslated": len(failures),
+            "fixed": self.stats["qa_fixed"],
+            "failures": failures
+        }
+        qa.print_summary(report["summary"])
+        if report_path:
+            with open(report_path, 'w', encoding='utf-8') as f:
+                json.dump(report, f, indent=2, ensure_ascii=False)
+            print(f"QA report saved to {report_path}")
+        return report
+    
+    def translate_presentation(self, input_path: str, output_path: str, progress_callback=None,
+                               reuse_maps: List[Dict[str, str]] = None, schedule: str = "priority",
+                               partial_callback=None, write_partial: bool = False,
+                               run_qa: bool = False, qa_report_path: str = None) -> Dict:
         """
         Translate entire presentation while preserving all metadata including:
         - slide_masters (NEW - preserved, not translated)
@@ -1140,13 +2466,30 @@ Output (JSON array only):"""
         Args:
             input_path: Path to input JSON file
             output_path: Path to output JSON file
+            progress_callback: Optional callable(segments_done, segments_total),
+                called every time a segment finishes translating
+            reuse_maps: Optional per-slide {source: previous translation} maps
+                from incremental.build_reuse_maps; matching segments are not
+                sent to the model
+            schedule: "priority" translates every slide's titles, then body
+                text, then tables/charts/SmartArt, then speaker notes, so the
+                visible deck is usable early; "slide" translates slide by slide
+            partial_callback: Optional callable(segment_class, translated_data)
+                called after each priority pass with the partially translated
+                deck (later passes update it in place; copy it to keep a snapshot)
+            write_partial: Also save the partially translated deck to
+                `output_path` after each priority pass (for early preview or
+                reassembly)
+            run_qa: Validate every segment after translating and re-translate
+                the ones that fail (see qa.py)
+            qa_report_path: Where to write the QA report (default: output
+                path with a _qa.json suffix)
             
         Returns:
             Dictionary with translation statistics
         """
         print(f"Loading presentation from {input_path}...")
-        with open(input_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        data = load_extraction(input_path)
         
         print(f"Translating to {self.target_language}...")
         if self.is_rtl:
@@ -1169,19 +2512,74 @@ Output (JSON array only):"""
         if "slide_masters" in data:
             translated_data["slide_masters"] = deepcopy(data["slide_masters"])
         
-        # Translate each slide
+        # Compact extractions keep their style tables (runs carry their text
+        # and a style id, so translation works on them unchanged)
+        if is_compact(data):
+            translated_data["format"] = data["format"]
+            translated_data["styles"] = data["styles"]
+        
+        # Segment-level progress (advances as streamed items arrive)
+        self._progress_callback = progress_callback
+        self._segments_done = 0
+        self._segments_total = self.count_segments(data["slides"])
+        
+        # Segments already in the target language are kept as they are
+        if self.skip_target_language:
+            if supported_language(self.target_language):
+                self._passthrough = self.detect_target_language_segments(data["slides"])
+                print(f"Language check: {len(self._passthrough)} distinct segments already in {self.target_language}")
+            else:
+                print(f"Language check: {self.target_language} cannot be detected offline, skipping")
+        
+        if schedule not in SCHEDULES:
+            raise ValueError(f"Unknown schedule '{schedule}'. Choose from: {', '.join(SCHEDULES)}")
+        
         start_time = time.time()
-        for idx, slide in enumerate(data["slides"], 1):
-            translated_slide = self.translate_slide(slide, idx)
-            translated_data["slides"].append(translated_slide)
         
+        # Shared context for every batch of this deck
+        self.set_deck_context(self.summarize_deck(data["slides"]) if self.deck_summary else None)
+        if self.deck_context:
+            print(f"Deck context: {self.deck_context['domain']} ({self.deck_context['tone']}), "
+                  f"{len(self.deck_context['key_terms'])} key terms")
+        if schedule == "slide":
+            # Translate each slide
+            for idx, slide in enumerate(data["slides"], 1):
+                self._reuse = reuse_maps[idx - 1] if reuse_maps and idx <= len(reuse_maps) else None
+                translated_slide = self.translate_slide(slide, idx)
+                translated_data["slides"].append(translated_slide)
+        else:
+            # One pass over the deck per segment class, most visible first.
+            # Slides are copied once and each pass updates its copy in place
+            translated_data["slides"] = [deepcopy(slide) for slide in data["slides"]]
+            for segment_class in SEGMENT_CLASSES:
+                self._segment_class = segment_class
+                print(f"Translating {segment_class.replace('_', ' and ')}...", end=" ", flush=True)
+                for idx, slide in enumerate(translated_data["slides"], 1):
+                    self._reuse = reuse_maps[idx - 1] if reuse_maps and idx <= len(reuse_maps) else None
+                    self.translate_slide(slide, idx, [segment_class], in_place=True)
+                print("✓")
+                
+                if partial_callback:
+                    partial_callback(segment_class, translated_data)
+                if write_partial and segment_class != SEGMENT_CLASSES[-1]:
+                    save_extraction(translated_data, output_path)
+                    print(f"Partial output ({segment_class} done) saved to {output_path}")
+            self._segment_class = None
+        
+        self._reuse = None
+        self._progress_callback = None
+        
+        if run_qa:
+            print("=" * 80)
+            report_path = qa_report_path or f"{os.path.splitext(output_path)[0]}_qa.json"
+            self.run_qa(data["slides"], translated_data["slides"], report_path)
+        self._passthrough = set()
         elapsed_time = time.time() - start_time
         
         # Save translated data
         print("=" * 80)
         print(f"Saving translated presentation to {output_path}...")
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(translated_data, f, indent=2, ensure_ascii=False)
+        save_extraction(translated_data, output_path)
         
         # Print statistics
         print("\n" + "=" * 80)
@@ -1192,11 +2590,35 @@ Output (JSON array only):"""
             print(f"RTL Mode: ENABLED")
         print(f"Total slides translated: {data['total_slides']}")
         print(f"Total texts translated: {self.stats['total_texts_translated']}")
+        if reuse_maps is not None:
+            print(f"  - Reused from previous version: {self.stats['reused_segments']}")
+        if self.skip_target_language:
+            print(f"  - Already in {self.target_language} (kept): {self.stats['passthrough_segments']}")
+        if self.stats["coalesced_segments"]:
+            print(f"  - Shared with concurrent jobs: {self.stats['coalesced_segments']}")
         print(f"API calls made: {self.stats['api_calls']}")
         print(f"Total tokens used: {self.stats['total_tokens_used']}")
-        print(f"  - Input tokens: {self.stats['input_tokens']:,}")
+        print(f"  - Input tokens: {self.stats['input_tokens']:,} "
+              f"({self.stats['cached_input_tokens']:,} from prompt cache)")
         print(f"  - Output tokens: {self.stats['output_tokens']:,}")
         print(f"Total cost: ${self.stats['total_cost_usd']:.4f} USD")
+        for route_name, route_stats in self.stats["routes"].items():
+            print(f"  - {route_name} ({route_stats['model']}): {route_stats['api_calls']} calls, "
+                  f"{route_stats['input_tokens']:,} in ({route_stats['cached_input_tokens']:,} cached) / "
+                  f"{route_stats['output_tokens']:,} out, "
+                  f"${route_stats['cost_usd']:.4f}")
+        if run_qa:
+            print(f"QA: {self.stats['qa_failed']} segments failed, {self.stats['qa_fixed']} fixed by re-translation")
+        if self.glossary is not None:
+            print(f"Glossary: {self.stats['glossary_terms_sent']} entries sent, "
+                  f"{self.stats['glossary_violations']} segments missing a required term")
+        if self.translation_memory is not None:
+            print(f"Translation memory: {self.stats['tm_exact_hits']} exact, "
+                  f"{self.stats['tm_fuzzy_hits']} reused, {self.stats['tm_fuzzy_edits']} edited from fuzzy matches")
+        if self.hedge_requests:
+            print(f"Hedged requests: {self.stats['hedged_requests']} "
+                  f"(hedge won {self.stats['hedge_wins']}, "
+                  f"latency saved {self.stats['hedge_latency_saved_s']:.2f}s)")
         print(f"Time elapsed: {elapsed_time:.2f} seconds")
         print(f"Output saved to: {output_path}")
         print("=" * 80)
@@ -1213,21 +2635,104 @@ def main():
     parser.add_argument("-o", "--output", help="Output JSON file path (default: input_file with _translated suffix)")
     parser.add_argument("-l", "--language", default="Spanish", help="Target language (default: Spanish)")
     parser.add_argument("-k", "--api-key", help="OpenAI API key (default: from .env)")
+    parser.add_argument("--prompt-format", choices=PROMPT_FORMATS, default="compact",
+                        help="Batch wire format sent to the model (default: compact)")
+    parser.add_argument("--no-stream", action="store_true",
+                        help="Wait for complete responses instead of streaming them")
+    parser.add_argument("--hedge", action="store_true",
+                        help="Hedge requests that run past the p95 latency with a duplicate request")
+    parser.add_argument("--hedge-max-rate", type=float, default=0.1,
+                        help="Maximum fraction of requests that may be hedged (default: 0.1)")
+    parser.add_argument("--strong-model", default=DEFAULT_ROUTES["strong"]["model"],
+                        help=f"Model for long notes and dense paragraphs (default: {DEFAULT_ROUTES['strong']['model']})")
+    parser.add_argument("--strong-min-chars", type=int, default=STRONG_ROUTE_MIN_CHARS,
+                        help=f"Batch size in characters that routes to the strong model (default: {STRONG_ROUTE_MIN_CHARS})")
+    parser.add_argument("--schedule", choices=SCHEDULES, default="priority",
+                        help="Translate titles, body, tables/charts, then notes across the deck (priority), "
+                             "or slide by slide (default: priority)")
+    parser.add_argument("--write-partial", action="store_true",
+                        help="Save the output after each priority pass so it can be previewed or reassembled early")
+    parser.add_argument("--previous-extracted", metavar="JSON",
+                        help="Extraction of the previous deck version (incremental mode)")
+    parser.add_argument("--previous-translated", metavar="JSON",
+                        help="Translation of the previous extraction (incremental mode)")
+    parser.add_argument("--qa", action="store_true",
+                        help="Validate numbers, URLs, line breaks and lengths after translating and re-translate failures")
+    parser.add_argument("--qa-report", metavar="JSON",
+                        help="QA report path (default: output path with a _qa.json suffix)")
+    parser.add_argument("--skip-target-language", action="store_true",
+                        help="Keep segments that are already in the target language (offline detection)")
+    parser.add_argument("--language-threshold", type=float, default=CONFIDENCE_THRESHOLD,
+                        help=f"Detection confidence needed to keep a segment (default: {CONFIDENCE_THRESHOLD})")
+    parser.add_argument("--glossary", metavar="TSV",
+                        help="Glossary of required translations (term<TAB>translation, or term alone to keep it)")
+    parser.add_argument("--tm", nargs="?", const=DEFAULT_TM_PATH, metavar="PATH",
+                        help=f"Use a local translation memory (default path: {DEFAULT_TM_PATH})")
+    parser.add_argument("--tm-fuzzy-threshold", type=float, default=TM_FUZZY_THRESHOLD,
+                        help=f"Similarity for sending a memory match as edit context (default: {TM_FUZZY_THRESHOLD})")
+    parser.add_argument("--tm-reuse-threshold", type=float, default=TM_REUSE_THRESHOLD,
+                        help=f"Similarity for reusing a different source's translation without an API call "
+                             f"(default: {TM_REUSE_THRESHOLD}, only the same text up to spacing)")
+    parser.add_argument("--deck-summary", action="store_true",
+                        help="Summarize the deck from its titles as shared context for every batch "
+                             "(one extra request; no coalescing with other decks' jobs)")
+    cassette_group = parser.add_mutually_exclusive_group()
+    cassette_group.add_argument("--record", metavar="CASSETTE",
+                                help="Record every request and response to a compressed cassette file")
+    cassette_group.add_argument("--replay", metavar="CASSETTE",
+                                help="Serve responses from a recorded cassette instead of the API")
+    parser.add_argument("--replay-latency", type=float, default=0.0, metavar="SCALE",
+                        help="Replay delay as a multiple of the recorded latency (default: 0, no delay)")
     
     args = parser.parse_args()
+    if bool(args.previous_extracted) != bool(args.previous_translated):
+        parser.error("--previous-extracted and --previous-translated must be given together")
     
     # Determine output path
     if args.output:
         output_path = args.output
     else:
-        base_name = args.input_file.replace(".json", "")
-        output_path = f"{base_name}_translated_{args.language.lower()}.json"
+        base_name, extension = os.path.splitext(args.input_file)
+        output_path = f"{base_name}_translated_{args.language.lower()}{extension or '.json'}"
     
     # Create translator
-    translator = PPTTranslator(api_key=args.api_key, target_language=args.language)
+    translation_memory = TranslationMemory(args.tm) if args.tm else None
+    cassette = None
+    if args.record:
+        cassette = Cassette(args.record, mode="record")
+    elif args.replay:
+        cassette = Cassette(args.replay, mode="replay", latency_scale=args.replay_latency)
+    translator = PPTTranslator(api_key=args.api_key, target_language=args.language,
+                               prompt_format=args.prompt_format,
+                               hedge_requests=args.hedge,
+                               hedge_max_rate=args.hedge_max_rate,
+                               stream=not args.no_stream,
+                               strong_model=args.strong_model,
+                               strong_min_chars=args.strong_min_chars,
+                               translation_memory=translation_memory,
+                               tm_fuzzy_threshold=args.tm_fuzzy_threshold,
+                               tm_reuse_threshold=args.tm_reuse_threshold,
+                               glossary=load_glossary(args.glossary) if args.glossary else None,
+                               skip_target_language=args.skip_target_language,
+                               language_threshold=args.language_threshold,
+                               cassette=cassette,
+                               deck_summary=args.deck_summary)
     
     # Translate
-    stats = translator.translate_presentation(args.input_file, output_path)
+    reuse_maps = None
+    if args.previous_extracted:
+        reuse_maps, alignment = load_reuse_maps(args.previous_extracted, args.previous_translated, args.input_file)
+        print(f"Incremental mode: {alignment['slides_aligned']} slides aligned with the previous version "
+              f"({alignment['slides_unchanged']} unchanged), {alignment['elements_aligned']} shapes aligned")
+    stats = translator.translate_presentation(args.input_file, output_path, reuse_maps=reuse_maps,
+                                              schedule=args.schedule, write_partial=args.write_partial,
+                                              run_qa=args.qa, qa_report_path=args.qa_report)
+    if translation_memory is not None:
+        translation_memory.close()
+    if cassette is not None:
+        cassette.close()
+        print(f"Cassette {cassette.path}: {cassette.stats['replayed']} replayed, "
+              f"{cassette.stats['recorded']} recorded, {cassette.stats['misses']} missing")
     
     return stats
 
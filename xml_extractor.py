@@ -0,0 +1,1245 @@
+"""
+Direct XML Extractor
+
+Alternative extraction engine that reads the slide, layout, master and notes
+parts straight from the .pptx zip with lxml and resolves every property with
+precompiled XPath expressions, instead of walking python-pptx shape proxies.
+It emits the same JSON schema as PPTXExtractor.extract_all, including the
+values python-pptx reports for unset properties (inherited placeholder
+geometry, "None" fill types, default text frame insets).
+
+Charts are still read through python-pptx's chart objects, built directly
+from the chart part XML (series values, categories and chart type inference
+are too involved to duplicate, and charts are rare). SmartArt diagrams are
+parsed by PPTXExtractor's code from the data parts their slides reference.
+
+Usage:
+    python xml_extractor.py deck.pptx -o extracted.json
+    
+    # Check the output against PPTXExtractor and compare timings
+    python xml_extractor.py deck.pptx --parity
+    
+    # Check parity on a generated deck covering every element type, for
+    # every extraction profile (exit code 1 on any difference)
+    python xml_extractor.py --self-test
+"""
+
+import json
+import os
+import posixpath
+import time
+import zipfile
+from types import SimpleNamespace
+
+from lxml import etree
+from pptx.chart.chart import Chart
+from pptx.enum.dml import MSO_FILL, MSO_LINE_DASH_STYLE, MSO_PATTERN, MSO_THEME_COLOR
+from pptx.enum.shapes import MSO_SHAPE_TYPE, PP_PLACEHOLDER
+from pptx.enum.text import MSO_ANCHOR, MSO_AUTO_SIZE, MSO_UNDERLINE, PP_ALIGN
+from pptx.oxml import parse_xml
+from pptx.oxml.simpletypes import ST_Percentage, ST_PositiveFixedPercentage, ST_TextSpacingPercentOrPercentString
+from pptx.util import Centipoints
+
+from extractor import EXTRACTION_PROFILES, PPTXExtractor, read_bullet_properties, read_run_properties
+
+
+NAMESPACES = {
+    'a': 'http://schemas.openxmlformats.org/drawingml/2006/main',
+    'p': 'http://schemas.openxmlformats.org/presentationml/2006/main',
+    'r': 'http://schemas.openxmlformats.org/officeDocument/2006/relationships',
+    'dgm': 'http://schemas.openxmlformats.org/drawingml/2006/diagram',
+    'c': 'http://schemas.openxmlformats.org/drawingml/2006/chart'
+}
+RELS_NS = 'http://schemas.openxmlformats.org/package/2006/relationships'
+
+A = '{%s}' % NAMESPACES['a']
+P = '{%s}' % NAMESPACES['p']
+R_ID = '{%s}id' % NAMESPACES['r']
+
+GRAPHIC_DATA_URI_CHART = 'http://schemas.openxmlformats.org/drawingml/2006/chart'
+GRAPHIC_DATA_URI_TABLE = 'http://schemas.openxmlformats.org/drawingml/2006/table'
+GRAPHIC_DATA_URI_OLEOBJ = 'http://schemas.openxmlformats.org/presentationml/2006/ole'
+
+# Shape elements python-pptx iterates in a shape tree (contentPart has no
+# shape proxy and is skipped here)
+SHAPE_TAGS = (P + 'sp', P + 'grpSp', P + 'graphicFrame', P + 'cxnSp', P + 'pic')
+
+COLOR_TAGS = frozenset(A + tag for tag in ('scrgbClr', 'srgbClr', 'hslClr', 'sysClr', 'schemeClr', 'prstClr'))
+FILL_TYPES = {
+    A + 'noFill': MSO_FILL.BACKGROUND,
+    A + 'solidFill': MSO_FILL.SOLID,
+    A + 'gradFill': MSO_FILL.GRADIENT,
+    A + 'blipFill': MSO_FILL.PICTURE,
+    A + 'pattFill': MSO_FILL.PATTERNED,
+    A + 'grpFill': MSO_FILL.GROUP
+}
+
+# Master placeholder type a layout placeholder inherits its geometry from
+# (same table as python-pptx's LayoutPlaceholder)
+BASE_PLACEHOLDER_TYPES = {
+    PP_PLACEHOLDER.BODY: PP_PLACEHOLDER.BODY,
+    PP_PLACEHOLDER.CHART: PP_PLACEHOLDER.BODY,
+    PP_PLACEHOLDER.BITMAP: PP_PLACEHOLDER.BODY,
+    PP_PLACEHOLDER.CENTER_TITLE: PP_PLACEHOLDER.TITLE,
+    PP_PLACEHOLDER.ORG_CHART: PP_PLACEHOLDER.BODY,
+    PP_PLACEHOLDER.DATE: PP_PLACEHOLDER.DATE,
+    PP_PLACEHOLDER.FOOTER: PP_PLACEHOLDER.FOOTER,
+    PP_PLACEHOLDER.MEDIA_CLIP: PP_PLACEHOLDER.BODY,
+    PP_PLACEHOLDER.OBJECT: PP_PLACEHOLDER.BODY,
+    PP_PLACEHOLDER.PICTURE: PP_PLACEHOLDER.BODY,
+    PP_PLACEHOLDER.SLIDE_NUMBER: PP_PLACEHOLDER.SLIDE_NUMBER,
+    PP_PLACEHOLDER.SUBTITLE: PP_PLACEHOLDER.BODY,
+    PP_PLACEHOLDER.TABLE: PP_PLACEHOLDER.BODY,
+    PP_PLACEHOLDER.TITLE: PP_PLACEHOLDER.TITLE
+}
+
+# Empty text bodies python-pptx adds when a text frame is accessed
+EMPTY_SHAPE_TXBODY = etree.fromstring(
+    '<p:txBody xmlns:p="%s" xmlns:a="%s"><a:bodyPr/><a:lstStyle/><a:p/></p:txBody>'
+    % (NAMESPACES['p'], NAMESPACES['a']))
+EMPTY_CELL_TXBODY = etree.fromstring(
+    '<a:txBody xmlns:a="%s"><a:bodyPr/><a:lstStyle/><a:p/></a:txBody>' % NAMESPACES['a'])
+
+# Pattern colors python-pptx adds when an unset one is read
+DEFAULT_PATTERN_COLORS = {
+    'fgClr': {"rgb": "000000", "brightness": 0},
+    'bgClr': {"rgb": "FFFFFF", "brightness": 0}
+}
+
+
+def xpath(path):
+    """Compile an XPath expression with the OOXML namespaces"""
+    return etree.XPath(path, namespaces=NAMESPACES)
+
+
+XP_CNVPR = xpath('./*[1]/p:cNvPr')
+XP_PH = xpath('./*[1]/p:nvPr/p:ph')
+XP_TXBOX = xpath('./p:nvSpPr/p:cNvSpPr/@txBox')
+XP_VIDEO = xpath('./p:nvPicPr/p:nvPr/a:videoFile')
+XP_SPPR = xpath('./p:spPr')
+XP_XFRM = xpath('./p:spPr/a:xfrm | ./p:xfrm | ./p:grpSpPr/a:xfrm')
+XP_TXBODY = xpath('./p:txBody')
+XP_GRAPHIC_DATA = xpath('./a:graphic/a:graphicData')
+XP_TABLE = xpath('./a:graphic/a:graphicData/a:tbl')
+XP_CHART_RID = xpath('./a:graphic/a:graphicData/c:chart/@r:id')
+XP_SP_TREE = xpath('./p:cSld/p:spTree')
+XP_BG = xpath('./p:cSld/p:bg')
+XP_CSLD_NAME = xpath('string(./p:cSld/@name)')
+XP_MASTER_IDS = xpath('./p:sldMasterIdLst/p:sldMasterId/@r:id')
+XP_LAYOUT_IDS = xpath('./p:sldLayoutIdLst/p:sldLayoutId/@r:id')
+XP_SLIDE_IDS = xpath('./p:sldIdLst/p:sldId/@r:id')
+XP_HLINK_RID = xpath('./a:rPr/a:hlinkClick/@r:id')
+XP_SMARTART_FRAMES = xpath('.//p:graphicFrame[a:graphic/a:graphicData/dgm:relIds]')
+
+
+def xml_bool(value):
+    """Parse an xsd:boolean attribute (None if absent)"""
+    if value is None:
+        return None
+    return value in ('1', 'true')
+
+
+def fill_element(parent):
+    """Get the fill choice child of a properties element (None if it has none)"""
+    if parent is None:
+        return None
+    for child in parent:
+        if child.tag in FILL_TYPES:
+            return child
+    return None
+
+
+def color_value(parent):
+    """
+    Get color information for a color-choice parent, like PPTXExtractor.get_color_value.
+    
+    Args:
+        parent: Element holding a color child (solidFill, fgClr, gs, ...)
+        
+    Returns:
+        Dictionary with rgb / theme_color / brightness, or None if no color is set
+    """
+    if parent is None:
+        return None
+    xClr = None
+    for child in parent:
+        if child.tag in COLOR_TAGS:
+            xClr = child
+            break
+    if xClr is None:
+        return None
+    
+    color_info = {}
+    try:
+        if xClr.tag == A + 'srgbClr':
+            val = xClr.get('val')
+            color_info['rgb'] = '%02X%02X%02X' % (int(val[:2], 16), int(val[2:4], 16), int(val[4:], 16))
+        elif xClr.tag == A + 'schemeClr':
+            color_info['theme_color'] = str(MSO_THEME_COLOR.from_xml(xClr.get('val')))
+        lumMod = xClr.find(A + 'lumMod')
+        lumOff = xClr.find(A + 'lumOff')
+        if lumOff is not None:
+            color_info['brightness'] = ST_Percentage.convert_from_xml(lumOff.get('val'))
+        elif lumMod is not None:
+            color_info['brightness'] = ST_Percentage.convert_from_xml(lumMod.get('val')) - 1.0
+        else:
+            color_info['brightness'] = 0
+    except Exception:
+        pass
+    return color_info if color_info else None
+
+
+def paragraph_text(p):
+    """Text of an a:p element (line breaks as vertical tabs, like python-pptx)"""
+    parts = []
+    for child in p:
+        tag = child.tag
+        if tag == A + 'r' or tag == A + 'fld':
+            t = child.find(A + 't')
+            parts.append((t.text or '') if t is not None else '')
+        elif tag == A + 'br':
+            parts.append('\v')
+    return ''.join(parts)
+
+
+class XMLExtractor(PPTXExtractor):
+    """
+    PPTXExtractor that reads the package XML directly.
+    
+    Parts are read from the zip once and parsed with lxml; python-pptx is only
+    used for its enumerations and for charts.
+    """
+    
+    def __init__(self, pptx_path, profile="full"):
+        if profile not in EXTRACTION_PROFILES:
+            raise ValueError(f"Unknown extraction profile: {profile} (expected one of {EXTRACTION_PROFILES})")
+        self.pptx_path = pptx_path
+        self.profile = profile
+        self.text_only = profile == "translation"
+        self.zip = zipfile.ZipFile(pptx_path)
+        self.namespaces = dict(NAMESPACES)
+        self.smartart_frames = XP_SMARTART_FRAMES
+        self._parts = {}
+        self._rels = {}
+        
+        presentation_part = self.related_parts('', 'officeDocument')[0]
+        presentation = self.part(presentation_part)
+        presentation_rels = self.rels(presentation_part)
+        self.master_parts = [presentation_rels[rId][1] for rId in XP_MASTER_IDS(presentation)]
+        self.slide_parts = [presentation_rels[rId][1] for rId in XP_SLIDE_IDS(presentation)]
+        
+        # Layout part name -> (master_index, layout_index), filled by
+        # extract_slide_masters (or index_layouts in slide worker processes)
+        self.layout_index = {}
+        
+        self.data = {
+            "presentation_name": os.path.basename(pptx_path),
+            "total_slides": len(self.slide_parts),
+            "slide_masters": [],
+            "slides": []
+        }
+        if self.text_only:
+            self.data["extraction_profile"] = profile
+    
+    # ------------------------------------------------------------------
+    # Package access
+    # ------------------------------------------------------------------
+    
+    def part(self, part_name):
+        """Parse a package part (cached)"""
+        root = self._parts.get(part_name)
+        if root is None:
+            root = etree.fromstring(self.zip.read(part_name))
+            self._parts[part_name] = root
+        return root
+    
+    def rels(self, part_name):
+        """
+        Read a part's relationships.
+        
+        Returns:
+            Dictionary of rId -> (type suffix, target part name or external
+            URL, raw target reference)
+        """
+        rels = self._rels.get(part_name)
+        if rels is not None:
+            return rels
+        
+        directory, base_name = posixpath.split(part_name)
+        rels_name = posixpath.join(directory, '_rels', base_name + '.rels')
+        rels = {}
+        if rels_name in self.zip.NameToInfo:
+            root = etree.fromstring(self.zip.read(rels_name))
+            for rel in root.iter('{%s}Relationship' % RELS_NS):
+                target = rel.get('Target')
+                if rel.get('TargetMode') == 'External':
+                    resolved = target
+                elif target.startswith('/'):
+                    resolved = target[1:]
+                else:
+                    resolved = posixpath.normpath(posixpath.join(directory, target))
+                rels[rel.get('Id')] = (rel.get('Type').rsplit('/', 1)[-1], resolved, target)
+        self._rels[part_name] = rels
+        return rels
+    
+    def related_parts(self, part_name, rel_type):
+        """Get the targets of a part's relationships of one type, in document order"""
+        return [target for kind, target, _ in self.rels(part_name).values() if kind == rel_type]
+    
+    # ------------------------------------------------------------------
+    # Placeholders and geometry
+    # ------------------------------------------------------------------
+    
+    def placeholder_elements(self, part_name):
+        """Get the placeholder shape elements of a part's shape tree, in order"""
+        sp_tree = XP_SP_TREE(self.part(part_name))
+        if not sp_tree:
+            return []
+        return [elm for elm in sp_tree[0] if elm.tag in SHAPE_TAGS and XP_PH(elm)]
+    
+    @staticmethod
+    def placeholder_type(ph):
+        return PP_PLACEHOLDER.from_xml(ph.get('type', 'obj'))
+    
+    @staticmethod
+    def placeholder_idx(ph):
+        return int(ph.get('idx', 0))
+    
+    @staticmethod
+    def own_dimension(elm, name):
+        """Directly applied left/top/width/height of a shape element (None if unset)"""
+        xfrm = XP_XFRM(elm)
+        if not xfrm:
+            return None
+        child = xfrm[0].find(A + ('off' if name in ('left', 'top') else 'ext'))
+        if child is None:
+            return None
+        value = child.get({'left': 'x', 'top': 'y', 'width': 'cx', 'height': 'cy'}[name])
+        return int(value) if value is not None else None
+    
+    def layout_placeholder_dimension(self, elm, layout_part, name):
+        """Dimension of a layout placeholder, inherited from the master by type"""
+        value = self.own_dimension(elm, name)
+        if value is not None or elm.tag != P + 'sp':
+            return value
+        base_type = BASE_PLACEHOLDER_TYPES[self.placeholder_type(XP_PH(elm)[0])]
+        master_part = self.related_parts(layout_part, 'slideMaster')[0]
+        for master_elm in self.placeholder_elements(master_part):
+            if self.placeholder_type(XP_PH(master_elm)[0]) == base_type:
+                return self.own_dimension(master_elm, name)
+        return None
+    
+    def slide_placeholder_dimension(self, elm, slide_part, name):
+        """Dimension of a slide placeholder, inherited from its layout by idx"""
+        value = self.own_dimension(elm, name)
+        if value is not None or elm.tag == P + 'graphicFrame':
+            return value
+        layout_part = self.related_parts(slide_part, 'slideLayout')[0]
+        idx = self.placeholder_idx(XP_PH(elm)[0])
+        for layout_elm in self.placeholder_elements(layout_part):
+            if self.placeholder_idx(XP_PH(layout_elm)[0]) == idx:
+                return self.layout_placeholder_dimension(layout_elm, layout_part, name)
+        return None
+    
+    # ------------------------------------------------------------------
+    # Masters, layouts and backgrounds
+    # ------------------------------------------------------------------
+    
+    def extract_background_info(self, part_name, is_slide=False):
+        """Extract background information from a slide, layout or master part"""
+        background_info = {
+            "follows_master": None,
+            "fill_type": None,
+            "solid_color": None,
+            "gradient_colors": None,
+            "pattern_type": None,
+            "picture_present": False
+        }
+        
+        bg = XP_BG(self.part(part_name))
+        if is_slide:
+            background_info["follows_master"] = not bg
+        
+        # A missing p:bgPr (no background or a theme reference) reads as noFill
+        bgPr = bg[0].find(P + 'bgPr') if bg else None
+        fill = fill_element(bgPr)
+        if fill is None:
+            background_info["fill_type"] = str(MSO_FILL.BACKGROUND)
+            return background_info
+        
+        background_info["fill_type"] = str(FILL_TYPES[fill.tag])
+        if fill.tag == A + 'solidFill':
+            background_info["solid_color"] = color_value(fill)
+        elif fill.tag == A + 'pattFill':
+            background_info["solid_color"] = self.pattern_color(fill, 'fgClr')
+            background_info["pattern_type"] = self.pattern_type(fill)
+        return background_info
+    
+    @staticmethod
+    def pattern_type(pattFill):
+        prst = pattFill.get('prst')
+        return str(MSO_PATTERN.from_xml(prst) if prst else None)
+    
+    @staticmethod
+    def pattern_color(pattFill, tag):
+        """Foreground (fgClr) or background (bgClr) color of a pattern fill"""
+        clr = pattFill.find(A + tag)
+        if clr is None:
+            return dict(DEFAULT_PATTERN_COLORS[tag])
+        return color_value(clr)
+    
+    def extract_slide_masters(self):
+        """Extract information about all slide masters and their layouts"""
+        masters_info = []
+        
+        for master_idx, master_part in enumerate(self.master_parts):
+            master = self.part(master_part)
+            master_data = {
+                "master_index": master_idx,
+                "master_name": XP_CSLD_NAME(master),
+                "background": self.extract_background_info(master_part),
+                "layouts": []
+            }
+            
+            master_rels = self.rels(master_part)
+            for layout_idx, rId in enumerate(XP_LAYOUT_IDS(master)):
+                layout_part = master_rels[rId][1]
+                self.layout_index[layout_part] = (master_idx, layout_idx)
+                layout_data = {
+                    "layout_index": layout_idx,
+                    "layout_name": XP_CSLD_NAME(self.part(layout_part)),
+                    "background": self.extract_background_info(layout_part),
+                    "placeholders": []
+                }
+                
+                # Placeholder information (python-pptx stops at placeholder
+                # types it cannot map to a master placeholder)
+                try:
+                    for elm in self.placeholder_elements(layout_part):
+                        ph = XP_PH(elm)[0]
+                        ph_data = {
+                            "placeholder_idx": self.placeholder_idx(ph),
+                            "placeholder_type": str(self.placeholder_type(ph)),
+                            "name": XP_CNVPR(elm)[0].get('name'),
+                            "dimensions": {
+                                name: self.layout_placeholder_dimension(elm, layout_part, name)
+                                for name in ("left", "top", "width", "height")
+                            }
+                        }
+                        layout_data["placeholders"].append(ph_data)
+                except Exception:
+                    pass
+                
+                master_data["layouts"].append(layout_data)
+            
+            masters_info.append(master_data)
+        
+        return masters_info
+    
+    def index_layouts(self):
+        """Map layout part names to (master_index, layout_index) without extracting masters"""
+        for master_idx, master_part in enumerate(self.master_parts):
+            master_rels = self.rels(master_part)
+            for layout_idx, rId in enumerate(XP_LAYOUT_IDS(self.part(master_part))):
+                self.layout_index[master_rels[rId][1]] = (master_idx, layout_idx)
+    
+    def get_slide_layout_info(self, slide_part):
+        """Get layout information for a slide part"""
+        if not self.layout_index:
+            self.index_layouts()
+        layout_part = self.related_parts(slide_part, 'slideLayout')[0]
+        master_index, layout_index = self.layout_index.get(layout_part, (None, None))
+        return {
+            "master_index": master_index,
+            "layout_index": layout_index,
+            "layout_name": XP_CSLD_NAME(self.part(layout_part)),
+            "follows_master_background": not XP_BG(self.part(slide_part))
+        }
+    
+    # ------------------------------------------------------------------
+    # Shape properties
+    # ------------------------------------------------------------------
+    
+    def extract_shape_fill(self, elm):
+        """Extract fill information from a shape element"""
+        fill_info = {
+            "fill_type": None,
+            "solid_color": None,
+            "gradient_stops": None,
+            "pattern_type": None,
+            "picture_present": False
+        }
+        if elm.tag != P + 'sp':
+            return fill_info
+        
+        spPr = XP_SPPR(elm)
+        fill = fill_element(spPr[0] if spPr else None)
+        fill_info["fill_type"] = str(FILL_TYPES[fill.tag] if fill is not None else None)
+        if fill is None:
+            return fill_info
+        
+        if fill.tag == A + 'solidFill':
+            fill_info["solid_color"] = color_value(fill)
+        elif fill.tag == A + 'pattFill':
+            fill_info["solid_color"] = self.pattern_color(fill, 'fgClr')
+            fill_info["pattern_type"] = self.pattern_type(fill)
+            fill_info["pattern_back_color"] = self.pattern_color(fill, 'bgClr')
+        elif fill.tag == A + 'gradFill':
+            gsLst = fill.find(A + 'gsLst')
+            fill_info["gradient_stops"] = [
+                {
+                    "position": ST_PositiveFixedPercentage.convert_from_xml(gs.get('pos')),
+                    "color": color_value(gs)
+                }
+                for gs in (gsLst if gsLst is not None else [])
+                if gs.tag == A + 'gs'
+            ]
+        return fill_info
+    
+    def extract_shape_line(self, elm):
+        """Extract line/border information from a shape element"""
+        line_info = {
+            "has_line": False,
+            "color": None,
+            "width": None,
+            "dash_style": None,
+            "transparency": None
+        }
+        if elm.tag not in (P + 'sp', P + 'pic', P + 'cxnSp'):
+            return line_info
+        
+        spPr = XP_SPPR(elm)
+        ln = spPr[0].find(A + 'ln') if spPr else None
+        line_info["has_line"] = True
+        
+        # Reading the color turns any non-solid line fill into an empty solid fill
+        fill = fill_element(ln)
+        line_info["color"] = color_value(fill) if fill is not None and fill.tag == A + 'solidFill' else None
+        line_info["width"] = int(ln.get('w', 0)) if ln is not None else 0
+        prstDash = ln.find(A + 'prstDash') if ln is not None else None
+        line_info["dash_style"] = str(MSO_LINE_DASH_STYLE.from_xml(prstDash.get('val'))
+                                      if prstDash is not None else None)
+        return line_info
+    
+    def extract_shape_shadow(self, elm):
+        """Extract shadow information from a shape element"""
+        shadow_info = {
+            "has_shadow": False,
+            "shadow_type": None,
+            "color": None,
+            "transparency": None,
+            "blur": None,
+            "angle": None,
+            "distance": None
+        }
+        if elm.tag == P + 'graphicFrame':
+            return shadow_info
+        spPr = XP_SPPR(elm)
+        if spPr:
+            shadow_info["has_shadow"] = spPr[0].find(A + 'effectLst') is not None
+        return shadow_info
+    
+    def extract_placeholder_info(self, elm):
+        """Extract placeholder information from a shape element"""
+        ph = XP_PH(elm)
+        if not ph:
+            return {"is_placeholder": False, "placeholder_type": None, "placeholder_idx": None}
+        return {
+            "is_placeholder": True,
+            "placeholder_type": str(self.placeholder_type(ph[0])),
+            "placeholder_idx": self.placeholder_idx(ph[0])
+        }
+    
+    # ------------------------------------------------------------------
+    # Text
+    # ------------------------------------------------------------------
+    
+    def extract_bullet_formatting(self, pPr):
+        """Extract bullet/numbering information from an a:pPr element"""
+        bullet_info = {
+            "is_bulleted": False,
+            "bullet_type": None,
+            "bullet_char": None,
+            "bullet_font": None,
+            "bullet_color": None,
+            "numbering_format": None,
+            "start_at": None
+        }
+        if pPr is not None:
+            try:
+                read_bullet_properties(pPr, bullet_info)
+            except Exception:
+                pass
+        return bullet_info
+    
+    def extract_paragraph_formatting(self, p):
+        """Extract paragraph-level formatting from an a:p element"""
+        pPr = p.find(A + 'pPr')
+        para_format = {
+            "level": 0,
+            "alignment": None,
+            "line_spacing": None,
+            "space_before": None,
+            "space_after": None,
+            "indent": None,
+            "left_indent": None,
+            "right_indent": None,
+            "bullet_format": self.extract_bullet_formatting(pPr),
+            "text_direction": None
+        }
+        if pPr is None:
+            return para_format
+        
+        para_format["level"] = int(pPr.get('lvl', 0))
+        algn = pPr.get('algn')
+        if algn:
+            para_format["alignment"] = str(PP_ALIGN.from_xml(algn))
+        
+        for child in pPr:
+            tag = child.tag
+            if tag == A + 'lnSpc':
+                spcPct = child.find(A + 'spcPct')
+                spcPts = child.find(A + 'spcPts')
+                if spcPts is not None:
+                    para_format["line_spacing"] = Centipoints(int(spcPts.get('val')))
+                elif spcPct is not None:
+                    para_format["line_spacing"] = ST_TextSpacingPercentOrPercentString.convert_from_xml(
+                        spcPct.get('val'))
+            elif tag == A + 'spcBef' or tag == A + 'spcAft':
+                spcPts = child.find(A + 'spcPts')
+                if spcPts is not None:
+                    key = "space_before" if tag == A + 'spcBef' else "space_after"
+                    para_format[key] = Centipoints(int(spcPts.get('val'))).pt
+        
+        if pPr.get('indent'):
+            para_format["indent"] = int(pPr.get('indent'))
+        if pPr.get('marL'):
+            para_format["left_indent"] = int(pPr.get('marL'))
+        if pPr.get('marR'):
+            para_format["right_indent"] = int(pPr.get('marR'))
+        rtl = pPr.get('rtl')
+        if rtl:
+            para_format["text_direction"] = "rtl" if rtl == '1' else "ltr"
+        
+        return para_format
+    
+    def extract_run_formatting(self, r):
+        """Extract formatting details from an a:r element"""
+        t = r.find(A + 't')
+        rPr = r.find(A + 'rPr')
+        formatting = {
+            "text": (t.text or '') if t is not None else '',
+            "font_name": None,
+            "font_size": None,
+            "bold": None,
+            "italic": None,
+            "underline": None,
+            "color": None,
+            "strike": None,
+            "kerning": None,
+            "spacing": None,
+            "caps": None,
+            "superscript": None,
+            "subscript": None,
+            "text_highlight": None,
+            "text_outline": None
+        }
+        if rPr is None:
+            return formatting
+        
+        sz = rPr.get('sz')
+        if sz is not None:
+            formatting["font_size"] = Centipoints(int(sz)).pt
+        formatting["bold"] = xml_bool(rPr.get('b'))
+        formatting["italic"] = xml_bool(rPr.get('i'))
+        u = rPr.get('u')
+        if u is not None:
+            underline = MSO_UNDERLINE.from_xml(u)
+            formatting["underline"] = (False if underline is MSO_UNDERLINE.NONE else
+                                       True if underline is MSO_UNDERLINE.SINGLE_LINE else underline)
+        
+        for child in rPr:
+            tag = child.tag
+            if tag == A + 'latin':
+                formatting["font_name"] = child.get('typeface')
+            elif tag == A + 'solidFill' and formatting["color"] is None:
+                formatting["color"] = color_value(child)
+        
+        try:
+            read_run_properties(rPr, formatting)
+        except Exception:
+            pass
+        return formatting
+    
+    def extract_run_text(self, r):
+        """Extract an a:r element's text and the formatting the reassembler applies to added runs"""
+        t = r.find(A + 't')
+        rPr = r.find(A + 'rPr')
+        sz = rPr.get('sz') if rPr is not None else None
+        return {
+            "text": (t.text or '') if t is not None else '',
+            "font_size": Centipoints(int(sz)).pt if sz is not None else None,
+            "bold": xml_bool(rPr.get('b')) if rPr is not None else None,
+            "italic": xml_bool(rPr.get('i')) if rPr is not None else None
+        }
+    
+    def extract_text_frame_properties(self, txBody):
+        """Extract text frame properties from a txBody element"""
+        bodyPr = txBody.find(A + 'bodyPr')
+        get = bodyPr.get if bodyPr is not None else {}.get
+        auto_size = None
+        if bodyPr is not None:
+            for child in bodyPr:
+                if child.tag == A + 'noAutofit':
+                    auto_size = MSO_AUTO_SIZE.NONE
+                elif child.tag == A + 'normAutofit':
+                    auto_size = MSO_AUTO_SIZE.TEXT_TO_FIT_SHAPE
+                elif child.tag == A + 'spAutoFit':
+                    auto_size = MSO_AUTO_SIZE.SHAPE_TO_FIT_TEXT
+                else:
+                    continue
+                break
+        anchor = get('anchor')
+        rot = get('rot')
+        return {
+            "margin_left": int(get('lIns', 91440)),
+            "margin_right": int(get('rIns', 91440)),
+            "margin_top": int(get('tIns', 45720)),
+            "margin_bottom": int(get('bIns', 45720)),
+            "word_wrap": {"square": True, "none": False}.get(get('wrap')),
+            "auto_size": str(auto_size),
+            "vertical_anchor": str(MSO_ANCHOR.from_xml(anchor) if anchor else None),
+            "text_direction": get('vert') or None,
+            "rotation_angle": int(rot) / 60000.0 if rot else None
+        }
+    
+    def extract_paragraphs(self, txBody):
+        """Extract paragraphs (formatting and runs) and the full text of a txBody"""
+        paragraphs = []
+        texts = []
+        for p in txBody.iterchildren(A + 'p'):
+            if self.text_only:
+                paragraphs.append({"runs": [self.extract_run_text(r) for r in p.iterchildren(A + 'r')]})
+            else:
+                paragraphs.append({
+                    "paragraph_formatting": self.extract_paragraph_formatting(p),
+                    "runs": [self.extract_run_formatting(r) for r in p.iterchildren(A + 'r')]
+                })
+            texts.append(paragraph_text(p))
+        return paragraphs, "\n".join(texts)
+    
+    # ------------------------------------------------------------------
+    # Tables, charts and shapes
+    # ------------------------------------------------------------------
+    
+    def extract_table(self, tbl):
+        """Extract table structure and content from an a:tbl element"""
+        grid = tbl.find(A + 'tblGrid')
+        rows = list(tbl.iterchildren(A + 'tr'))
+        table_data = {
+            "rows": len(rows),
+            "columns": len(list(grid.iterchildren(A + 'gridCol'))) if grid is not None else 0,
+            "cells": []
+        }
+        
+        for row_idx, tr in enumerate(rows):
+            for col_idx, tc in enumerate(tr.iterchildren(A + 'tc')):
+                txBody = tc.find(A + 'txBody')
+                paragraphs, text = self.extract_paragraphs(txBody if txBody is not None else EMPTY_CELL_TXBODY)
+                table_data["cells"].append({
+                    "row": row_idx,
+                    "column": col_idx,
+                    "text": text,
+                    "paragraphs": paragraphs
+                })
+        
+        return table_data
+    
+    def shape_type(self, elm):
+        """Get the MSO_SHAPE_TYPE python-pptx reports for a shape element"""
+        tag = elm.tag
+        if tag == P + 'sp':
+            if XP_PH(elm):
+                return MSO_SHAPE_TYPE.PLACEHOLDER
+            spPr = XP_SPPR(elm)
+            if spPr and spPr[0].find(A + 'custGeom') is not None:
+                return MSO_SHAPE_TYPE.FREEFORM
+            is_textbox = xml_bool((XP_TXBOX(elm) or [None])[0]) or False
+            if spPr and spPr[0].find(A + 'prstGeom') is not None and not is_textbox:
+                return MSO_SHAPE_TYPE.AUTO_SHAPE
+            if is_textbox:
+                return MSO_SHAPE_TYPE.TEXT_BOX
+            raise NotImplementedError("Shape instance of unrecognized shape type")
+        if tag == P + 'pic':
+            if XP_VIDEO(elm):
+                return MSO_SHAPE_TYPE.MEDIA
+            return MSO_SHAPE_TYPE.PLACEHOLDER if XP_PH(elm) else MSO_SHAPE_TYPE.PICTURE
+        if tag == P + 'cxnSp':
+            return MSO_SHAPE_TYPE.LINE
+        if tag == P + 'grpSp':
+            return MSO_SHAPE_TYPE.GROUP
+        if tag == P + 'graphicFrame':
+            graphic_data = XP_GRAPHIC_DATA(elm)
+            uri = graphic_data[0].get('uri') if graphic_data else None
+            if uri == GRAPHIC_DATA_URI_CHART:
+                return MSO_SHAPE_TYPE.CHART
+            if uri == GRAPHIC_DATA_URI_TABLE:
+                return MSO_SHAPE_TYPE.TABLE
+            if uri == GRAPHIC_DATA_URI_OLEOBJ:
+                is_embedded = bool(graphic_data[0].xpath('./p:oleObj/p:embed', namespaces=NAMESPACES))
+                return MSO_SHAPE_TYPE.EMBEDDED_OLE_OBJECT if is_embedded else MSO_SHAPE_TYPE.LINKED_OLE_OBJECT
+            return None
+        raise NotImplementedError(f"Unsupported shape element {tag}")
+    
+    def extract_shape(self, elm, slide_part):
+        """Extract shape information from a shape element"""
+        cNvPr = XP_CNVPR(elm)[0]
+        element = {
+            "shape_id": int(cNvPr.get('id')),
+            "shape_name": cNvPr.get('name'),
+            "element_type": None,
+            "placeholder_info": self.extract_placeholder_info(elm)
+        }
+        if not self.text_only:
+            element["fill"] = self.extract_shape_fill(elm)
+            element["line"] = self.extract_shape_line(elm)
+            element["shadow"] = self.extract_shape_shadow(elm)
+        
+        shape_type = self.shape_type(elm)
+        tag = elm.tag
+        if tag == P + 'sp':
+            # Every p:sp has a text frame (python-pptx adds an empty one if needed)
+            txBody = XP_TXBODY(elm)
+            txBody = txBody[0] if txBody else EMPTY_SHAPE_TXBODY
+            element["element_type"] = "TextBox"
+            if not self.text_only:
+                element["text_frame_properties"] = self.extract_text_frame_properties(txBody)
+            element["paragraphs"], element["full_text"] = self.extract_paragraphs(txBody)
+        elif shape_type == MSO_SHAPE_TYPE.TABLE:
+            element["element_type"] = "Table"
+            element["table_data"] = self.extract_table(XP_TABLE(elm)[0])
+        elif shape_type == MSO_SHAPE_TYPE.CHART:
+            element["element_type"] = "Chart"
+            element["chart_data"] = self.extract_chart(self.chart_shape(elm, slide_part))
+        elif shape_type == MSO_SHAPE_TYPE.PICTURE:
+            element["element_type"] = "Picture"
+            if not self.text_only:
+                element["image_info"] = {
+                    "description": element["shape_name"],
+                    "alt_text": None
+                }
+        else:
+            element["element_type"] = f"Other_{shape_type}"
+        
+        if self.text_only:
+            return element
+        
+        # Placeholders inherit unset geometry from their layout placeholder
+        if XP_PH(elm):
+            dimension = lambda name: self.slide_placeholder_dimension(elm, slide_part, name)
+        else:
+            dimension = lambda name: self.own_dimension(elm, name)
+        xfrm = XP_XFRM(elm)
+        rot = xfrm[0].get('rot') if xfrm else None
+        element["dimensions"] = {
+            "left": dimension("left"),
+            "top": dimension("top"),
+            "width": dimension("width"),
+            "height": dimension("height"),
+            "rotation": int(rot) / 60000.0 if rot else 0.0
+        }
+        
+        return element
+    
+    def chart_shape(self, elm, slide_part):
+        """Build a python-pptx Chart from the chart part, wrapped for extract_chart"""
+        rId = XP_CHART_RID(elm)[0]
+        chart_part = self.rels(slide_part)[rId][1]
+        return SimpleNamespace(chart=Chart(parse_xml(self.zip.read(chart_part)), None))
+    
+    def extract_grouped_shapes(self, group_elm, slide_part):
+        """Extract shapes from a group element recursively"""
+        grouped_elements = []
+        for elm in group_elm:
+            if elm.tag == P + 'grpSp':
+                grouped_elements.extend(self.extract_grouped_shapes(elm, slide_part))
+            elif elm.tag in SHAPE_TAGS:
+                grouped_elements.append(self.extract_shape(elm, slide_part))
+        return grouped_elements
+    
+    def extract_links(self, elm, slide_part):
+        """Extract hyperlinks from the runs of a shape element"""
+        links = []
+        if elm.tag != P + 'sp':
+            return links
+        txBody = XP_TXBODY(elm)
+        if not txBody:
+            return links
+        slide_rels = self.rels(slide_part)
+        for p in txBody[0].iterchildren(A + 'p'):
+            for r in p.iterchildren(A + 'r'):
+                rId = XP_HLINK_RID(r)
+                if rId and rId[0] in slide_rels:
+                    address = slide_rels[rId[0]][2]
+                    if address:
+                        t = r.find(A + 't')
+                        links.append({
+                            "text": (t.text or '') if t is not None else '',
+                            "url": address
+                        })
+        return links
+    
+    def extract_speaker_notes(self, slide_part):
+        """Extract the notes placeholder text of a slide (None if empty)"""
+        notes_parts = self.related_parts(slide_part, 'notesSlide')
+        if not notes_parts:
+            return None
+        for elm in self.placeholder_elements(notes_parts[0]):
+            if self.placeholder_type(XP_PH(elm)[0]) != PP_PLACEHOLDER.BODY:
+                continue
+            txBody = XP_TXBODY(elm)
+            if not txBody:
+                return None
+            text = "\n".join(paragraph_text(p) for p in txBody[0].iterchildren(A + 'p'))
+            if text.strip():
+                return {"text": text, "element_type": "SpeakerNotes"}
+            return None
+        return None
+    
+    def extract_slide_smartart(self, slide_part):
+        """Extract SmartArt diagrams placed on a slide part, read from the shared zip"""
+        smartart_data = []
+        slide_rels = self.rels(slide_part)
+        read_part = lambda rId: self.zip.read(slide_rels[rId][1])
+        for graphic_frame in self.smartart_frames(self.part(slide_part)):
+            smartart_element = self.extract_smartart_frame(graphic_frame, read_part)
+            if smartart_element:
+                smartart_data.append(smartart_element)
+        return smartart_data
+    
+    def extract_slide_at(self, slide_index):
+        """Extract the slide at a 0-based index"""
+        return self.extract_slide(self.slide_parts[slide_index], slide_index + 1)
+    
+    def extract_slide(self, slide_part, slide_num):
+        """Extract all content from a single slide part"""
+        if self.text_only:
+            return self.extract_slide_text(slide_part, slide_num)
+        
+        slide_data = {
+            "slide_number": slide_num,
+            "layout_info": self.get_slide_layout_info(slide_part),
+            "background": self.extract_background_info(slide_part, is_slide=True),
+            "elements": [],
+            "links": [],
+            "speaker_notes": None,
+            "smartart": []
+        }
+        
+        sp_tree = XP_SP_TREE(self.part(slide_part))
+        for elm in (sp_tree[0] if sp_tree else []):
+            if elm.tag == P + 'grpSp':
+                slide_data["elements"].extend(self.extract_grouped_shapes(elm, slide_part))
+            elif elm.tag in SHAPE_TAGS:
+                slide_data["elements"].append(self.extract_shape(elm, slide_part))
+                links = self.extract_links(elm, slide_part)
+                if links:
+                    slide_data["links"].extend(links)
+        
+        slide_data["speaker_notes"] = self.extract_speaker_notes(slide_part)
+        slide_data["smartart"] = self.extract_slide_smartart(slide_part)
+        
+        # Slide parts are not needed again once extracted
+        self._parts.pop(slide_part, None)
+        return slide_data
+    
+    def extract_slide_text(self, slide_part, slide_num):
+        """Extract a slide part for the translation profile: elements, speaker notes and SmartArt only"""
+        elements = []
+        sp_tree = XP_SP_TREE(self.part(slide_part))
+        for elm in (sp_tree[0] if sp_tree else []):
+            if elm.tag == P + 'grpSp':
+                elements.extend(self.extract_grouped_shapes(elm, slide_part))
+            elif elm.tag in SHAPE_TAGS:
+                elements.append(self.extract_shape(elm, slide_part))
+        
+        slide_data = {
+            "slide_number": slide_num,
+            "elements": elements,
+            "speaker_notes": self.extract_speaker_notes(slide_part),
+            "smartart": self.extract_slide_smartart(slide_part)
+        }
+        self._parts.pop(slide_part, None)
+        return slide_data
+
+
+def find_differences(expected, actual, path="", limit=20):
+    """
+    List the paths where two extractions differ.
+    
+    Args:
+        expected: Reference value (PPTXExtractor output)
+        actual: Value to check (XMLExtractor output)
+        path: Path of the values being compared
+        limit: Maximum number of differences to collect
+        
+    Returns:
+        List of "path: expected != actual" strings
+    """
+    differences = []
+    
+    def compare(a, b, at):
+        if len(differences) >= limit:
+            return
+        if isinstance(a, dict) and isinstance(b, dict):
+            for key in a.keys() | b.keys():
+                if key not in a or key not in b:
+                    differences.append(f"{at}.{key}: {'missing' if key not in b else 'unexpected'}")
+                else:
+                    compare(a[key], b[key], f"{at}.{key}")
+        elif isinstance(a, list) and isinstance(b, list):
+            if len(a) != len(b):
+                differences.append(f"{at}: {len(a)} items != {len(b)} items")
+            for idx, (item_a, item_b) in enumerate(zip(a, b)):
+                compare(item_a, item_b, f"{at}[{idx}]")
+        elif a != b or type(a) != type(b):
+            differences.append(f"{at}: {a!r} != {b!r}")
+    
+    compare(expected, actual, path)
+    return differences
+
+
+def build_parity_deck(path: str):
+    """
+    Save a deck exercising what both engines read: every layout with filled
+    placeholders, backgrounds, fills, lines, rich text (hyperlinks, breaks,
+    fields, bullets), freeforms, connectors, pictures, tables, charts, nested
+    groups and speaker notes.
+    """
+    import struct
+    import zlib
+    from io import BytesIO
+    
+    from pptx import Presentation
+    from pptx.chart.data import CategoryChartData
+    from pptx.dml.color import RGBColor
+    from pptx.enum.chart import XL_CHART_TYPE
+    from pptx.enum.shapes import MSO_CONNECTOR, MSO_SHAPE
+    from pptx.util import Inches, Pt
+    
+    a = "http://schemas.openxmlformats.org/drawingml/2006/main"
+    
+    def drawingml(xml):
+        return etree.fromstring(f'<x xmlns:a="{a}">{xml}</x>')[0]
+    
+    def chunk(kind, payload):
+        return struct.pack(">I", len(payload)) + kind + payload + struct.pack(">I", zlib.crc32(kind + payload))
+    png = (b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", struct.pack(">IIBBBBB", 1, 1, 8, 2, 0, 0, 0))
+           + chunk(b"IDAT", zlib.compress(b"\x00\xff\x00\x00")) + chunk(b"IEND", b""))
+    
+    presentation = Presentation()
+    for layout_idx, layout in enumerate(presentation.slide_layouts):
+        slide = presentation.slides.add_slide(layout)
+        for placeholder in slide.placeholders:
+            if placeholder.has_text_frame:
+                placeholder.text_frame.text = f"Placeholder {placeholder.placeholder_format.idx} on layout {layout_idx}"
+        
+        background = slide.background.fill
+        if layout_idx % 4 == 1:
+            background.gradient()
+        elif layout_idx % 4 == 2:
+            background.solid()
+            background.fore_color.theme_color = MSO_THEME_COLOR.ACCENT_2
+            background.fore_color.brightness = 0.4
+        elif layout_idx % 4 == 3:
+            background.patterned()
+            background.pattern = MSO_PATTERN.CROSS
+        
+        shape = slide.shapes.add_shape(MSO_SHAPE.OVAL, Inches(1), Inches(1), Inches(2), Inches(1))
+        shape.rotation = 33
+        if layout_idx % 3 == 0:
+            shape.fill.gradient()
+            shape.fill.gradient_angle = 45
+        elif layout_idx % 3 == 1:
+            shape.fill.patterned()
+            shape.fill.pattern = MSO_PATTERN.DIVOT
+            shape.fill.fore_color.rgb = RGBColor(1, 2, 3)
+            shape.fill.back_color.theme_color = MSO_THEME_COLOR.ACCENT_1
+        else:
+            shape.fill.background()
+        shape.line.color.rgb = RGBColor(0xAA, 0xBB, 0xCC)
+        shape.line.width = Pt(2)
+        shape.line.dash_style = MSO_LINE_DASH_STYLE.DASH
+        
+        text_frame = shape.text_frame
+        text_frame.word_wrap = layout_idx % 2 == 0
+        text_frame.auto_size = MSO_AUTO_SIZE.TEXT_TO_FIT_SHAPE
+        text_frame.vertical_anchor = MSO_ANCHOR.MIDDLE
+        text_frame.margin_left = 12345
+        paragraph = text_frame.paragraphs[0]
+        paragraph.alignment = PP_ALIGN.CENTER
+        paragraph.line_spacing = 1.5
+        paragraph.space_before = Pt(6)
+        run = paragraph.add_run()
+        run.text = "Hello <&> "
+        run.font.bold = True
+        run.font.underline = MSO_UNDERLINE.DOUBLE_LINE
+        run.font.color.theme_color = MSO_THEME_COLOR.ACCENT_3
+        run.font.color.brightness = -0.25
+        run.font.name = "Arial"
+        run.font.size = Pt(13.5)
+        run.hyperlink.address = "https://example.com/x?a=1&b=2"
+        run = paragraph.add_run()
+        run.text = "world"
+        run.font.italic = False
+        paragraph._p.append(drawingml("<a:br/>"))
+        run = paragraph.add_run()
+        run.text = "after break"
+        for name, value in (("strike", "sngStrike"), ("baseline", "30000"), ("cap", "all")):
+            run._r.get_or_add_rPr().set(name, value)
+        
+        paragraph = text_frame.add_paragraph()
+        paragraph.level = 2
+        paragraph.line_spacing = Pt(20)
+        pPr = paragraph._p.get_or_add_pPr()
+        pPr.set("marL", "342900")
+        pPr.set("indent", "-342900")
+        pPr.append(drawingml('<a:buClr><a:schemeClr val="accent1"/></a:buClr>'))
+        pPr.append(drawingml('<a:buFont typeface="Wingdings"/>'))
+        pPr.append(drawingml('<a:buAutoNum type="romanLcPeriod" startAt="3"/>'))
+        paragraph._p.append(drawingml('<a:fld id="{B6F15528-21DE-4FAA-801E-634DDDAF4B2B}" type="slidenum">'
+                                      '<a:rPr lang="en-US"/><a:t>7</a:t></a:fld>'))
+        run = paragraph.add_run()
+        run.text = "numbered"
+        rPr = run._r.get_or_add_rPr()
+        rPr.append(drawingml('<a:ln w="1234"><a:solidFill><a:srgbClr val="112233"/></a:solidFill></a:ln>'))
+        rPr.append(drawingml('<a:highlight><a:srgbClr val="FFFF00"/></a:highlight>'))
+        paragraph = text_frame.add_paragraph()
+        paragraph.text = "bulleted"
+        paragraph._p.get_or_add_pPr().append(drawingml('<a:buChar char="-"/>'))
+        
+        freeform = slide.shapes.build_freeform(100, 100).add_line_segments([(500, 100), (500, 600)]).convert_to_shape()
+        freeform.shadow.inherit = False
+        connector = slide.shapes.add_connector(MSO_CONNECTOR.STRAIGHT, 0, 0, Inches(2), Inches(2))
+        connector.line.color.theme_color = MSO_THEME_COLOR.ACCENT_6
+        slide.shapes.add_picture(BytesIO(png), Inches(3), Inches(3))
+        slide.shapes.add_textbox(Inches(4), Inches(4), Inches(1), Inches(1))
+        
+        if layout_idx % 3 == 0:
+            table = slide.shapes.add_table(2, 3, 0, 0, Inches(3), Inches(1)).table
+            table.cell(0, 0).text = "a\vb"
+            table.cell(1, 2).text = "x"
+        elif layout_idx % 3 == 1:
+            chart_data = CategoryChartData()
+            chart_data.categories = ["A", "B"]
+            chart_data.add_series("S", (1, 2))
+            slide.shapes.add_chart(XL_CHART_TYPE.LINE, 0, 0, Inches(3), Inches(2), chart_data)
+        
+        group = slide.shapes.add_group_shape()
+        group.shapes.add_textbox(0, 0, 100, 100).text_frame.text = "g1"
+        nested = group.shapes.add_group_shape()
+        nested.shapes.add_shape(MSO_SHAPE.RECTANGLE, 0, 0, 50, 50).text_frame.text = "g2"
+        
+        if layout_idx % 2:
+            slide.notes_slide.notes_text_frame.text = "notes\nline2"
+    
+    presentation.save(path)
+
+
+def check_parity(pptx_file: str, profile: str = "full", workers: int = 1):
+    """
+    Extract a deck with both engines and compare the outputs.
+    
+    Args:
+        pptx_file: Deck to extract
+        profile: Extraction profile used by both engines
+        workers: Worker processes for both engines
+        
+    Returns:
+        Tuple of (differences, XML seconds, python-pptx seconds)
+    """
+    import contextlib
+    import io
+    
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        data = XMLExtractor(pptx_file, profile=profile).extract_all(workers=workers)
+        xml_time = time.perf_counter() - start
+        start = time.perf_counter()
+        reference = PPTXExtractor(pptx_file, profile=profile).extract_all(workers=workers)
+        reference_time = time.perf_counter() - start
+    
+    # Compare the JSON forms (enum members serialize as their values)
+    differences = find_differences(json.loads(json.dumps(reference)), json.loads(json.dumps(data)), "data")
+    return differences, xml_time, reference_time
+
+
+def run_self_test(workers: int = 1):
+    """Check parity on a generated deck for every profile, exiting with 1 on any difference"""
+    import tempfile
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        deck_path = os.path.join(tmp_dir, "parity.pptx")
+        build_parity_deck(deck_path)
+        failed = False
+        for profile in EXTRACTION_PROFILES:
+            differences, _, _ = check_parity(deck_path, profile, workers)
+            print(f"Parity ({profile} profile): {'outputs differ' if differences else 'outputs are identical'}")
+            for difference in differences:
+                print(f"  - {difference}")
+            failed = failed or bool(differences)
+    if failed:
+        raise SystemExit(1)
+
+
+def main():
+    """Extract a deck with the XML engine, optionally checking parity with PPTXExtractor"""
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Extract PowerPoint content directly from the package XML")
+    parser.add_argument("pptx_file", nargs="?", help="Input .pptx file")
+    parser.add_argument("-o", "--output", help="Output path (default: input name with _extracted.json; .msgpack writes the binary format)")
+    parser.add_argument("--parity", action="store_true",
+                        help="Also run PPTXExtractor, compare the outputs and report both timings")
+    parser.add_argument("--self-test", action="store_true",
+                        help="Check parity on a generated deck for every profile instead of extracting a file")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Worker processes for slide extraction (default: 1; 0 = one per CPU)")
+    parser.add_argument("--compact", action="store_true",
+                        help="Write the compact schema (run, paragraph, fill, line and shadow styles interned)")
+    parser.add_argument("--profile", choices=EXTRACTION_PROFILES, default="full",
+                        help="full: every formatting detail (default); translation: only what translation and reassembly read")
+    args = parser.parse_args()
+    workers = args.workers or os.cpu_count()
+    
+    if args.self_test:
+        run_self_test(workers)
+        return
+    if not args.pptx_file:
+        parser.error("pptx_file is required unless --self-test is given")
+    
+    start = time.perf_counter()
+    extractor = XMLExtractor(args.pptx_file, profile=args.profile)
+    data = extractor.extract_all(workers=workers)
+    xml_time = time.perf_counter() - start
+    
+    output_path = args.output or f"{os.path.splitext(args.pptx_file)[0]}_extracted.json"
+    extractor.save_to_json(output_path, compact=args.compact)
+    print(f"XML extraction: {xml_time:.2f}s for {data['total_slides']} slides")
+    
+    if not args.parity:
+        return
+    
+    differences, _, reference_time = check_parity(args.pptx_file, args.profile, workers)
+    print(f"python-pptx extraction: {reference_time:.2f}s ({reference_time / xml_time:.1f}x slower)")
+    
+    if differences:
+        print(f"Parity: outputs differ ({len(differences)} differences shown)")
+        for difference in differences:
+            print(f"  - {difference}")
+        raise SystemExit(1)
+    print("Parity: outputs are identical")
+
+
+if __name__ == "__main__":
+    main()